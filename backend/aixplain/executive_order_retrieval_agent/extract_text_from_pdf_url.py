@@ -4,9 +4,6 @@
 #!pip install --quiet pymupdf
 #!pip install --upgrade aixplain
 
-from aixplain.enums import DataType
-from aixplain.factories import AgentFactory, ModelFactory
-
 def extract_text_from_pdf_url(pdf_url: str) -> str:
     """
     A function that takes a PDF file URL and returns extracted text.
@@ -16,7 +13,9 @@ def extract_text_from_pdf_url(pdf_url: str) -> str:
     import io
 
     try:
-        response = requests.get(pdf_url, timeout=10)
+        # shared keep-alive pool when run locally by pipeline.py; plain requests when deployed
+        http = globals()["get_session"]() if "get_session" in globals() else requests
+        response = http.get(pdf_url, timeout=10)
         response.raise_for_status()
 
         pdf_stream = io.BytesIO(response.content)
@@ -34,11 +33,14 @@ def extract_text_from_pdf_url(pdf_url: str) -> str:
         return f"Error reading PDF file: {e}"
 
 
-extract_text_utility = ModelFactory.create_utility_model(
-    name="PDFTextExtractor",
-    code=extract_text_from_pdf_url,
-    description="Extracts all text from a PDF file using its URL."
-)
+# Deploy only when run as a script, so pipeline.py can import the function locally
+if __name__ == "__main__":
+    from aixplain.factories import ModelFactory
 
+    extract_text_utility = ModelFactory.create_utility_model(
+        name="PDFTextExtractor",
+        code=extract_text_from_pdf_url,
+        description="Extracts all text from a PDF file using its URL."
+    )
 
-extract_text_utility.deploy()
\ No newline at end of file
+    extract_text_utility.deploy()
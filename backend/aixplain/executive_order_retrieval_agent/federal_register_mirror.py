@@ -0,0 +1,345 @@
+#Note: Used only when the tools run locally (pipeline.py); deployed tools query the API.
+#
+# Local mirror of the Federal Register's executive order metadata.
+#
+# All executive orders published since 1994 are a few thousand records of
+# number, title, dates and PDF URL, so they fit in a small SQLite file.
+# get_executive_order_pdf_url answers from it when pipeline.py loads the
+# tool, and only calls the API for orders newer than the last sync, or
+# missing from a mirror no full API sync has completed. Titles are indexed
+# with FTS5 for keyword search.
+#
+#   python federal_register_mirror.py sync [--full]      # from the API
+#   python federal_register_mirror.py sync --dump FILE   # from a JSON dump
+#   python federal_register_mirror.py export FILE
+#   python federal_register_mirror.py search "climate"
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+FEDERAL_REGISTER_API_URL = "https://www.federalregister.gov/api/v1/documents.json"
+# backend/data/federal_register.sqlite3 unless overridden
+MIRROR_PATH = os.environ.get(
+    "FEDERAL_REGISTER_MIRROR_PATH",
+    os.path.normpath(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "federal_register.sqlite3")
+    ),
+)
+FIELDS = [
+    "executive_order_number", "title", "document_number", "publication_date",
+    "signing_date", "pdf_url", "html_url",
+]
+COLUMNS = ["number", *FIELDS[1:]]
+
+
+def _row(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    number = str(doc.get("executive_order_number") or "").strip()
+    if not number.isdigit():
+        return None
+    row = {column: str(doc.get(field) or "").strip() for column, field in zip(COLUMNS, FIELDS)}
+    row["number"] = int(number)
+    if not row["pdf_url"] and row["publication_date"] and row["document_number"]:
+        row["pdf_url"] = (
+            f"https://www.govinfo.gov/content/pkg/FR-{row['publication_date']}"
+            f"/pdf/{row['document_number']}.pdf"
+        )
+    return row
+
+
+class FederalRegisterMirror:
+    """SQLite table of executive orders with an FTS5 index on their titles."""
+
+    def __init__(self, path: str = MIRROR_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS orders (
+                number INTEGER PRIMARY KEY,
+                title TEXT NOT NULL DEFAULT '',
+                document_number TEXT NOT NULL DEFAULT '',
+                publication_date TEXT NOT NULL DEFAULT '',
+                signing_date TEXT NOT NULL DEFAULT '',
+                pdf_url TEXT NOT NULL DEFAULT '',
+                html_url TEXT NOT NULL DEFAULT ''
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS orders_fts USING fts5(
+                title, content='orders', content_rowid='number'
+            );
+            CREATE TRIGGER IF NOT EXISTS orders_ai AFTER INSERT ON orders BEGIN
+                INSERT INTO orders_fts (rowid, title) VALUES (new.number, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS orders_ad AFTER DELETE ON orders BEGIN
+                INSERT INTO orders_fts (orders_fts, rowid, title) VALUES ('delete', old.number, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS orders_au AFTER UPDATE ON orders BEGIN
+                INSERT INTO orders_fts (orders_fts, rowid, title) VALUES ('delete', old.number, old.title);
+                INSERT INTO orders_fts (rowid, title) VALUES (new.number, new.title);
+            END;
+            CREATE TABLE IF NOT EXISTS sync (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+        self._max_number = self._query_max_number()
+        self._complete_through = int(self._sync_value("complete_through") or 0)
+
+    def _query_max_number(self) -> int:
+        return self._db.execute("SELECT COALESCE(MAX(number), 0) FROM orders").fetchone()[0]
+
+    def _sync_value(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM sync WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """Insert or update Federal Register documents; returns how many were orders."""
+        rows = [row for row in map(_row, docs) if row]
+        with self._lock:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO orders ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join(':' + c for c in COLUMNS)})",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync (key, value) VALUES ('synced_at', ?)",
+                (str(int(time.time())),),
+            )
+            self._db.commit()
+            self._max_number = self._query_max_number()
+        return len(rows)
+
+    def record_sync(self, kind: str):
+        """
+        Record a finished sync.
+
+        Args:
+            kind: "full" (every order from the API), "incremental" (API orders
+                since the last sync) or "dump"; only a full API sync, and
+                incremental ones after it, make the mirror complete up to its
+                newest order
+        """
+        with self._lock:
+            if kind == "full" or (kind == "incremental" and self._complete_through):
+                self._complete_through = self._max_number
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sync (key, value) VALUES (?, ?)",
+                [("sync_kind", kind), ("complete_through", str(self._complete_through))],
+            )
+            self._db.commit()
+
+    def get(self, number: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM orders WHERE number = ?", (number,)
+            ).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def lookup(self, number: int) -> Optional[str]:
+        """
+        Answer a PDF URL lookup from the mirror.
+
+        Args:
+            number: Executive order number
+
+        Returns:
+            The PDF URL; the tool's "not found" error for a missing number
+            only up to where a full API sync made the mirror complete; None
+            when the mirror lacks the order and it may still exist (newer than
+            the last sync, or a gap a dump or partial sync left), meaning the
+            API has to be asked
+        """
+        if number > self._max_number:
+            return None
+        order = self.get(number)
+        if order is None:
+            if number > self._complete_through:
+                return None
+            return f"Error: No executive order found with number {number}."
+        if not order["pdf_url"]:
+            return f"Error: Found Executive Order {number} but couldn't generate a PDF link."
+        return order["pdf_url"]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Orders whose titles match the keywords (all of them, any order), best first."""
+        terms = " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+        if not terms:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join('o.' + c for c in COLUMNS)} FROM orders_fts "
+                "JOIN orders o ON o.number = orders_fts.rowid "
+                "WHERE orders_fts MATCH ? ORDER BY bm25(orders_fts), o.number DESC LIMIT ?",
+                (terms, limit),
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+            latest = self._db.execute("SELECT MAX(publication_date) FROM orders").fetchone()[0]
+            synced = self._sync_value("synced_at")
+            kind = self._sync_value("sync_kind")
+        return {
+            "orders": count,
+            "max_number": self._max_number,
+            "latest_publication_date": latest,
+            "synced_at": int(synced) if synced else None,
+            "sync_kind": kind,
+            "complete_through": self._complete_through,
+        }
+
+    def export(self) -> List[Dict[str, Any]]:
+        """Every order as a Federal Register API result, for a JSON dump."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM orders ORDER BY number"
+            ).fetchall()
+        return [dict(zip(FIELDS, (str(row[0]), *row[1:]))) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def fetch_from_api(
+    session: Any, since: Optional[str] = None, per_page: int = 1000
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through every executive order in the Federal Register API.
+
+    Args:
+        session: requests module or Session to fetch with
+        since: Only orders published on or after this date (YYYY-MM-DD)
+        per_page: Results per request (the API allows up to 1000)
+
+    Yields:
+        One list of API results per page
+    """
+    params = {
+        "conditions[type][]": "PRESDOCU",
+        "conditions[presidential_document_type][]": "executive_order",
+        "fields[]": FIELDS,
+        "per_page": per_page,
+        "order": "oldest",
+    }
+    if since:
+        params["conditions[publication_date][gte]"] = since
+    url = os.environ.get("FEDERAL_REGISTER_API_URL", FEDERAL_REGISTER_API_URL)
+    while url:
+        response = session.get(url, params=params, timeout=60)
+        response.raise_for_status()
+        data = response.json()
+        yield data.get("results", [])
+        # next_page_url carries the query
+        url, params = data.get("next_page_url"), None
+
+
+def read_dump(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON dump: a list of API results, or an API response with 'results'."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("results", []) if isinstance(data, dict) else data
+
+
+def sync(
+    mirror: "FederalRegisterMirror",
+    session: Any = None,
+    dump: Optional[str] = None,
+    full: bool = False,
+) -> int:
+    """
+    Load orders into the mirror from a JSON dump or from the API.
+
+    Args:
+        mirror: Mirror to fill
+        session: requests module or Session for API syncs
+        dump: Path of a JSON dump to load instead of calling the API
+        full: Re-fetch every order, not only those published since the last sync
+
+    Returns:
+        Number of orders loaded
+    """
+    if dump:
+        count = mirror.load(read_dump(dump))
+        mirror.record_sync("dump")
+        return count
+
+    if session is None:
+        import requests as session
+    since = None if full else mirror.stats()["latest_publication_date"]
+    count = sum(mirror.load(page) for page in fetch_from_api(session, since))
+    mirror.record_sync("incremental" if since else "full")
+    return count
+
+
+_mirror: Optional[FederalRegisterMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> Optional[FederalRegisterMirror]:
+    """The mirror at MIRROR_PATH, or None until a sync has created it."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None and os.path.exists(MIRROR_PATH):
+            _mirror = FederalRegisterMirror(MIRROR_PATH)
+        return _mirror
+
+
+def configure(path: str):
+    """Use the mirror at path from now on."""
+    global _mirror, MIRROR_PATH
+    with _mirror_lock:
+        if _mirror is not None:
+            _mirror.close()
+        _mirror, MIRROR_PATH = None, path
+
+
+def lookup(number: int) -> Optional[str]:
+    """Mirror lookup for get_executive_order_pdf_url; None means "ask the API"."""
+    mirror = get_mirror()
+    return mirror.lookup(number) if mirror is not None else None
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Local Federal Register executive order mirror")
+    parser.add_argument("--path", default=MIRROR_PATH, help="mirror database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync_parser = commands.add_parser("sync", help="load orders from the API or a JSON dump")
+    sync_parser.add_argument("--dump", help="JSON dump to load instead of calling the API")
+    sync_parser.add_argument("--full", action="store_true", help="re-fetch every order")
+    export_parser = commands.add_parser("export", help="write every order to a JSON dump")
+    export_parser.add_argument("file")
+    search_parser = commands.add_parser("search", help="search order titles")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    mirror = FederalRegisterMirror(args.path)
+    if args.command == "sync":
+        started = time.perf_counter()
+        count = sync(mirror, dump=args.dump, full=args.full)
+        print(f"Loaded {count} orders in {time.perf_counter() - started:.1f} s: {mirror.stats()}")
+    elif args.command == "export":
+        orders = mirror.export()
+        with open(args.file, "w", encoding="utf-8") as f:
+            json.dump({"results": orders}, f, indent=1)
+        print(f"Wrote {len(orders)} orders to {args.file}")
+    else:
+        for order in mirror.search(args.query, args.limit):
+            print(f"EO {order['number']} ({order['signing_date']}): {order['title']}\n  {order['pdf_url']}")
+    mirror.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,9 +4,6 @@
 #!pip install --quiet pymupdf
 #!pip install --upgrade aixplain
 
-from aixplain.enums import DataType
-from aixplain.factories import AgentFactory, ModelFactory
-
 def get_executive_order_pdf_url(order_number: str) -> str:
     """
     Find and return ONLY the PDF URL for a specific executive order.
@@ -24,6 +21,7 @@ def get_executive_order_pdf_url(order_number: str) -> str:
         >>> get_executive_order_pdf_url("14068")
         "https://www.govinfo.gov/content/pkg/FR-2022-03-15/pdf/2022-05554.pdf"
     """
+    import os
     import requests
     
     # Clean and validate input
@@ -34,6 +32,13 @@ def get_executive_order_pdf_url(order_number: str) -> str:
     try:
         # Convert to integer for the search
         eo_number = int(order_number)
+
+        # Answer from the local mirror when run locally by pipeline.py, which
+        # provides lookup_mirror; it returns None for orders newer than its last sync
+        if "lookup_mirror" in globals():
+            mirrored = globals()["lookup_mirror"](eo_number)
+            if mirrored:
+                return mirrored
         
         # Set up the search parameters
         params = {
@@ -51,11 +56,15 @@ def get_executive_order_pdf_url(order_number: str) -> str:
         for f in fields:
             params.setdefault("fields[]", []).append(f)
 
-        # Clean the API URL
-        FR_API = "https://www.federalregister.gov/api/v1/documents.json"
+        # Clean the API URL (overridable to run against a mirror or a stub server)
+        FR_API = os.environ.get(
+            "FEDERAL_REGISTER_API_URL", "https://www.federalregister.gov/api/v1/documents.json"
+        )
         
-        # Make the API request
-        response = requests.get(FR_API, params=params, timeout=20)
+        # Make the API request (over the shared keep-alive pool when run
+        # locally by pipeline.py, which provides get_session; deployed, plain requests)
+        http = globals()["get_session"]() if "get_session" in globals() else requests
+        response = http.get(FR_API, params=params, timeout=20)
         response.raise_for_status()
         data = response.json()
 
@@ -93,16 +102,16 @@ def get_executive_order_pdf_url(order_number: str) -> str:
         return f"Error: Network error connecting to Federal Register API: {str(e)}"
     except Exception as e:
         return f"Error: Unexpected error processing request: {str(e)}"
-    
-    from aixplain.factories import AgentFactory
 
 
-from aixplain.factories import AgentFactory
+# Deploy only when run as a script, so pipeline.py can import the function locally
+if __name__ == "__main__":
+    from aixplain.factories import ModelFactory
 
-extract_text_utility = ModelFactory.create_utility_model(
-    name="find",
-    code=get_executive_order_pdf_url,
-    description="Extracts all text from a PDF file using its URL."
-)
+    find_pdf_url_utility = ModelFactory.create_utility_model(
+        name="find",
+        code=get_executive_order_pdf_url,
+        description="Finds the PDF URL of an executive order by its number."
+    )
 
-get_executive_order_pdf_url.deploy()
\ No newline at end of file
+    find_pdf_url_utility.deploy()
@@ -0,0 +1,62 @@
+#Note: Used only when the tools run locally (pipeline.py); deployed tools use plain requests.
+
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per upstream host (federalregister.gov, govinfo.gov, ...)
+POOL_PER_HOST = int(os.environ.get("EO_HTTP_POOL_PER_HOST", "4"))
+# Hosts with a pool of their own before the least recently used one is dropped
+POOL_HOSTS = int(os.environ.get("EO_HTTP_POOL_HOSTS", "10"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _new_session(per_host: int, hosts: int) -> requests.Session:
+    session = requests.Session()
+    # pool_block: a request waits for a free connection instead of opening an
+    # extra one, so per_host is a hard cap on connections to each host
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=per_host, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide pooled session.
+
+    Connections are kept alive between calls, so repeated lookups against
+    the same host skip the TCP and TLS handshakes.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _new_session(POOL_PER_HOST, POOL_HOSTS)
+        return _session
+
+
+def configure(per_host: Optional[int] = None, hosts: Optional[int] = None):
+    """
+    Set the pool limits; the current session's connections are closed.
+
+    Args:
+        per_host: Connections kept open (and allowed at once) per host
+        hosts: Number of hosts pooled at once
+    """
+    global _session, POOL_PER_HOST, POOL_HOSTS
+    with _session_lock:
+        POOL_PER_HOST = per_host or POOL_PER_HOST
+        POOL_HOSTS = hosts or POOL_HOSTS
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def close():
+    """Close every pooled connection."""
+    configure()
@@ -1,59 +1,236 @@
-#Note: All this code runs on aiXplain, where it is deployed.
+#Note: The hosted pipeline below runs on aiXplain, where it is deployed.
+# run_local() runs the same chain in-process (see "Local orchestration").
 
 #!pip install aixplain
 #!pip install --quiet pymupdf
 #!pip install --upgrade aixplain
 
-from aixplain.factories import PipelineFactory
-from aixplain.enums import DataType
-from aixplain.factories import AgentFactory, ModelFactory
+import os
+import time
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
 
-# 1. Initialize the pipeline
-pipeline = PipelineFactory.init("Executive Order Retrieval Pipeline")
+LLM_ID = "669a63646eb56306647e1091"
+FEDERAL_REGISTER_API_URL = "https://www.federalregister.gov/api/v1/documents.json"
 
-# 2. Create an input node for the executive order number
-order_number_input = pipeline.input()
-order_number_input.label = "Executive Order Number Input"
 
-# 3. Add a node to search for PDF URLs
-search_node = pipeline.asset(asset_id="get_executive_order_pdf_url.id")
-search_node.label = "Search for PDF URL"
+def build_hosted_pipeline():
+    from aixplain.factories import PipelineFactory
+    from aixplain.factories import AgentFactory
 
-# 4. Add a node to extract text from PDF
-extract_node = pipeline.asset(asset_id="extract_text_from_pdf_url.id")
-extract_node.label = "Extract Text from PDF"
+    # 1. Initialize the pipeline
+    pipeline = PipelineFactory.init("Executive Order Retrieval Pipeline")
 
-# 5. Add an LLM node for text processing
-llm_node = pipeline.text_generation(asset_id="669a63646eb56306647e1091")
-llm_node.label = "Generate Client-Friendly Response"
+    # 2. Create an input node for the executive order number
+    order_number_input = pipeline.input()
+    order_number_input.label = "Executive Order Number Input"
 
-# 6. Connect the nodes (The Correct Method)
-# Link the order number input to the search node
-order_number_input.outputs.input.link(search_node.inputs.order_number)
+    # 3. Add a node to search for PDF URLs
+    search_node = pipeline.asset(asset_id="get_executive_order_pdf_url.id")
+    search_node.label = "Search for PDF URL"
 
-# Link the search node outputs to the extract node inputs
-search_node.outputs.outputs.link(extract_node.inputs.pdf_url)
+    # 4. Add a node to extract text from PDF
+    extract_node = pipeline.asset(asset_id="extract_text_from_pdf_url.id")
+    extract_node.label = "Extract Text from PDF"
 
-# Link the extract node outputs to the LLM node inputs
-extract_node.outputs.outputs.link(llm_node.inputs.text)
+    # 5. Add an LLM node for text processing
+    llm_node = pipeline.text_generation(asset_id=LLM_ID)
+    llm_node.label = "Generate Client-Friendly Response"
 
-# 7. Define the pipeline output
-llm_node.use_output("data")
+    # 6. Connect the nodes (The Correct Method)
+    # Link the order number input to the search node
+    order_number_input.outputs.input.link(search_node.inputs.order_number)
 
-# 8. Validate the pipeline
-pipeline.validate()
+    # Link the search node outputs to the extract node inputs
+    search_node.outputs.outputs.link(extract_node.inputs.pdf_url)
 
-# 9. Save the pipeline
-pipeline.save(save_as_asset=True)
+    # Link the extract node outputs to the LLM node inputs
+    extract_node.outputs.outputs.link(llm_node.inputs.text)
 
-print(f"Pipeline created successfully! ID: {pipeline.id}")
+    # 7. Define the pipeline output
+    llm_node.use_output("data")
 
+    # 8. Validate the pipeline
+    pipeline.validate()
 
-pipeline.deploy()
+    # 9. Save the pipeline
+    pipeline.save(save_as_asset=True)
 
-pipeline = PipelineFactory.get("pipeline.id")
+    print(f"Pipeline created successfully! ID: {pipeline.id}")
 
-pipeline_tool = AgentFactory.create_pipeline_tool(
-    pipeline=pipeline.id,
-    description="Executive Order Bringer"
-)
\ No newline at end of file
+
+    pipeline.deploy()
+
+    pipeline = PipelineFactory.get("pipeline.id")
+
+    pipeline_tool = AgentFactory.create_pipeline_tool(
+        pipeline=pipeline.id,
+        description="Executive Order Bringer"
+    )
+    return pipeline_tool
+
+
+# Local orchestration
+#
+# The hosted pipeline handles one order number per run, strictly
+# search -> extract -> LLM. run_local() runs that chain for several orders
+# at once: each order is its own task, so the PDF download of one order
+# overlaps the URL lookup of the next, and the LLM step of an order starts
+# as soon as its text is in. Requests are capped per upstream host. The
+# deployed tool functions are reused unchanged, except that here they share
+# one pooled keep-alive session (http_client.py) instead of opening a new
+# TCP+TLS connection per call.
+
+
+def _load_module(name: str):
+    # this directory is not a package (and "aixplain" would shadow the SDK), load by path
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"eo_tools.{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+http_client = _load_module("http_client")
+federal_register_mirror = _load_module("federal_register_mirror")
+
+
+def _load_tool(name: str) -> Callable:
+    module = _load_module(name)
+    # the tools send their requests through the shared pooled session,
+    # and order lookups are answered from the local mirror when it has them
+    module.get_session = http_client.get_session
+    module.lookup_mirror = federal_register_mirror.lookup
+    return getattr(module, name)
+
+
+get_executive_order_pdf_url = _load_tool("get_executive_order_pdf_url")
+extract_text_from_pdf_url = _load_tool("extract_text_from_pdf_url")
+
+
+async def get_executive_order_pdf_url_async(order_number: str) -> str:
+    """get_executive_order_pdf_url without blocking the event loop."""
+    return await asyncio.to_thread(get_executive_order_pdf_url, order_number)
+
+
+async def extract_text_from_pdf_url_async(pdf_url: str) -> str:
+    """extract_text_from_pdf_url without blocking the event loop."""
+    return await asyncio.to_thread(extract_text_from_pdf_url, pdf_url)
+
+
+@dataclass
+class OrderResult:
+    order_number: str
+    pdf_url: Optional[str] = None
+    text: Optional[str] = None
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    lookup_s: float = 0.0
+    extract_s: float = 0.0
+    generate_s: float = 0.0
+
+
+def _is_error(value: Optional[str]) -> bool:
+    return not value or value.startswith("Error")
+
+
+class HostLimiter:
+    """One semaphore per upstream host, created on first use."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc or url
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+
+async def _run_order(
+    order_number: str,
+    limit: HostLimiter,
+    generate: Optional[Callable[[str, str], str]],
+    question: str,
+) -> OrderResult:
+    result = OrderResult(order_number)
+    api_url = os.environ.get("FEDERAL_REGISTER_API_URL", FEDERAL_REGISTER_API_URL)
+    try:
+        started = time.perf_counter()
+        async with limit(api_url):
+            pdf_url = await get_executive_order_pdf_url_async(order_number)
+        result.lookup_s = time.perf_counter() - started
+        if _is_error(pdf_url):
+            result.error = pdf_url
+            return result
+        result.pdf_url = pdf_url
+
+        started = time.perf_counter()
+        async with limit(pdf_url):
+            text = await extract_text_from_pdf_url_async(pdf_url)
+        result.extract_s = time.perf_counter() - started
+        if _is_error(text):
+            result.error = text
+            return result
+        result.text = text
+
+        if generate is not None:
+            started = time.perf_counter()
+            async with limit("llm"):
+                result.answer = await asyncio.to_thread(generate, question, text)
+            result.generate_s = time.perf_counter() - started
+    except Exception as e:
+        result.error = f"Error: {str(e)}"
+    return result
+
+
+async def run_local(
+    order_numbers: List[str],
+    question: str = "",
+    generate: Optional[Callable[[str, str], str]] = None,
+    max_orders: int = 4,
+    per_host: int = 2,
+) -> List[OrderResult]:
+    """
+    Run the retrieval chain for several executive orders concurrently.
+
+    Args:
+        order_numbers: Executive order numbers, e.g. ["14067", "13849"]
+        question: The user's question, passed to generate
+        generate: Optional LLM step, called as generate(question, text)
+        max_orders: Orders in flight at once
+        per_host: Concurrent requests per upstream host (and to the LLM)
+
+    Returns:
+        One result per order number, in the given order
+    """
+    limit = HostLimiter(per_host)
+    slots = asyncio.Semaphore(max_orders)
+
+    async def run(order_number: str) -> OrderResult:
+        async with slots:
+            return await _run_order(order_number, limit, generate, question)
+
+    return await asyncio.gather(*(run(number) for number in order_numbers))
+
+
+def aixplain_generate(llm_id: str = LLM_ID, max_chars: int = 60000) -> Callable[[str, str], str]:
+    """Return an LLM step that runs the pipeline's text generation model."""
+    from aixplain.factories import ModelFactory
+
+    model = ModelFactory.get(llm_id)
+
+    def generate(question: str, text: str) -> str:
+        prompt = f"{question}\n\n{text[:max_chars]}" if question else text[:max_chars]
+        response = model.run(prompt)
+        return str(response.data if hasattr(response, "data") else response["data"])
+
+    return generate
+
+
+if __name__ == "__main__":
+    build_hosted_pipeline()
@@ -0,0 +1,422 @@
+import os
+import time
+import uuid
+import hashlib
+import signal
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from config.settings import API, CATALOG, DEPLOYMENT
+from core.http import HttpServer, Request, Response, StreamingResponse, sse_event
+from core.admission import INGEST, Overloaded, estimate_upload_cost, get_admission, sniff_page_count
+from core.metrics import metrics
+from core.resilience import CircuitOpen
+from core.singleflight import SingleFlight
+from bot.agent import ask_agent, load_agent
+from bot.responses import NO_ANSWER
+from document.catalog import DocumentCatalog, get_catalog
+from document.default_data import DefaultDataLoader
+from document.extraction import extract_document
+from document.indexer import process_and_upsert_document
+from document.processor import DocumentProcessor
+from document.rebuild import IndexRebuilder, rebuild_running, retain_for_indexing
+
+logger = logging.getLogger(__name__)
+
+Route = Callable[[Request], Awaitable[Response]]
+
+
+Emit = Callable[[str, Dict[str, Any]], None]
+
+
+class ApiError(Exception):
+    """A request failure with the HTTP status to report it with."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def error(message: str, status: int) -> Response:
+    return Response.json({"error": message}, status=status)
+
+
+def busy(e: Union[Overloaded, CircuitOpen]) -> Response:
+    """503 for shed work or a failing backend, with the retry delay in Retry-After and the body."""
+    return Response.json(
+        {"error": str(e), "retry_after": e.retry_after},
+        status=503,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def client_id(request: Request) -> str:
+    """Who a request is for, for fair scheduling: the client's address."""
+    peer = request.peer
+    return peer[0] if isinstance(peer, tuple) else "api"
+
+
+def wants_stream(request: Request) -> bool:
+    """True when the client asked for server-sent events instead of one JSON body."""
+    return "text/event-stream" in request.headers.get("accept", "") or request.query.get(
+        "stream"
+    ) in ("1", "true")
+
+
+class ApiServer:
+    """HTTP handler for the web frontend's /api endpoints.
+
+    Questions go through the same agent calls as the Telegram bot; uploads
+    go through the same extraction pool and upsert. Blocking SDK and index
+    calls run in executors, so one process serves many clients at once.
+
+    /api/ask and /api/upload answer with one JSON body, or, when the client
+    sends "Accept: text/event-stream" (or ?stream=1), with server-sent
+    events: agent steps, or ingest stages, as they happen, then the result.
+
+    /api/documents lists the local document catalog a page at a time.
+    """
+
+    def __init__(
+        self,
+        agent: Any = None,
+        processor: Optional[DocumentProcessor] = None,
+        catalog: Optional[DocumentCatalog] = None,
+    ):
+        self._agent = agent
+        self._agent_lock = asyncio.Lock()
+        self.processor = processor or DocumentProcessor()
+        self.catalog = catalog or get_catalog()
+        self._ingest_flight = SingleFlight("ingest")
+        self.routes: Dict[Tuple[str, str], Route] = {
+            ("POST", "/api/ask"): self.ask,
+            ("POST", "/api/upload"): self.upload,
+            ("GET", "/api/documents"): self.documents,
+            ("POST", "/api/rebuild-index"): self.rebuild_index,
+        }
+
+    def _cors(self, response: Response) -> Response:
+        response.headers["Access-Control-Allow-Origin"] = API["ALLOWED_ORIGIN"]
+        response.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+        return response
+
+    async def __call__(self, request: Request) -> Response:
+        if request.method == "OPTIONS":
+            return self._cors(Response(204))
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            if any(path == request.path for _, path in self.routes):
+                return self._cors(error("Method not allowed", 405))
+            return self._cors(error("Not found", 404))
+
+        with metrics.timer(f"api.{request.path.rsplit('/', 1)[-1]}_s"):
+            response = await route(request)
+        metrics.incr(f"api.status_{response.status}")
+        return self._cors(response)
+
+    async def _get_agent(self) -> Any:
+        # fetched once per process and shared by every request
+        if self._agent is None:
+            async with self._agent_lock:
+                if self._agent is None:
+                    self._agent = await load_agent()
+        return self._agent
+
+    def _document_page(self) -> Dict[str, Any]:
+        """First catalog page, for responses that refresh the list."""
+        items, next_cursor = self.catalog.page()
+        return {
+            "documents": [item["file_name"] for item in items],
+            "next_cursor": next_cursor,
+            "total": self.catalog.count(),
+        }
+
+    async def _event_stream(
+        self, job: Callable[[Emit], Awaitable[Dict[str, Any]]], done_event: str
+    ) -> AsyncIterator[bytes]:
+        """Run job(emit) and relay its progress as server-sent events, then its result.
+
+        emit may be called from any thread. A comment is sent while the job is
+        quiet, so proxies keep the connection open.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        def emit(event: str, data: Dict[str, Any]):
+            loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+        task = asyncio.create_task(job(emit))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            yield sse_event("started", {"time": time.time()})
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), API["SSE_HEARTBEAT_SECONDS"])
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if item is None:
+                    break
+                yield sse_event(*item)
+
+            try:
+                yield sse_event(done_event, task.result())
+            except ApiError as e:
+                yield sse_event("error", {"error": e.message, "status": e.status})
+            except (Overloaded, CircuitOpen) as e:
+                yield sse_event(
+                    "error", {"error": str(e), "status": 503, "retry_after": e.retry_after}
+                )
+            except Exception as e:
+                logger.error(f"Streamed request failed: {str(e)}", exc_info=True)
+                yield sse_event("error", {"error": str(e), "status": 500})
+        finally:
+            # the client went away: stop waiting on the job
+            if not task.done():
+                task.cancel()
+
+    async def _run(
+        self,
+        request: Request,
+        job: Callable[[Optional[Emit]], Awaitable[Dict[str, Any]]],
+        done_event: str,
+    ) -> Response:
+        if wants_stream(request):
+            return StreamingResponse(self._event_stream(job, done_event))
+        try:
+            return Response.json(await job(None))
+        except ApiError as e:
+            return error(e.message, e.status)
+        except (Overloaded, CircuitOpen) as e:
+            return busy(e)
+
+    async def ask(self, request: Request) -> Response:
+        try:
+            body = request.json() or {}
+        except ValueError:
+            return error("Invalid JSON body", 400)
+        question = str(body.get("question") or "").strip()
+        if not question:
+            return error("A question is required", 400)
+
+        async def answer(emit: Optional[Emit]) -> Dict[str, Any]:
+            async def on_progress(text: str):
+                emit("step", {"text": text})
+
+            try:
+                agent = await self._get_agent()
+            except Exception as e:
+                logger.error(f"Error getting Agent: {str(e)}")
+                raise ApiError("Error connecting to Agent. Check Agent ID.", 502)
+            try:
+                result = await ask_agent(
+                    agent,
+                    question,
+                    body.get("session_id"),
+                    client_id(request),
+                    on_progress if emit else None,
+                )
+            except (Overloaded, CircuitOpen):
+                raise
+            except Exception as e:
+                logger.error(f"Error running Agent: {str(e)}")
+                raise ApiError("Error processing question.", 502)
+            return {
+                "answer": result.answer or NO_ANSWER,
+                "session_id": result.session_id,
+                "sources": [],
+            }
+
+        return await self._run(request, answer, "answer")
+
+    async def upload(self, request: Request) -> Response:
+        if len(request.body) > API["MAX_UPLOAD_MB"] * 1024 * 1024:
+            return error(
+                f"File size exceeds maximum allowed size ({API['MAX_UPLOAD_MB']} MB)", 413
+            )
+        try:
+            form = await asyncio.to_thread(request.form)
+        except ValueError as e:
+            return error(str(e), 400)
+        upload = form.get("file")
+        if upload is None or not upload.filename:
+            return error("No file in the 'file' field", 400)
+
+        file_name = os.path.basename(upload.filename.replace("\\", "/"))
+        if not file_name or not self.processor.is_supported_file(file_name):
+            return error(f"Unsupported file type: {os.path.splitext(file_name)[1]}", 415)
+
+        async def ingest(emit: Optional[Emit]) -> Dict[str, Any]:
+            # copies of one file uploaded under one name at the same time
+            # share one ingest job; the name decides the indexed document
+            key = f"{file_name}\0{hashlib.md5(upload.data).hexdigest()}"
+            cost = estimate_upload_cost(
+                file_name, len(upload.data), sniff_page_count(upload.data, file_name)
+            )
+
+            async def shared(notify: Emit) -> Dict[str, Any]:
+                # uploads queue for their own slots, weighted by estimated cost;
+                # progress is reported only when the upload that starts the
+                # job asked for a stream
+                async with get_admission().admit(INGEST, client_id(request), cost):
+                    return await self._ingest(
+                        file_name, upload.data, notify if emit is not None else None
+                    )
+
+            result = await self._ingest_flight.do(key, shared, emit)
+            return {**result, "file_name": file_name}
+
+        return await self._run(request, ingest, "done")
+
+    async def _ingest(self, file_name: str, data: bytes, emit: Optional[Emit]) -> Dict[str, Any]:
+        if emit is not None:
+            emit("received", {"file_name": file_name, "bytes": len(data)})
+
+        # a directory per upload, so concurrent uploads of one name don't collide
+        upload_dir = os.path.join(self.processor.temp_dir, uuid.uuid4().hex)
+        os.makedirs(upload_dir, exist_ok=True)
+        file_path = os.path.join(upload_dir, file_name)
+        try:
+            await asyncio.to_thread(self._write_file, file_path, data)
+            document_data = await extract_document(file_path)
+            if not document_data:
+                raise ApiError("Failed to process document. Make sure the file is valid.", 422)
+            # same path as a Telegram upload, so re-uploads are recognized
+            document_data["metadata"]["file_path"] = os.path.abspath(
+                os.path.join(self.processor.temp_dir, file_name)
+            )
+            if emit is not None:
+                text = document_data["text"]
+                pages = text.count("\f") + 1 if file_name.lower().endswith(".pdf") else None
+                emit("extracted", {"pages": pages, "characters": len(text)})
+
+            # keep the original, so index rebuilds can re-extract it, and fetch index
+            index = await asyncio.to_thread(retain_for_indexing, file_path)
+            result = await asyncio.to_thread(process_and_upsert_document, index, document_data, emit)
+        except (ApiError, CircuitOpen):
+            raise
+        except Exception as e:
+            logger.error(f"Error processing upload {file_name}: {str(e)}", exc_info=True)
+            raise ApiError(f"Error processing document: {str(e)}", 500)
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            if os.path.isdir(upload_dir):
+                os.rmdir(upload_dir)
+
+        if result["status"] == "error":
+            raise ApiError(result["message"], 500)
+        page = await asyncio.to_thread(self._document_page)
+        return {
+            "status": result["status"],
+            "message": result["message"],
+            "file_name": file_name,
+            "chunks": result.get("total_chunks", 0),
+            **page,
+        }
+
+    @staticmethod
+    def _write_file(file_path: str, data: bytes):
+        with open(file_path, "wb") as f:
+            f.write(data)
+
+    async def documents(self, request: Request) -> Response:
+        """
+        List indexed documents, one page at a time.
+
+        Query parameters: limit, cursor (next_cursor of the previous page),
+        q with match=prefix|substring, sort=name|date|size|chunks and
+        order=asc|desc. "total" counts every document in the catalog.
+        """
+        query = request.query
+        try:
+            items, next_cursor = await asyncio.to_thread(
+                self.catalog.page,
+                limit=int(query.get("limit") or CATALOG["PAGE_SIZE"]),
+                cursor=query.get("cursor") or None,
+                query=query.get("q", ""),
+                match=query.get("match", "substring"),
+                sort=query.get("sort", "name"),
+                descending=query.get("order", "asc") == "desc",
+            )
+            total = await asyncio.to_thread(self.catalog.count)
+        except ValueError as e:
+            return error(str(e), 400)
+        return Response.json(
+            {
+                "documents": [item["file_name"] for item in items],
+                "items": items,
+                "next_cursor": next_cursor,
+                "total": total,
+            }
+        )
+
+    async def rebuild_index(self, request: Request) -> Response:
+        if rebuild_running():
+            return error("An index rebuild is already running", 409)
+
+        async def rebuild(emit: Optional[Emit]) -> Dict[str, Any]:
+            try:
+                result = await asyncio.to_thread(IndexRebuilder().run, emit)
+            except RuntimeError as e:
+                raise ApiError(str(e), 409)
+            if result["status"] != "success":
+                raise ApiError(
+                    f"Rebuild incomplete: {len(result['failed'])} documents failed. "
+                    "Rebuild again to resume.",
+                    500,
+                )
+            return {**result, **await asyncio.to_thread(self._document_page)}
+
+        return await self._run(request, rebuild, "done")
+
+
+async def serve_api(
+    handler: Optional[ApiServer] = None,
+    host: str = API["HOST"],
+    port: int = API["PORT"],
+    ready: Optional[Callable[[HttpServer], None]] = None,
+    stop: Optional[asyncio.Event] = None,
+):
+    """Serve the API until SIGTERM/SIGINT (or ``stop``), then drain gracefully."""
+    loop = asyncio.get_running_loop()
+    # agent runs and index calls block a thread each; size the pool for the clients
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=API["EXECUTOR_THREADS"], thread_name_prefix="api")
+    )
+    if stop is None:
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+    server = HttpServer(
+        handler or ApiServer(), host, port, keep_alive_timeout=API["KEEP_ALIVE_SECONDS"]
+    )
+    await server.start()
+    if ready is not None:
+        ready(server)
+
+    await stop.wait()
+    logger.info("Draining API server...")
+    await server.drain(DEPLOYMENT["DRAIN_TIMEOUT_SECONDS"])
+
+
+def main():
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
+    )
+    # default content loads in the background; questions work meanwhile
+    threading.Thread(
+        target=DefaultDataLoader().load_default_content, name="default-content", daemon=True
+    ).start()
+    print(f"Starting Policy Navigator API on http://{API['HOST']}:{API['PORT']} ...")
+    asyncio.run(serve_api())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Admission benchmark: short-question latency while heavy ingest runs.
+
+Starts the real API server with a fake agent and an ingest step that
+holds an executor thread for a time proportional to the upload's size and
+page count, then uploads a burst of large PDFs and, while they are being
+ingested, asks a steady stream of short questions. Runs once with
+admission control off and once on, and reports question latency
+percentiles, ingest throughput and how many uploads were shed.
+
+Run from the backend directory:
+    python -m benchmarks.admission --uploads 50 --questions 200 --threads 16
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from types import SimpleNamespace
+
+from api.server import ApiServer, serve_api
+from core.admission import AdmissionController, estimate_upload_cost, sniff_page_count
+from config.settings import ADMISSION, API
+import core.admission as admission
+
+
+class FakeAgent:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def run(self, query: str, session_id: str = None):
+        time.sleep(self.latency)
+        return SimpleNamespace(data={"output": f"Answer to: {query}", "session_id": "s"})
+
+
+class HeavyServer(ApiServer):
+    """ApiServer whose ingest blocks an executor thread like extraction does."""
+
+    def __init__(self, agent, seconds_per_cost: float):
+        super().__init__(agent=agent)
+        self.seconds_per_cost = seconds_per_cost
+        self.ingests = 0
+
+    async def _ingest(self, file_name, data, emit):
+        cost = estimate_upload_cost(file_name, len(data), sniff_page_count(data, file_name))
+        await asyncio.to_thread(time.sleep, cost * self.seconds_per_cost)
+        self.ingests += 1
+        return {"status": "success", "message": "ok", "file_name": file_name, "chunks": 3}
+
+
+async def request(port: int, head: str, body: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"{head}Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    status, _, _ = response.partition(b"\r\n\r\n")
+    return int(status.split(b" ", 2)[1])
+
+
+async def ask(port: int, question: str) -> float:
+    body = json.dumps({"question": question}).encode()
+    started = time.perf_counter()
+    status = await request(
+        port, "POST /api/ask HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n", body
+    )
+    if status != 200:
+        raise RuntimeError(f"question failed with {status}")
+    return time.perf_counter() - started
+
+
+async def upload(port: int, file_name: str, data: bytes) -> int:
+    boundary = "benchboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{file_name}\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return await request(
+        port,
+        "POST /api/upload HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: multipart/form-data; boundary={boundary}\r\n",
+        body,
+    )
+
+
+def fake_pdf(index: int, pages: int, size: int) -> bytes:
+    head = b"%PDF-1.4\n" + f"% upload {index}\n".encode()
+    objects = b"".join(f"{i} 0 obj << /Type /Page >> endobj\n".encode() for i in range(pages))
+    return head + objects + b"0" * max(0, size - len(head) - len(objects))
+
+
+async def scenario(enabled: bool, args) -> dict:
+    API["EXECUTOR_THREADS"] = args.threads  # serve_api sizes the executor from this
+    admission._controller = AdmissionController({**ADMISSION, "ENABLED": enabled})
+
+    stop = asyncio.Event()
+    ready = asyncio.Event()
+    servers = []
+
+    def on_ready(server):
+        servers.append(server)
+        ready.set()
+
+    handler = HeavyServer(FakeAgent(args.agent_ms / 1e3), args.ms_per_cost / 1e3)
+    serving = asyncio.create_task(serve_api(handler, "127.0.0.1", 0, ready=on_ready, stop=stop))
+    await ready.wait()
+    port = servers[0].port
+
+    files = [fake_pdf(i, args.pages, args.upload_kb * 1024) for i in range(args.uploads)]
+    started = time.perf_counter()
+    uploading = asyncio.gather(*(upload(port, f"report-{i}.pdf", data) for i, data in enumerate(files)))
+    await asyncio.sleep(0.2)  # let the ingest burst take the executor first
+
+    async def question(i: int) -> float:
+        await asyncio.sleep(i * args.interval_ms / 1e3)
+        return await ask(port, f"Short question number {i}?")
+
+    latencies = await asyncio.gather(*(question(i) for i in range(args.questions)))
+    statuses = await uploading
+    ingest_s = time.perf_counter() - started
+
+    stop.set()
+    await serving
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "max": latencies[-1],
+        "ingested": handler.ingests,
+        "shed": sum(1 for s in statuses if s == 503),
+        "ingest_s": ingest_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--upload-kb", type=int, default=512)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=20.0)
+    parser.add_argument("--agent-ms", type=float, default=50.0)
+    parser.add_argument("--ms-per-cost", type=float, default=100.0, help="ingest time per estimated second")
+    parser.add_argument("--threads", type=int, default=16, help="executor threads")
+    args = parser.parse_args()
+
+    cost = estimate_upload_cost("x.pdf", args.upload_kb * 1024, args.pages)
+    print(
+        f"{args.uploads} uploads ({args.upload_kb} KB, {args.pages} pages, est. {cost:.1f} s, "
+        f"run {cost * args.ms_per_cost:.0f} ms each), {args.questions} questions "
+        f"(agent {args.agent_ms:.0f} ms), {args.threads} executor threads"
+    )
+    for enabled in (False, True):
+        r = asyncio.run(scenario(enabled, args))
+        print(
+            f"admission {'on ' if enabled else 'off'}  question p50 {r['p50'] * 1e3:7.0f} ms  "
+            f"p99 {r['p99'] * 1e3:7.0f} ms  max {r['max'] * 1e3:7.0f} ms  |  "
+            f"{r['ingested']} ingested, {r['shed']} shed, uploads done in {r['ingest_s']:.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""API load test: requests/sec and latency of /api/ask against a fake agent.
+
+Starts the real API server with an agent whose ``run`` sleeps for a fixed
+time (standing in for the hosted agent) and drives /api/ask from many
+concurrent keep-alive clients on localhost.
+
+Run from the backend directory:
+    python -m benchmarks.api_load --requests 5000 --concurrency 200 --agent-ms 50
+"""
+
+import json
+import time
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+from api.server import ApiServer, serve_api
+
+
+class FakeAgent:
+    """Blocking agent with a fixed run time, like the SDK's synchronous run."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def run(self, query: str, session_id: str = None):
+        time.sleep(self.latency)
+        return SimpleNamespace(
+            data={"output": f"Answer to: {query}", "session_id": session_id or "bench"}
+        )
+
+
+async def client(port: int, count: int, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for i in range(count):
+            body = json.dumps({"question": f"Is Executive Order {14000 + i} in effect?"}).encode()
+            sent = time.perf_counter()
+            writer.write(
+                (
+                    "POST /api/ask HTTP/1.1\r\nHost: localhost\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                ).encode()
+                + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head.startswith(b"HTTP/1.1 200"):
+                raise RuntimeError(head.split(b"\r\n")[0].decode())
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - sent)
+    finally:
+        writer.close()
+
+
+async def run(requests: int, concurrency: int, agent_ms: float):
+    stop = asyncio.Event()
+    ready = asyncio.Event()
+    servers = []
+
+    def on_ready(server):
+        servers.append(server)
+        ready.set()
+
+    handler = ApiServer(agent=FakeAgent(agent_ms / 1e3))
+    serving = asyncio.create_task(serve_api(handler, "127.0.0.1", 0, ready=on_ready, stop=stop))
+    await ready.wait()
+
+    latencies = []
+    per_client = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(client(servers[0].port, n, latencies) for n in per_client if n))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await serving
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+    print(
+        f"{len(latencies)} /api/ask requests, concurrency {concurrency}, agent {agent_ms:.0f} ms: "
+        f"{len(latencies) / elapsed:.0f} req/s, "
+        f"p50 {pick(0.50):.1f} ms, p95 {pick(0.95):.1f} ms, p99 {pick(0.99):.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--agent-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.agent_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Coalescing benchmark: backend calls during a burst of identical requests.
+
+Starts the real API server with a fake agent that counts its runs and an
+ingest step that counts its jobs, then sends a burst of concurrent
+requests: the same new question from many clients (varying only in case,
+spacing and trailing punctuation), a few distinct questions, and several
+uploads of one file under different names. Reports backend calls per
+unique request and the burst latency.
+
+Run from the backend directory:
+    python -m benchmarks.coalescing --clients 100 --agent-ms 500
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+
+from api.server import ApiServer, serve_api
+
+
+class CountingAgent:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.runs = 0
+
+    def run(self, query: str, session_id: str = None):
+        self.runs += 1
+        time.sleep(self.latency)
+        return SimpleNamespace(data={"output": f"Answer to: {query}", "session_id": f"s{self.runs}"})
+
+
+class CountingServer(ApiServer):
+    """ApiServer whose ingest stands in for extraction and upsert."""
+
+    def __init__(self, agent, ingest_s: float):
+        super().__init__(agent=agent)
+        self.ingest_s = ingest_s
+        self.ingests = 0
+
+    async def _ingest(self, file_name, data, emit):
+        self.ingests += 1
+        emit("received", {"file_name": file_name, "bytes": len(data)})
+        await asyncio.sleep(self.ingest_s)
+        return {"status": "success", "message": "ok", "file_name": file_name, "chunks": 3}
+
+
+async def request(port: int, head: str, body: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"{head}Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    status, _, payload = response.partition(b"\r\n\r\n")
+    if not status.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(status.split(b"\r\n")[0].decode())
+    return json.loads(payload)
+
+
+async def ask(port: int, question: str):
+    body = json.dumps({"question": question}).encode()
+    return await request(
+        port, "POST /api/ask HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n", body
+    )
+
+
+async def upload(port: int, file_name: str, data: bytes):
+    boundary = "benchboundary"
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{file_name}\"\r\n"
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return await request(
+        port,
+        "POST /api/upload HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: multipart/form-data; boundary={boundary}\r\n",
+        body,
+    )
+
+
+async def run(clients: int, distinct: int, uploads: int, agent_ms: float):
+    stop = asyncio.Event()
+    ready = asyncio.Event()
+    servers = []
+
+    def on_ready(server):
+        servers.append(server)
+        ready.set()
+
+    agent = CountingAgent(agent_ms / 1e3)
+    handler = CountingServer(agent, agent_ms / 1e3)
+    serving = asyncio.create_task(serve_api(handler, "127.0.0.1", 0, ready=on_ready, stop=stop))
+    await ready.wait()
+    port = servers[0].port
+
+    rng = random.Random(1)
+    variants = [
+        "Is Executive Order 14110 still in effect?",
+        "is executive order 14110 still in effect",
+        "Is  Executive Order 14110 still in effect??",
+        "IS EXECUTIVE ORDER 14110 STILL IN EFFECT?",
+    ]
+    questions = [rng.choice(variants) for _ in range(clients)]
+    questions += [f"What does Executive Order {13000 + i} require?" for i in range(distinct)]
+    data = b"Executive Order 14110. Safe, Secure, and Trustworthy AI.\n" * 200
+
+    started = time.perf_counter()
+    answers, stored = await asyncio.gather(
+        asyncio.gather(*(ask(port, q) for q in questions)),
+        asyncio.gather(*(upload(port, f"eo-14110-copy{i}.txt", data) for i in range(uploads))),
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await serving
+
+    burst = [a["answer"] for a in answers[:clients]]
+    sessions = sum(1 for a in answers[:clients] if a["session_id"])
+    print(
+        f"{len(questions)} questions ({clients} identical after normalization + {distinct} distinct), "
+        f"{uploads} uploads of one file, agent/ingest {agent_ms:.0f} ms"
+    )
+    print(f"agent runs     {agent.runs:4}  (unique questions: {distinct + 1})")
+    print(f"ingest jobs    {handler.ingests:4}  (unique files: 1)")
+    print(f"identical answers {len(set(burst)) == 1}, sessions handed out {sessions} (the run's starter only)")
+    print(f"uploads answered with their own names {all(s['file_name'] == f'eo-14110-copy{i}.txt' for i, s in enumerate(stored))}")
+    print(f"burst completed in {elapsed:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=5)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--agent-ms", type=float, default=500.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.distinct, args.uploads, args.agent_ms))
+
+
+if __name__ == "__main__":
+    main()
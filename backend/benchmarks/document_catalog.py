@@ -0,0 +1,95 @@
+"""Document catalog benchmark: /api/documents page latency at 100k documents.
+
+Fills a throwaway catalog with synthetic uploads, then times page queries
+the way the frontend makes them: the first page, a page deep in the list
+(reached by following cursors), name prefix and substring filters, and the
+newest documents first. Each query is repeated and the median reported.
+
+Run from the backend directory:
+    python -m benchmarks.document_catalog --documents 100000 --limit 50
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+from document.catalog import DocumentCatalog
+
+WORDS = [
+    "executive", "order", "policy", "memo", "guidance", "privacy", "energy",
+    "security", "report", "budget", "health", "trade", "labor", "climate",
+]
+
+
+def fill(catalog: DocumentCatalog, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    now = time.time()
+    rows = []
+    for i in range(count):
+        name = f"{'-'.join(rng.sample(WORDS, 3))}-{i:06d}.{rng.choice(['pdf', 'docx', 'txt'])}"
+        metadata = {
+            "file_path": f"/uploads/{name}",
+            "file_name": name,
+            "file_size": rng.randint(2_000, 20_000_000),
+            "checksum": f"{rng.getrandbits(128):032x}",
+            "source": "telegram_upload",
+            "processing_date": now - rng.random() * 3e7,
+        }
+        rows.append((metadata, rng.randint(1, 2_000), "bench"))
+        if len(rows) == 10_000:
+            catalog.upsert_many(rows)
+            rows = []
+    if rows:
+        catalog.upsert_many(rows)
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = DocumentCatalog(os.path.join(temp_dir, "catalog.sqlite3"))
+        started = time.perf_counter()
+        fill(catalog, args.documents)
+        print(f"Catalogued {catalog.count()} documents in {time.perf_counter() - started:.1f} s")
+
+        # the cursor of a page half-way through the list
+        cursor, pages = None, 0
+        while pages < args.documents // args.limit // 2:
+            _, cursor = catalog.page(limit=args.limit, cursor=cursor)
+            pages += 1
+
+        queries = {
+            "first page": dict(),
+            f"page {pages + 1} (cursor)": dict(cursor=cursor),
+            "prefix 'privacy-'": dict(query="privacy-", match="prefix"),
+            "substring 'energy'": dict(query="energy", match="substring"),
+            "substring '0042'": dict(query="0042", match="substring"),
+            "newest first": dict(sort="date", descending=True),
+            "largest first": dict(sort="size", descending=True),
+        }
+        for label, kwargs in queries.items():
+            ms, (items, _) = timed(
+                lambda: catalog.page(limit=args.limit, **kwargs), args.repeat
+            )
+            print(f"{label:28} {len(items):4} rows  {ms:7.2f} ms")
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
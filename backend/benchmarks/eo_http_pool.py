@@ -0,0 +1,168 @@
+"""Executive order HTTP benchmark: a new connection per call vs. the pooled session.
+
+Starts a local HTTPS stub of the Federal Register API (self-signed
+certificate made with the openssl command line tool) and calls the
+get_executive_order_pdf_url tool repeatedly: first with plain
+requests.get, as the deployed tool does, opening a TCP+TLS connection per
+call; then through the shared keep-alive pool pipeline.py gives the tools;
+then concurrently through the async variant. The stub counts the
+connections it accepts; --handshake-ms adds a delay to each new connection
+to stand in for the round trips of a real handshake.
+
+Run from the backend directory:
+    python -m benchmarks.eo_http_pool --calls 200 --concurrency 16 --handshake-ms 60
+"""
+
+import os
+import ssl
+import json
+import socket
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bot.executive_orders import _load_pipeline
+
+
+def make_certificate(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+            "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def start_tls_stub(cert: str, key: str, handshake: float):
+    connections = []
+
+    class FederalRegister(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            connections.append(time.perf_counter())
+            time.sleep(handshake)
+            # headers and body go out in separate writes; don't let Nagle hold the body
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            super().setup()
+
+        def do_GET(self):
+            term = parse_qs(urlsplit(self.path).query)["conditions[term]"][0]
+            number = term.strip('"').split()[-1]
+            body = json.dumps(
+                {
+                    "results": [
+                        {
+                            "title": f"Executive Order {number}",
+                            "executive_order_number": number,
+                            "pdf_url": f"https://www.govinfo.gov/content/pkg/EO-{number}.pdf",
+                        }
+                    ]
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FederalRegister)
+    server.daemon_threads = True
+    # handshake in the handler thread, not in the accept loop
+    server.socket = context.wrap_socket(
+        server.socket, server_side=True, do_handshake_on_connect=False
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def timed_run(label: str, connections, fn, calls: int):
+    before = len(connections)
+    started = time.perf_counter()
+    results = fn()
+    elapsed = time.perf_counter() - started
+    errors = [r for r in results if r.startswith("Error")]
+    if errors:
+        raise SystemExit(f"{label} failed: {errors[0]}")
+    print(
+        f"{label:24} {elapsed:6.2f} s  {calls / elapsed:7.0f} calls/s  "
+        f"{elapsed / calls * 1e3:6.1f} ms/call  {len(connections) - before:4} connections"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=4, help="pooled connections per host")
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cert, key = make_certificate(temp_dir)
+        server, connections = start_tls_stub(cert, key, args.handshake_ms / 1e3)
+        os.environ["REQUESTS_CA_BUNDLE"] = cert
+        os.environ["FEDERAL_REGISTER_API_URL"] = (
+            f"https://127.0.0.1:{server.server_port}/api/v1/documents.json"
+        )
+
+        pipeline = _load_pipeline()
+        pipeline.http_client.configure(per_host=args.per_host)
+        lookup = pipeline.get_executive_order_pdf_url
+        tool_globals = lookup.__globals__
+        numbers = [str(14000 + i % 500) for i in range(args.calls)]
+
+        print(
+            f"{args.calls} lookups against a local TLS stub, "
+            f"{args.handshake_ms:.0f} ms added per new connection"
+        )
+        get_session = tool_globals.pop("get_session")
+        fresh = timed_run(
+            "requests.get per call", connections, lambda: [lookup(n) for n in numbers], args.calls
+        )
+        tool_globals["get_session"] = get_session
+        pooled = timed_run(
+            "pooled session", connections, lambda: [lookup(n) for n in numbers], args.calls
+        )
+
+        async def concurrent():
+            gate = asyncio.Semaphore(args.concurrency)
+
+            async def one(number):
+                async with gate:
+                    return await pipeline.get_executive_order_pdf_url_async(number)
+
+            return await asyncio.gather(*(one(n) for n in numbers))
+
+        concurrent_s = timed_run(
+            f"async x{args.concurrency}, pooled",
+            connections,
+            lambda: asyncio.run(concurrent()),
+            args.calls,
+        )
+        print(
+            f"pooled {fresh / pooled:.1f}x faster than a connection per call; "
+            f"async {fresh / concurrent_s:.1f}x"
+        )
+        pipeline.http_client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
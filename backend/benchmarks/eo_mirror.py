@@ -0,0 +1,157 @@
+"""Executive order lookup benchmark: Federal Register API vs. the local mirror.
+
+Builds a JSON dump of synthetic executive orders (or uses --dump), syncs
+it into a throwaway mirror, and times get_executive_order_pdf_url against
+a local stub of the Federal Register API with and without the mirror, plus
+title searches. Orders newer than the dump must still reach the API, which
+the stub's request count checks.
+
+Run from the backend directory:
+    python -m benchmarks.eo_mirror --orders 3000 --lookups 2000
+"""
+
+import os
+import json
+import time
+import socket
+import random
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bot.executive_orders import _load_pipeline
+
+TOPICS = [
+    "Climate", "Cybersecurity", "Artificial Intelligence", "Trade", "Immigration",
+    "Health Care", "Energy", "Federal Workforce", "Privacy", "Supply Chains",
+]
+FIRST_ORDER = 12890
+
+
+def synthetic_orders(count: int):
+    rng = random.Random(3)
+    orders = []
+    for i in range(count):
+        number = FIRST_ORDER + i
+        date = f"{1994 + i * 31 // count}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        document_number = f"{date[:4]}-{rng.randint(1, 29999):05d}"
+        orders.append(
+            {
+                "executive_order_number": number,
+                "title": f"{rng.choice(TOPICS)} and {rng.choice(TOPICS)}: Order {number}",
+                "document_number": document_number,
+                "publication_date": date,
+                "signing_date": date,
+                "pdf_url": f"https://www.govinfo.gov/content/pkg/FR-{date}/pdf/{document_number}.pdf",
+            }
+        )
+    return orders
+
+
+def start_api_stub(orders):
+    by_number = {str(o["executive_order_number"]): o for o in orders}
+    hits = []
+
+    class FederalRegister(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            hits.append(self.path)
+            term = parse_qs(urlsplit(self.path).query)["conditions[term]"][0]
+            number = term.strip('"').split()[-1]
+            order = by_number.get(number) or {
+                "executive_order_number": number,
+                "title": f"Executive Order {number}",
+                "pdf_url": f"https://www.govinfo.gov/content/pkg/EO-{number}.pdf",
+            }
+            body = json.dumps({"results": [order]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FederalRegister)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def per_call_us(fn, calls) -> float:
+    started = time.perf_counter()
+    for call in calls:
+        fn(call)
+    return (time.perf_counter() - started) / len(calls) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=3000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--dump", help="JSON dump of API results to use instead of synthetic orders")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dump = args.dump
+        if dump:
+            with open(dump, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            orders = data.get("results", []) if isinstance(data, dict) else data
+        else:
+            orders = synthetic_orders(args.orders)
+            dump = os.path.join(temp_dir, "orders.json")
+            with open(dump, "w", encoding="utf-8") as f:
+                json.dump({"results": orders}, f)
+
+        server, hits = start_api_stub(orders)
+        os.environ["FEDERAL_REGISTER_API_URL"] = (
+            f"http://127.0.0.1:{server.server_port}/api/v1/documents.json"
+        )
+        pipeline = _load_pipeline()
+        mirror_module = pipeline.federal_register_mirror
+        lookup = pipeline.get_executive_order_pdf_url
+        rng = random.Random(5)
+        numbers = [str(rng.choice(orders)["executive_order_number"]) for _ in range(args.lookups)]
+
+        # without a mirror: every lookup is an API request
+        mirror_module.configure(os.path.join(temp_dir, "missing.sqlite3"))
+        api_us = per_call_us(lookup, numbers[:200])
+
+        path = os.path.join(temp_dir, "federal_register.sqlite3")
+        mirror_module.configure(path)
+        started = time.perf_counter()
+        mirror = mirror_module.FederalRegisterMirror(path)
+        loaded = mirror_module.sync(mirror, dump=dump)
+        sync_s = time.perf_counter() - started
+        mirror.close()
+
+        before = len(hits)
+        tool_us = per_call_us(lookup, numbers)
+        mirror_hits = len(hits) - before
+        raw_us = per_call_us(mirror_module.lookup, [int(n) for n in numbers])
+        newest = mirror_module.get_mirror().stats()["max_number"]
+        newer = lookup(str(newest + 1))
+        queries = ["climate", "artificial intelligence", "privacy trade"] * 100
+        search_us = per_call_us(lambda q: mirror_module.get_mirror().search(q), queries)
+
+        print(f"Synced {loaded} orders from a JSON dump in {sync_s * 1e3:.0f} ms")
+        print(f"tool lookup via API stub   {api_us:9.1f} us/call")
+        print(f"tool lookup via mirror     {tool_us:9.1f} us/call  ({mirror_hits} API requests)")
+        print(f"mirror lookup only         {raw_us:9.1f} us/call")
+        print(f"title search               {search_us:9.1f} us/call")
+        api_requests = len(hits) - before - mirror_hits
+        print(f"EO {newest + 1} (newer than the sync) -> {newer} ({api_requests} API request)")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
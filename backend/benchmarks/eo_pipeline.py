@@ -0,0 +1,139 @@
+"""Executive order chain benchmark: one order at a time vs. the local pipelined run.
+
+Starts two stub HTTP servers on localhost, a Federal Register API and a PDF
+host, each answering after a fixed delay, and points the deployed tool
+functions at them. Then runs search -> extract -> LLM (a sleeping fake) for
+several order numbers, first one order after another like the hosted
+pipeline, then with run_local(). Needs PyMuPDF, like the extraction tool.
+
+Run from the backend directory:
+    python -m benchmarks.eo_pipeline --orders 6 --delay-ms 150 --per-host 2
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from bot.executive_orders import _load_pipeline
+
+PDF_PATH = os.path.join("data", "default", "Executive-Order-13849-.pdf")
+
+
+def start_stub(handler_class) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stub_servers(delay: float):
+    with open(PDF_PATH, "rb") as f:
+        pdf = f.read()
+
+    class PdfHost(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(pdf)))
+            self.end_headers()
+            self.wfile.write(pdf)
+
+        def log_message(self, *args):
+            pass
+
+    pdf_host = start_stub(PdfHost)
+
+    class FederalRegister(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            term = parse_qs(urlsplit(self.path).query)["conditions[term]"][0]
+            number = term.strip('"').split()[-1]
+            body = json.dumps(
+                {
+                    "results": [
+                        {
+                            "title": f"Executive Order {number}",
+                            "executive_order_number": number,
+                            "pdf_url": f"http://127.0.0.1:{pdf_host.server_port}/{number}.pdf",
+                        }
+                    ]
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return start_stub(FederalRegister), pdf_host
+
+
+def sequential(pipeline, numbers, generate):
+    results = []
+    for number in numbers:
+        url = pipeline.get_executive_order_pdf_url(number)
+        text = pipeline.extract_text_from_pdf_url(url)
+        results.append(generate("", text))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=6)
+    parser.add_argument("--delay-ms", type=float, default=150.0, help="stub server delay per request")
+    parser.add_argument("--llm-ms", type=float, default=300.0, help="fake LLM time per order")
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--max-orders", type=int, default=4)
+    args = parser.parse_args()
+
+    delay = args.delay_ms / 1e3
+    api, pdf_host = stub_servers(delay)
+    os.environ["FEDERAL_REGISTER_API_URL"] = f"http://127.0.0.1:{api.server_port}/api/v1/documents.json"
+    pipeline = _load_pipeline()
+    numbers = [str(14000 + i) for i in range(args.orders)]
+
+    def generate(question, text):
+        time.sleep(args.llm_ms / 1e3)
+        return text[:80]
+
+    started = time.perf_counter()
+    sequential(pipeline, numbers, generate)
+    sequential_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        pipeline.run_local(
+            numbers, generate=generate, max_orders=args.max_orders, per_host=args.per_host
+        )
+    )
+    local_s = time.perf_counter() - started
+    errors = [r.error for r in results if r.error]
+    if errors:
+        raise SystemExit(f"Local run failed: {errors[0]}")
+
+    print(
+        f"{args.orders} orders, {args.delay_ms:.0f} ms per upstream request, "
+        f"{args.llm_ms:.0f} ms per LLM call, {args.per_host} per host, {args.max_orders} orders in flight"
+    )
+    print(f"one at a time   {sequential_s:6.2f} s")
+    print(f"pipelined       {local_s:6.2f} s  ({sequential_s / local_s:.1f}x)")
+    for r in results:
+        print(
+            f"  EO {r.order_number}: lookup {r.lookup_s * 1e3:4.0f} ms, "
+            f"extract {r.extract_s * 1e3:4.0f} ms, llm {r.generate_s * 1e3:4.0f} ms"
+        )
+    api.shutdown()
+    pdf_host.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Extraction benchmark: DOCX and HTML parsers, and the extraction pool.
+
+Generates large DOCX (paragraphs plus tables) and HTML files, then compares
+the previous implementations (python-docx paragraphs, BeautifulSoup with
+``html.parser``) against the streaming DOCX reader and lxml. Finally it
+extracts a batch of distinct files through the extraction process pool.
+
+Run from the backend directory:
+    python -m benchmarks.extraction_throughput --sections 2000 --files 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from document.extraction import extract_file
+from document.processor import DocumentProcessor
+
+SENTENCE = (
+    "The Secretary of the Treasury shall block all property and interests in "
+    "property of any foreign person determined to have engaged in significant "
+    "transactions. "
+)
+
+
+def generate_docx(path: str, sections: int, seed: int = 0):
+    import docx
+
+    document = docx.Document()
+    for i in range(sections):
+        document.add_heading(f"Sec. {seed}.{i}. Imposition of Sanctions", level=2)
+        document.add_paragraph(SENTENCE * 4)
+        if i % 10 == 0:
+            table = document.add_table(rows=4, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"Entity {seed}-{i}-{r}-{c} designated under section {c}"
+    document.save(path)
+
+
+def generate_html(path: str, sections: int, seed: int = 0):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<html><head><style>p { margin: 0 }</style></head><body>")
+        for i in range(sections):
+            f.write(f"<h2>Sec. {seed}.{i}. Imposition of Sanctions</h2>")
+            f.write(f"<p>{SENTENCE * 4}<a href='#'>note</a></p>")
+            f.write("<script>var tracking = true;</script>")
+            if i % 10 == 0:
+                f.write("<table>")
+                for r in range(4):
+                    f.write("<tr>" + "".join(f"<td>Entity {i}-{r}-{c}</td>" for c in range(3)) + "</tr>")
+                f.write("</table>")
+        f.write("</body></html>")
+
+
+def legacy_docx(path: str) -> str:
+    import docx
+
+    return "\n".join(p.text for p in docx.Document(path).paragraphs).strip()
+
+
+def legacy_html(path: str) -> str:
+    from bs4 import BeautifulSoup
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        soup = BeautifulSoup(f, "html.parser")
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return soup.get_text(separator="\n", strip=True)
+
+
+def best_of(function, path: str, runs: int):
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        text = function(path)
+        best = min(best, time.perf_counter() - started)
+    return best, len(text)
+
+
+def compare(label: str, path: str, legacy, current, runs: int):
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    old_s, old_chars = best_of(legacy, path, runs)
+    new_s, new_chars = best_of(current, path, runs)
+    print(f"{label} ({size_mb:.1f} MB on disk)")
+    print(f"  previous: {old_s * 1e3:8.1f} ms  {old_chars:>9} chars")
+    print(f"  current:  {new_s * 1e3:8.1f} ms  {new_chars:>9} chars  ({old_s / new_s:.1f}x faster)")
+
+
+def pool_throughput(paths, workers: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(extract_file, paths[:workers]))  # warm up worker imports
+        started = time.perf_counter()
+        results = list(pool.map(extract_file, paths))
+        elapsed = time.perf_counter() - started
+    assert all(results)
+    return len(paths) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    processor = DocumentProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        docx_path = os.path.join(tmp, "large.docx")
+        html_path = os.path.join(tmp, "large.html")
+        generate_docx(docx_path, args.sections)
+        generate_html(html_path, args.sections)
+        compare("DOCX", docx_path, legacy_docx, processor._docx_text, args.runs)
+
+        def current_html(path):
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                return processor._html_text(f.read())
+
+        compare("HTML", html_path, legacy_html, current_html, args.runs)
+
+        # distinct contents so the per-process text cache never hits
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"doc{i}.docx" if i % 2 else f"doc{i}.html")
+            (generate_html if i % 2 == 0 else generate_docx)(path, args.sections // 4, seed=i)
+            paths.append(path)
+        for workers in sorted({1, min(4, os.cpu_count() or 1)}):
+            print(f"extraction pool, {workers} worker(s): {pool_throughput(paths, workers):6.2f} files/s")
+
+
+if __name__ == "__main__":
+    main()
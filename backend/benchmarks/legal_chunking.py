@@ -0,0 +1,75 @@
+"""Chunking benchmark: sentence chunker vs. section-aware legal chunker.
+
+Indexes a labelled document set with each chunker into a local BM25 index
+and reports how many top-ranked chunks a question needs before every
+expected passage has been retrieved, and how much text that is.
+
+Run from the backend directory:
+    python -m benchmarks.legal_chunking --dataset executive_order_13849
+"""
+
+import argparse
+import statistics
+
+from document.indexer import build_records
+from document.processor import DocumentProcessor
+from evaluation.local_index import LocalIndex
+from evaluation.retrieval import chunks_needed, load_dataset
+
+MAX_K = 20
+
+
+def evaluate(documents, queries, chunker: str, chunk_size: int):
+    index = LocalIndex()
+    for document in documents:
+        index.upsert(
+            build_records(
+                document["text"], document["metadata"], chunker=chunker, chunk_size=chunk_size
+            )
+        )
+
+    needed, context = [], []
+    for query in queries:
+        details = index.search(query["question"], top_k=MAX_K).details
+        k = chunks_needed(details, query["expected"])
+        if k is not None:
+            needed.append(k)
+            context.append(sum(len(detail["data"]) for detail in details[:k]))
+
+    sizes = [len(record["value"]) for record in index.records.values()]
+    return {
+        "chunks": index.count(),
+        "mean_chunk_chars": statistics.mean(sizes),
+        "answered": len(needed),
+        "hit@3": sum(k <= 3 for k in needed) / len(queries),
+        "hit@5": sum(k <= 5 for k in needed) / len(queries),
+        "mean_chunks_needed": statistics.mean(needed) if needed else float("nan"),
+        "mean_context_chars": statistics.mean(context) if context else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default="executive_order_13849")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 400])
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.dataset)
+    processor = DocumentProcessor()
+    documents = [processor.process_file(path) for path in dataset["documents"]]
+    queries = dataset["queries"]
+
+    print(f"{len(queries)} questions, {len(documents)} document(s), answers searched in the top {MAX_K}")
+    print(f"{'chunker':<10}{'size':>5}{'chunks':>7}{'avg len':>9}{'found':>7}{'hit@3':>7}{'hit@5':>7}{'chunks/ans':>12}{'chars/ans':>11}")
+    for size in args.sizes:
+        for chunker in ("sentence", "legal"):
+            r = evaluate(documents, queries, chunker, size)
+            print(
+                f"{chunker:<10}{size:>5}{r['chunks']:>7}{r['mean_chunk_chars']:>9.0f}"
+                f"{r['answered']:>4}/{len(queries):<2}{r['hit@3']:>7.0%}{r['hit@5']:>7.0%}"
+                f"{r['mean_chunks_needed']:>12.2f}{r['mean_context_chars']:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
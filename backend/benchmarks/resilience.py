@@ -0,0 +1,136 @@
+"""Resilience benchmark: index searches against a fake backend that degrades.
+
+Runs search_index (caches off) against an in-process fake index whose
+latency and failures can be switched at runtime, through the same guard
+the bot uses, and walks through four phases:
+
+1. healthy with a slow tail: latency percentiles without and with hedging
+2. flaky (random errors): success rate without and with a retry
+3. outage (calls hang): time per failed call, then fail-fast once the
+   circuit opens
+4. recovery: the trial call after OPEN_SECONDS closes the circuit again
+
+Run from the backend directory:
+    python -m benchmarks.resilience --searches 400 --tail-share 0.03
+"""
+
+import time
+import random
+import argparse
+import statistics
+from types import SimpleNamespace
+
+from config.settings import RESILIENCE, SEARCH_CACHE
+from document.indexer import search_index
+from core.resilience import CircuitOpen, resilient
+
+
+class FakeIndex:
+    """Index whose search latency and failures are set by the benchmark."""
+
+    id = "fake-index"
+
+    def __init__(self, latency_ms: float, tail_ms: float, tail_share: float):
+        self.latency = latency_ms / 1e3
+        self.tail = tail_ms / 1e3
+        self.tail_share = tail_share
+        self.error_rate = 0.0
+        self.hang = 0.0
+        self.requests = 0
+        self.rng = random.Random(7)
+
+    def search(self, query: str, top_k: int = 10, filters=None):
+        self.requests += 1
+        if self.hang:
+            time.sleep(self.hang)
+            raise ConnectionError("backend hung up")
+        if self.rng.random() < self.error_rate:
+            raise ConnectionError("backend error")
+        slow = self.rng.random() < self.tail_share
+        time.sleep((self.tail if slow else self.latency) * self.rng.uniform(0.9, 1.1))
+        return SimpleNamespace(details=[{"data": f"passage for {query}", "score": 1.0}])
+
+
+def timed_searches(index: FakeIndex, count: int):
+    latencies, failures = [], 0
+    for i in range(count):
+        started = time.perf_counter()
+        try:
+            search_index(index, f"question {i}", 5)
+        except Exception:
+            failures += 1
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return latencies, failures
+
+
+def percentiles(latencies) -> str:
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return f"p50 {statistics.median(latencies) * 1e3:6.1f} ms  p99 {p99 * 1e3:6.1f} ms  max {latencies[-1] * 1e3:6.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--tail-ms", type=float, default=400.0)
+    parser.add_argument("--tail-share", type=float, default=0.03)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--hang-s", type=float, default=10.0)
+    parser.add_argument("--open-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    SEARCH_CACHE["ENABLED"] = False
+    RESILIENCE["OPEN_SECONDS"] = args.open_seconds
+    guard = resilient("search")
+    index = FakeIndex(args.latency_ms, args.tail_ms, args.tail_share)
+
+    print(f"1. healthy, {args.tail_share:.0%} of searches take {args.tail_ms:.0f} ms")
+    guard.enabled = False
+    latencies, _ = timed_searches(index, args.searches)
+    print(f"   unguarded   {percentiles(latencies)}")
+    guard.enabled = True
+    timed_searches(index, RESILIENCE["MIN_SAMPLES"])  # learn the latency first
+    before = index.requests
+    latencies, _ = timed_searches(index, args.searches)
+    extra = index.requests - before - args.searches
+    print(f"   hedged      {percentiles(latencies)}  ({extra} extra requests)")
+    print(f"   adaptive timeout now {guard.timeout():.2f} s (configured {RESILIENCE['CALLS']['search']['TIMEOUT_S']} s)")
+
+    print(f"2. flaky, {args.error_rate:.0%} of searches fail")
+    index.error_rate = args.error_rate
+    index.tail_share = 0.0
+    guard.enabled = False
+    _, failures = timed_searches(index, args.searches)
+    print(f"   unguarded   {1 - failures / args.searches:6.1%} answered")
+    guard.enabled = True
+    _, failures = timed_searches(index, args.searches)
+    print(f"   with retry  {1 - failures / args.searches:6.1%} answered, circuit {guard.breaker.state}")
+    index.error_rate = 0.0
+
+    print(f"3. outage, searches hang for {args.hang_s:.0f} s")
+    index.hang = args.hang_s
+    first_rejected = None
+    calls = []
+    for i in range(20):
+        started = time.perf_counter()
+        try:
+            search_index(index, f"outage {i}", 5)
+        except CircuitOpen:
+            first_rejected = i if first_rejected is None else first_rejected
+        except Exception:
+            pass
+        calls.append(time.perf_counter() - started)
+    print(f"   first {first_rejected} calls gave up after {statistics.mean(calls[:first_rejected]):.2f} s each")
+    print(f"   then the circuit was {guard.breaker.state}: {statistics.median(calls[first_rejected:]) * 1e6:.0f} us per refused call (median)")
+
+    print("4. recovery")
+    index.hang = 0.0
+    time.sleep(args.open_seconds)
+    latencies, failures = timed_searches(index, 20)
+    print(f"   after {args.open_seconds:.0f} s: {20 - failures}/20 answered, circuit {guard.breaker.state}")
+    print(f"   {guard.stats()}")
+
+
+if __name__ == "__main__":
+    main()
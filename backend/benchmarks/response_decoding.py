@@ -0,0 +1,81 @@
+"""Microbenchmark: agent-response decoding.
+
+Compares the previous handler logic (``ast.literal_eval`` once for the answer
+and again for the session ID) with ``decode_agent_response`` on realistic
+answer sizes, for Python-repr, JSON and plain-text payloads.
+
+Run from the backend directory:
+    python -m benchmarks.response_decoding
+"""
+
+import ast
+import json
+import timeit
+from types import SimpleNamespace
+
+from bot.responses import decode_agent_response
+
+PARAGRAPH = (
+    "Executive Order 14114 amends the sanctions framework established under "
+    "the Countering America's Adversaries Through Sanctions Act. It directs the "
+    "Secretary of the Treasury, in consultation with the Secretary of State, to "
+    "impose blocking measures on foreign financial institutions that facilitate "
+    "significant transactions for designated persons.\n\n"
+)
+
+
+def build_payload(answer_bytes: int) -> dict:
+    """Build an agent payload whose answer is roughly answer_bytes long."""
+    output = PARAGRAPH * max(1, answer_bytes // len(PARAGRAPH))
+    return {
+        "input": "What does EO 14114 change?",
+        "output": output,
+        "intermediate_steps": [
+            {"agent": "Policy Navigator", "tool": "ExecutiveOrderPDFSearch", "output": output[:2000]}
+        ],
+        "execution_stats": {
+            "session_id": "c4a1d9e2-5f7b-4b1e-9d2a-0f3e8c6b7a10",
+            "runtime": 12.4,
+            "api_calls": 6,
+            "credits": 0.0132,
+            "usage": {"prompt_tokens": 5321, "completion_tokens": 812},
+        },
+    }
+
+
+def legacy_decode(response):
+    """The handler logic this benchmark replaces."""
+    try:
+        answer = ast.literal_eval(response.data).get("output", "")
+    except Exception:
+        answer = response.data
+    try:
+        session_id = (ast.literal_eval(response.data).get("execution_stats") or {}).get(
+            "session_id"
+        )
+    except Exception:
+        session_id = None
+    return answer, session_id
+
+
+def bench(label: str, data: str, number: int):
+    response = SimpleNamespace(data=data)
+    legacy = timeit.timeit(lambda: legacy_decode(response), number=number) / number
+    current = timeit.timeit(lambda: decode_agent_response(response), number=number) / number
+    print(
+        f"{label:<28} {len(data) / 1024:>8.1f} KiB  legacy {legacy * 1e3:>9.3f} ms  "
+        f"decoder {current * 1e3:>9.3f} ms  speedup {legacy / current:>7.1f}x"
+    )
+
+
+def main():
+    for size in (4 * 1024, 64 * 1024, 512 * 1024):
+        payload = build_payload(size)
+        number = max(3, 2_000_000 // size)
+        bench(f"python repr ({size // 1024} KiB)", repr(payload), number)
+        bench(f"json ({size // 1024} KiB)", json.dumps(payload), number)
+        bench(f"plain text ({size // 1024} KiB)", payload["output"], number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Local load test: throughput of the sharded supervisor vs. worker count.
+
+Each update is handled by a CPU-heavy handler (chunking a large document,
+like an upload would) that then replies through a fake Bot API server.
+Throughput should grow close to linearly with workers up to the number of
+cores.
+
+Run from the backend directory:
+    python -m benchmarks.sharded_throughput --updates 400 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from telegram.ext import Application, MessageHandler, filters
+
+from benchmarks.webhook_latency import FakeBotApi, TOKEN
+from bot.sharding import Supervisor
+from core.http import HttpServer
+from document.indexer import chunk_text
+
+DOCUMENT = (
+    "Sec. 2. Imposition of Sanctions. The Secretary of the Treasury shall block all "
+    "property and interests in property of any foreign person determined to have "
+    "engaged in significant transactions. "
+) * 400
+
+
+async def chunk_and_reply(update, context):
+    chunk_text(DOCUMENT)
+    await update.message.reply_text(update.message.text)
+
+
+def build_benchmark_application() -> Application:
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .base_url(os.environ["BENCH_BOT_API_URL"])
+        .concurrent_updates(True)
+        .build()
+    )
+    application.add_handler(MessageHandler(filters.TEXT, chunk_and_reply))
+    return application
+
+
+def fake_update(update_id: int) -> dict:
+    user_id = 10_000 + update_id
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+            "text": f"ping {update_id}",
+        },
+    }
+
+
+async def measure(workers: int, updates: int) -> float:
+    api = FakeBotApi()
+    server = HttpServer(api)
+    await server.start()
+    # workers are fresh interpreters; pass the fake API address via the environment
+    os.environ["BENCH_BOT_API_URL"] = f"http://127.0.0.1:{server.port}/bot"
+
+    supervisor = Supervisor(build_benchmark_application, workers=workers, extraction_workers=1)
+    supervisor.start()
+    loop = asyncio.get_running_loop()
+    waiters = [
+        api.waiters.setdefault(f"ping {i}", loop.create_future()) for i in range(updates)
+    ]
+
+    # warm-up: let every worker start and connect before timing
+    await asyncio.sleep(3.0)
+    started = time.perf_counter()
+    for i in range(updates):
+        supervisor.dispatch(fake_update(i))
+    await asyncio.wait_for(asyncio.gather(*waiters), 300)
+    elapsed = time.perf_counter() - started
+
+    await asyncio.to_thread(supervisor.stop, 10)
+    await server.drain(1)
+    return updates / elapsed
+
+
+async def run(updates: int, worker_counts):
+    baseline = None
+    print(f"{os.cpu_count()} CPU(s) available")
+    for workers in worker_counts:
+        throughput = await measure(workers, updates)
+        baseline = baseline or throughput
+        print(
+            f"{workers:>2} worker(s): {throughput:8.1f} updates/s  "
+            f"scaling {throughput / baseline:4.2f}x (ideal {workers}x)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(args.updates, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Startup benchmark: import time of ``main`` and time-to-first-reply.
+
+1. Runs ``python -X importtime -c "import main"`` and parses its report into
+   the import time of ``main`` and its slowest direct imports.
+2. Starts a fresh interpreter that imports ``main``, builds the bot with the
+   real handlers against a fake Bot API, and feeds it a ``/help`` update;
+   time-to-first-reply is measured from process launch until the reply
+   reaches the fake API.
+
+Run from the backend directory:
+    python -m benchmarks.startup_time --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.webhook_latency import FakeBotApi, TOKEN
+from core.http import HttpServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, sys, time
+from telegram import Update
+from telegram.ext import Application
+import main
+
+async def first_reply(api_url):
+    application = Application.builder().token("{token}").base_url(api_url).build()
+    main.setup_handlers(application)
+    async with application:
+        await application.start()
+        await application.update_queue.put(Update.de_json({{
+            "update_id": 1,
+            "message": {{
+                "message_id": 1, "date": int(time.time()), "text": "/help",
+                "entities": [{{"type": "bot_command", "offset": 0, "length": 5}}],
+                "chat": {{"id": 42, "type": "private"}},
+                "from": {{"id": 42, "is_bot": False, "first_name": "User"}},
+            }},
+        }}, application.bot))
+        await asyncio.sleep(2)
+        await application.stop()
+
+asyncio.run(first_reply(sys.argv[1]))
+"""
+
+
+def parse_importtime(stderr: str, root: str = "main"):
+    """Return (root_seconds, [(cumulative_seconds, module)]) for root's direct imports.
+
+    ``-X importtime`` prints children before their parent, indenting one
+    level per two spaces, so the direct imports of ``root`` are the depth-1
+    lines seen since the previous top-level line.
+    """
+    children = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        name = module.lstrip()
+        depth = (len(module) - len(name) - 1) // 2
+        seconds = int(cumulative) / 1e6
+        if depth == 0:
+            if name == root:
+                return seconds, sorted(children, reverse=True)
+            children = []
+        elif depth == 1:
+            children.append((seconds, name))
+    return 0.0, []
+
+
+def measure_import_time():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+async def measure_first_reply() -> float:
+    api = FakeBotApi()
+    reply = asyncio.get_running_loop().create_future()
+
+    async def handler(request):
+        response = await api(request)
+        if request.path.endswith("/sendMessage") and not reply.done():
+            reply.set_result(time.perf_counter())
+        return response
+
+    server = HttpServer(handler)
+    await server.start()
+    started = time.perf_counter()
+    child = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        CHILD.format(token=TOKEN),
+        f"http://127.0.0.1:{server.port}/bot",
+        cwd=BACKEND_DIR,
+        env={**os.environ, "AIxPLAIN_API_KEY": os.environ.get("AIxPLAIN_API_KEY", "bench")},
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    replied = await asyncio.wait_for(reply, 60)
+    await child.wait()
+    await server.drain(1)
+    return replied - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        total, modules = measure_import_time()
+        totals.append(total)
+    print(f"import main: best {min(totals) * 1e3:.0f} ms over {args.runs} runs")
+    for seconds, module in modules[: args.top]:
+        print(f"  {seconds * 1e3:8.1f} ms  {module}")
+
+    replies = [asyncio.run(measure_first_reply()) for _ in range(args.runs)]
+    print(f"time-to-first-reply: best {min(replies) * 1e3:.0f} ms, worst {max(replies) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Local webhook test: post fake updates and measure request-to-reply latency.
+
+Starts a fake Telegram Bot API server and the real webhook endpoint around
+a python-telegram-bot Application whose ``base_url`` points at the fake
+API. Fake updates are POSTed to the webhook; latency is measured from the
+POST until the bot's ``sendMessage`` call reaches the fake API.
+
+Run from the backend directory:
+    python -m benchmarks.webhook_latency --updates 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from telegram.ext import Application, MessageHandler, filters
+
+from bot.webhook import serve_application
+from core.http import HttpServer, Request, Response
+
+TOKEN = "123456:TEST"
+
+
+class FakeBotApi:
+    """Just enough of the Bot API for getMe/sendMessage round trips."""
+
+    def __init__(self):
+        self.waiters = {}
+        self.message_id = 0
+
+    async def __call__(self, request: Request) -> Response:
+        method = request.path.rsplit("/", 1)[-1]
+        if request.headers.get("content-type", "").startswith("application/json"):
+            params = request.json() or {}
+        else:
+            params = {k: v[-1] for k, v in parse_qs(request.body.decode()).items()}
+
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        elif method == "sendMessage":
+            self.message_id += 1
+            chat_id = int(params["chat_id"])
+            waiter = self.waiters.pop(params.get("text"), None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(time.perf_counter())
+            result = {
+                "message_id": self.message_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": params.get("text", ""),
+            }
+        else:
+            result = True
+        return Response.json({"ok": True, "result": result})
+
+
+async def echo(update, context):
+    await update.message.reply_text(update.message.text)
+
+
+def fake_update(update_id: int, user_id: int) -> bytes:
+    return json.dumps(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+                "text": f"ping {update_id}",
+            },
+        }
+    ).encode()
+
+
+async def post_updates(port: int, path: str, ids, api: FakeBotApi, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    loop = asyncio.get_running_loop()
+    try:
+        for update_id in ids:
+            body = fake_update(update_id, 1000 + update_id % 500)
+            waiter = api.waiters[f"ping {update_id}"] = loop.create_future()
+            sent = time.perf_counter()
+            writer.write(
+                (
+                    f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                ).encode()
+                + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            replied = await asyncio.wait_for(waiter, 30)
+            latencies.append(replied - sent)
+    finally:
+        writer.close()
+
+
+async def run(updates: int, concurrency: int):
+    api = FakeBotApi()
+    api_server = HttpServer(api)
+    await api_server.start()
+
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .base_url(f"http://127.0.0.1:{api_server.port}/bot")
+        .concurrent_updates(True)
+        .build()
+    )
+    application.add_handler(MessageHandler(filters.TEXT, echo))
+
+    stop = asyncio.Event()
+    ready = asyncio.Event()
+    servers = []
+
+    def on_ready(server):
+        servers.append(server)
+        ready.set()
+
+    serving = asyncio.create_task(
+        serve_application(application, "127.0.0.1", 0, ready=on_ready, stop=stop)
+    )
+    await ready.wait()
+    path = "/telegram/webhook"
+
+    latencies = []
+    started = time.perf_counter()
+    batches = [range(i, updates, concurrency) for i in range(concurrency)]
+    await asyncio.gather(
+        *(post_updates(servers[0].port, path, ids, api, latencies) for ids in batches)
+    )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await serving
+    await api_server.drain(1)
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+    print(
+        f"{len(latencies)} updates, concurrency {concurrency}: "
+        f"{len(latencies) / elapsed:.0f} replies/s, "
+        f"p50 {pick(0.50):.2f} ms, p95 {pick(0.95):.2f} ms, p99 {pick(0.99):.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.updates, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import re
+import time
+import asyncio
+import dataclasses
+from typing import Any, AsyncContextManager, Awaitable, Callable, Hashable, Optional
+
+from config.secrets import DEFAULT_AGENT_ID
+from core.admission import QUERY, estimate_query_cost, get_admission
+from core.singleflight import SingleFlight
+from bot.responses import AgentResult, decode_agent_response, record_agent_metrics
+from bot.streaming import stream_agent_run
+
+ProgressCallback = Callable[[str], Awaitable[None]]
+
+# identical questions asked at the same time share one agent run
+_agent_flight = SingleFlight("agent")
+
+
+async def load_agent(agent_id: str = DEFAULT_AGENT_ID) -> Any:
+    """Fetch the agent off the event loop (SDK imported on first question)."""
+    from aixplain.factories import AgentFactory
+
+    return await asyncio.to_thread(AgentFactory.get, agent_id)
+
+
+async def run_agent(
+    agent: Any,
+    query: str,
+    session_id: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> AgentResult:
+    """Run the agent on a question, reporting progress text as it arrives."""
+    started = time.perf_counter()
+    response = None
+    async for event in stream_agent_run(agent, query, session_id):
+        if event.kind == "progress":
+            if on_progress is not None:
+                await on_progress(event.text)
+        else:
+            response = event.response
+
+    # decode answer, session & stats in one pass
+    result = decode_agent_response(response)
+    record_agent_metrics(result, time.perf_counter() - started)
+    return result
+
+
+def question_key(query: str) -> str:
+    """Normalize a question for coalescing: case, spacing and trailing punctuation."""
+    return re.sub(r"[\s?!.]+$", "", " ".join(query.lower().split()))
+
+
+async def run_agent_shared(
+    agent: Any,
+    query: str,
+    on_progress: Optional[ProgressCallback] = None,
+    admit: Optional[Callable[[], AsyncContextManager]] = None,
+) -> AgentResult:
+    """Run a question without session context, joining an identical run in flight.
+
+    Every caller gets the same answer and the same progress text. Only the
+    caller that started the run gets its session_id; the others get None,
+    so users never share an agent conversation. admit() wraps the shared run
+    only, so callers that join it take no admission slot.
+    """
+    key = (getattr(agent, "id", None), question_key(query))
+    leader = not _agent_flight.pending(key)
+
+    async def run(notify) -> AgentResult:
+        async def progress(text: str):
+            notify(text)
+
+        if admit is None:
+            return await run_agent(agent, query, None, progress)
+        async with admit():
+            return await run_agent(agent, query, None, progress)
+
+    result = await _agent_flight.do(key, run, on_progress)
+    return result if leader else dataclasses.replace(result, session_id=None)
+
+
+async def ask_agent(
+    agent: Any,
+    query: str,
+    session_id: Optional[str],
+    user: Hashable,
+    on_progress: Optional[ProgressCallback] = None,
+) -> AgentResult:
+    """Admit a question into the query queue and run it, coalesced when it has no session.
+
+    Raises core.admission.Overloaded when the question queue is full.
+    """
+
+    def admit() -> AsyncContextManager:
+        return get_admission().admit(QUERY, user, estimate_query_cost())
+
+    if session_id:
+        async with admit():
+            return await run_agent(agent, query, session_id, on_progress)
+    # identical new questions in flight share one agent run
+    return await run_agent_shared(agent, query, on_progress, admit)
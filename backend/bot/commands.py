@@ -1,16 +1,29 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from config.settings import TELEGRAM, DOCUMENT_PROCESSING
 from bot.utils import is_authorized_user, format_response, get_user_info
-from document.indexer import get_or_create_index, process_and_upsert_document
-from document.processor import DocumentProcessor
+from bot.sessions import get_session_store
+from bot.responses import BUSY_MESSAGE, HELP_MESSAGE
+from bot.router import router_stats
+from document.indexer import get_or_create_index, process_and_upsert_document, search_index
+from document.search_cache import get_search_cache
+from document.extraction import extract_document
+from document.rebuild import retain_for_indexing
+from core.admission import INGEST, Overloaded, estimate_upload_cost, get_admission, sniff_page_count
+from core.resilience import resilience_stats
+from core.singleflight import SingleFlight
 import os
+import asyncio
+import hashlib
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# concurrent uploads with the same checksum share one ingest job
+_ingest_flight = SingleFlight("ingest")
+
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Start command."""
@@ -50,18 +63,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    help_message = (
-        "Available Commands:\n\n"
-        "/start - Start conversation with bot\n"
-        "/help - Show this list\n"
-        "/status - Show system status\n"
-        "/session - Show current conversation session status\n"
-        "/add - Add document to knowledge base (you can simply send the document)\n"
-        "/search - Search in knowledge base (you can simply ask a question)\n\n"
-        "Note: You can send documents or questions directly without using commands."
-    )
-
-    await update.message.reply_text(help_message)
+    await update.message.reply_text(HELP_MESSAGE)
 
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -83,13 +85,24 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "document_count": index.count(),
             "status": "active",
         }
+        cache = get_search_cache().stats()
+        routed = router_stats()
+        failing = [
+            f"{name} ({call['state'].replace('_', '-')})"
+            for name, call in resilience_stats().items()
+            if call["state"] != "closed"
+        ]
 
         status_message = (
             "System Status:\n\n"
             f"• Knowledge Index: {status_info['index_name']} (ID: {status_info['index_id']})\n"
             f"• Document Count: {status_info['document_count']}\n"
             f"• Status: {status_info['status']}\n"
-            f"• Settings: {DOCUMENT_PROCESSING['CHUNK_SIZE']} chars/chunk, {DOCUMENT_PROCESSING['CHUNK_OVERLAP']} overlap"
+            f"• Settings: {DOCUMENT_PROCESSING['CHUNK_SIZE']} chars/chunk, {DOCUMENT_PROCESSING['CHUNK_OVERLAP']} overlap\n"
+            f"• Search cache: {cache['hit_ratio']:.0%} hits, {cache['saved_seconds']:.1f}s saved\n"
+            f"• Answered locally: {routed['local_share']:.0%} of {routed['messages']} messages, "
+            f"{routed['saved_seconds']:.1f}s saved\n"
+            f"• Backend calls: {', '.join(failing) if failing else 'all healthy'}"
         )
 
         await update.message.reply_text(status_message)
@@ -101,7 +114,42 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(error_message)
 
 
-user_sessions = {}
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Search the knowledge base and show the best matching passages."""
+    if not is_authorized_user(update):
+        await update.message.reply_text(
+            "Sorry, you are not authorized to use this bot."
+        )
+        return
+
+    query = " ".join(context.args or []).strip()
+    if not query:
+        await update.message.reply_text("Usage: /search <words to look for>")
+        return
+
+    try:
+        index = await asyncio.to_thread(get_or_create_index)
+        details = await asyncio.to_thread(search_index, index, query, 5)
+    except Exception as e:
+        await update.message.reply_text(
+            format_response("error", "Search failed", {"Details": str(e)})
+        )
+        return
+
+    if not details:
+        await update.message.reply_text("No matching passages found.")
+        return
+
+    lines = [f"Top {len(details)} passages for: {query}\n"]
+    for detail in details:
+        metadata = detail.get("metadata") or {}
+        source = metadata.get("file_name", "document")
+        if metadata.get("section_path"):
+            source += f", {metadata['section_path']}"
+        if metadata.get("page_start"):
+            source += f", p. {metadata['page_start']}"
+        lines.append(f"• [{source}] {str(detail.get('data', ''))[:300]}")
+    await update.message.reply_text("\n\n".join(lines))
 
 
 async def session_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -113,18 +161,39 @@ async def session_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     user_id = update.effective_user.id
-    session_id = user_sessions.get(user_id, "No active session")
+    session = get_session_store().info(user_id)
 
     status_message = (
         "Session Status:\n\n"
-        f"• Session Status: {'Active' if user_id in user_sessions else 'Inactive'}\n"
-        f"• session_id: {session_id}\n"
-        f"• Questions in this session: {'Unknown' if session_id == 'No active session' else 'Depends on Agent'}"
+        f"• Session Status: {'Active' if session else 'Inactive'}\n"
+        f"• session_id: {session['session_id'] if session else 'No active session'}\n"
+        f"• Questions in this session: {session['turns'] if session else 0}"
     )
 
     await update.message.reply_text(status_message)
 
 
+def _read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+async def _ingest_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Extract, index and retain one uploaded file; None if it has no text."""
+    # process file in the extraction pool
+    document_data = await extract_document(file_path)
+    if not document_data:
+        return None
+
+    # keep the original, so index rebuilds can re-extract it, and fetch index
+    index = await asyncio.to_thread(retain_for_indexing, file_path)
+
+    # upsert doc
+    return await asyncio.to_thread(
+        process_and_upsert_document, index, document_data
+    )
+
+
 async def add_document(
     update: Update, context: ContextTypes.DEFAULT_TYPE, file_path: str
 ):
@@ -139,24 +208,27 @@ async def add_document(
     print(f"{user_info} - Starting document processing: {file_path}")
 
     try:
-        # init processor
-        processor = DocumentProcessor()
-
-        # process file
-        document_data = processor.process_file(file_path)
-
-        if not document_data:
+        data = await asyncio.to_thread(_read_file, file_path)
+        checksum = hashlib.md5(data).hexdigest()
+        file_name = os.path.basename(file_path)
+        cost = estimate_upload_cost(file_name, len(data), sniff_page_count(data, file_name))
+        del data
+
+        async def ingest(notify) -> Optional[Dict[str, Any]]:
+            # uploads queue for their own slots, weighted by estimated cost
+            async with get_admission().admit(INGEST, update.effective_user.id, cost):
+                return await _ingest_file(file_path)
+
+        # copies of one file forwarded under one name at the same time share
+        # one ingest; the name decides the indexed document
+        result = await _ingest_flight.do(f"{file_name}\0{checksum}", ingest)
+
+        if not result:
             await update.message.reply_text(
                 "Failed to process document. Make sure the file is valid."
             )
             return
 
-        # fetch index
-        index = get_or_create_index()
-
-        # upsert doc
-        result = process_and_upsert_document(index, document_data)
-
         # build reply
         response = format_response(
             result["status"],
@@ -171,6 +243,10 @@ async def add_document(
         await update.message.reply_text(response)
         print(f"{user_info} - Document processed successfully: {file_path}")
 
+    except Overloaded as e:
+        await update.message.reply_text(BUSY_MESSAGE.format(retry_after=e.retry_after))
+        print(f"{user_info} - Upload shed: {str(e)}")
+
     except Exception as e:
         error_msg = format_response(
             "error", "Error processing document", {"Details": str(e)}
@@ -0,0 +1,75 @@
+import os
+import re
+import asyncio
+import importlib.util
+from typing import Any, Dict, List, Optional
+
+from config.settings import EXECUTIVE_ORDERS
+from core.metrics import metrics
+
+# "Executive Order 14067", "EO 14067", "E.O. 13849", "Executive Orders 14067 and 14068"
+ORDER_RE = re.compile(
+    r"\b(?:executive\s+orders?|e\.?\s?o\.?)\s*(?:no\.?\s*)?"
+    r"(\d{4,5}(?:(?:\s*,\s*|\s+and\s+|\s*&\s*)\d{4,5})*)",
+    re.I,
+)
+
+_pipeline = None
+
+
+def _load_pipeline():
+    """Load the retrieval chain module (its directory is not an importable package)."""
+    global _pipeline
+    if _pipeline is None:
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(
+            backend_dir, "aixplain", "executive_order_retrieval_agent", "pipeline.py"
+        )
+        spec = importlib.util.spec_from_file_location("eo_pipeline", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.http_client.configure(per_host=EXECUTIVE_ORDERS["HTTP_POOL_PER_HOST"])
+        module.federal_register_mirror.configure(
+            os.path.join(backend_dir, EXECUTIVE_ORDERS["MIRROR_PATH"])
+        )
+        _pipeline = module
+    return _pipeline
+
+
+def order_metadata(number: str) -> Optional[Dict[str, Any]]:
+    """Title, dates and PDF URL of an order from the local Federal Register mirror."""
+    mirror = _load_pipeline().federal_register_mirror.get_mirror()
+    return mirror.get(int(number)) if mirror is not None else None
+
+
+def find_order_numbers(text: str) -> List[str]:
+    """Return the executive order numbers named in a question, in order, without duplicates."""
+    numbers: List[str] = []
+    for match in ORDER_RE.finditer(text):
+        for number in re.findall(r"\d{4,5}", match.group(1)):
+            if number not in numbers:
+                numbers.append(number)
+    return numbers[: EXECUTIVE_ORDERS["MAX_ORDERS_PER_QUESTION"]]
+
+
+async def answer_executive_orders(question: str, order_numbers: List[str]) -> str:
+    """Run the local retrieval chain for the named orders and join the answers."""
+    pipeline = _load_pipeline()
+    generate = await asyncio.to_thread(pipeline.aixplain_generate)
+    with metrics.timer("executive_orders.latency_s"):
+        results = await pipeline.run_local(
+            order_numbers,
+            question,
+            generate=generate,
+            max_orders=EXECUTIVE_ORDERS["MAX_CONCURRENT_ORDERS"],
+            per_host=EXECUTIVE_ORDERS["PER_HOST_CONCURRENCY"],
+        )
+
+    parts = []
+    for result in results:
+        metrics.incr("executive_orders.errors" if result.error else "executive_orders.answered")
+        if result.error:
+            parts.append(f"Executive Order {result.order_number}: {result.error}")
+        else:
+            parts.append(f"Executive Order {result.order_number}\n{result.answer}\nSource: {result.pdf_url}")
+    return "\n\n".join(parts)
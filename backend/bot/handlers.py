@@ -1,5 +1,6 @@
 import os
 import time
+import asyncio
 from typing import Dict, Any
 from telegram import Update, Message
 from telegram.ext import (
@@ -9,22 +10,27 @@ from telegram.ext import (
     ContextTypes,
     ChatMemberHandler,
 )
-from config.settings import TELEGRAM, SECURITY
+from config.settings import TELEGRAM, SECURITY, EXECUTIVE_ORDERS, ROUTER
 from bot.commands import (
     start_command,
     help_command,
     status_command,
     session_status,
+    search_command,
     add_document,
 )
 from bot.utils import is_authorized_user, is_supported_file, get_file_extension
+from bot.sessions import get_session_store
+from bot.agent import ask_agent, load_agent
+from bot.responses import BUSY_MESSAGE, NO_ANSWER, UNAVAILABLE_MESSAGE
+from bot.streaming import ProgressiveReply
+from bot.executive_orders import answer_executive_orders, find_order_numbers
+from bot.router import route_message
+from core.admission import QUERY, Overloaded, estimate_query_cost, get_admission
+from core.resilience import CircuitOpen
 from document.processor import DocumentProcessor
-from aixplain.factories import AgentFactory
 from config.secrets import DEFAULT_AGENT_ID, DEFAULT_INDEX_ID
 
-# User session IDs
-user_sessions = {}
-
 
 async def handle_text_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle text queries with session support."""
@@ -40,82 +46,78 @@ async def handle_text_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     print(f"{user_info} - Received question: {query}")
 
+    reply = ProgressiveReply(update.message)
+
     try:
-        # typing action
-        await update.message.chat.send_action("typing")
+        # greetings, help and bare order lookups are answered without the agent
+        if ROUTER["ENABLED"]:
+            route = await asyncio.to_thread(route_message, query)
+            if route.local:
+                print(f"{user_info} - Answered locally ({route.intent})")
+                await update.message.reply_text(route.answer)
+                return
+
+        # placeholder instead of a bare typing action
+        await reply.start()
+
+        # questions naming executive orders can run the retrieval chain locally
+        order_numbers = find_order_numbers(query) if EXECUTIVE_ORDERS["MODE"] == "local" else []
+        if order_numbers:
+            print(f"{user_info} - Running local retrieval for orders {', '.join(order_numbers)}")
+            try:
+                async with get_admission().admit(QUERY, user_id, estimate_query_cost()):
+                    answer = await answer_executive_orders(query, order_numbers)
+            except Overloaded as e:
+                await reply.finish(BUSY_MESSAGE.format(retry_after=e.retry_after))
+                return
+            await reply.finish(answer)
+            return
 
-        # load agent
+        # load agent (SDK imported on first question)
         try:
-            agent = AgentFactory.get(DEFAULT_AGENT_ID)
+            agent = await load_agent()
         except Exception as e:
             print(f"Error getting Agent: {str(e)}")
-            await update.message.reply_text(
-                "Error connecting to Agent. Check Agent ID."
-            )
+            await reply.finish("Error connecting to Agent. Check Agent ID.")
             return
 
         # get session
-        session_id = user_sessions.get(user_id)
+        sessions = get_session_store()
+        session_id = sessions.get(user_id)
 
-        # run agent
+        # run agent, editing the placeholder as steps arrive
         try:
             if session_id:
                 print(
                     f"{user_info} - Using session_id: {session_id} to continue conversation"
                 )
-                response = agent.run(query=query, session_id=session_id)
             else:
                 print(f"{user_info} - Starting new conversation without session_id")
-                response = agent.run(query=query)
-
-            # extract answer
-            if hasattr(response, "data"):
-                if isinstance(response.data, str):
-                    # handle string data
-                    import ast
-
-                    try:
-                        data_dict = ast.literal_eval(response.data)
-                        answer = data_dict.get("output", "")
-                    except:
-                        answer = response.data
-                else:
-                    # handle object data
-                    answer = getattr(response.data, "output", "")
-            else:
-                answer = "Sorry, I couldn't understand the answer"
 
-            # reply with answer
-            await update.message.reply_text(answer)
+            try:
+                result = await ask_agent(agent, query, session_id, user_id, reply.update)
+            except Overloaded as e:
+                print(f"{user_info} - Shed: {str(e)}")
+                await reply.finish(BUSY_MESSAGE.format(retry_after=e.retry_after))
+                return
+            except CircuitOpen as e:
+                print(f"{user_info} - Failing fast: {str(e)}")
+                await reply.finish(UNAVAILABLE_MESSAGE.format(retry_after=e.retry_after))
+                return
+
+            # deliver answer, split across messages if needed
+            await reply.finish(result.answer or NO_ANSWER)
 
             # update session
-            try:
-                if hasattr(response, "data"):
-                    session_id = None
-                    if isinstance(response.data, str):
-                        try:
-                            data_dict = ast.literal_eval(response.data)
-                            session_id = (data_dict.get("execution_stats") or {}).get(
-                                "session_id"
-                            )
-                        except:
-                            pass
-                    else:
-                        session_id = (
-                            getattr(response.data, "execution_stats", {}) or {}
-                        ).get("session_id")
-
-                    if session_id:
-                        user_sessions[user_id] = session_id
-                        print(f"{user_info} - Session ID updated: {session_id}")
-            except Exception as e:
-                print(f"Error updating session_id: {str(e)}")
+            if result.session_id:
+                sessions.set(user_id, result.session_id)
+                print(f"{user_info} - Session ID updated: {result.session_id}")
 
             print(f"{user_info} - Question answered")
 
         except Exception as e:
             print(f"Error running Agent: {str(e)}")
-            await update.message.reply_text("Error processing question.")
+            await reply.finish("Error processing question.")
             return
 
     except Exception as e:
@@ -215,6 +217,7 @@ def setup_handlers(application):
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("status", status_command))
     application.add_handler(CommandHandler("session", session_status))
+    application.add_handler(CommandHandler("search", search_command))
 
     # Handle text (questions)
     application.add_handler(
@@ -0,0 +1,142 @@
+import ast
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+
+from core.metrics import metrics
+
+NO_ANSWER = "Sorry, I couldn't understand the answer"
+
+BUSY_MESSAGE = "I'm busy right now, please retry in {retry_after} s."
+
+UNAVAILABLE_MESSAGE = "The knowledge service is not responding, please retry in {retry_after} s."
+
+HELP_MESSAGE = (
+    "Available Commands:\n\n"
+    "/start - Start conversation with bot\n"
+    "/help - Show this list\n"
+    "/status - Show system status\n"
+    "/session - Show current conversation session status\n"
+    "/add - Add document to knowledge base (you can simply send the document)\n"
+    "/search - Search in knowledge base (you can simply ask a question)\n\n"
+    "Note: You can send documents or questions directly without using commands."
+)
+
+
+@dataclass
+class AgentResult:
+    """Decoded agent answer plus the execution stats reported with it."""
+
+    answer: str
+    session_id: Optional[str] = None
+    runtime: Optional[float] = None
+    tokens: Optional[int] = None
+    cost: Optional[float] = None
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_payload(data: str) -> Optional[Dict[str, Any]]:
+    """Parse a string agent payload once, JSON first.
+
+    Plain-text answers are returned as None without any parsing; only
+    strings that look like a mapping are handed to a parser, and the Python
+    literal parser is used only when the payload is not valid JSON.
+    """
+    text = data.strip()
+    if not text.startswith("{"):
+        return None
+
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        try:
+            payload = ast.literal_eval(text)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            return None
+
+    return payload if isinstance(payload, dict) else None
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _extract_tokens(stats: Dict[str, Any]) -> Optional[int]:
+    """Find a token count in the shapes the agent API reports it."""
+    for key in ("total_tokens", "tokens", "totalTokens"):
+        value = _to_number(stats.get(key))
+        if value is not None:
+            return int(value)
+
+    usage = stats.get("usage")
+    if isinstance(usage, dict):
+        value = _to_number(usage.get("total_tokens"))
+        if value is not None:
+            return int(value)
+        parts = [
+            _to_number(usage.get(key)) for key in ("prompt_tokens", "completion_tokens")
+        ]
+        if any(part is not None for part in parts):
+            return int(sum(part or 0 for part in parts))
+    return None
+
+
+def _build_result(output: Any, stats: Any, session_id: Any = None) -> AgentResult:
+    stats = stats if isinstance(stats, dict) else {}
+    session_id = session_id or stats.get("session_id") or stats.get("sessionId")
+
+    runtime = _to_number(stats.get("runtime", stats.get("run_time")))
+    cost = _to_number(stats.get("credits", stats.get("cost")))
+
+    return AgentResult(
+        answer=output if isinstance(output, str) else str(output or ""),
+        session_id=str(session_id) if session_id else None,
+        runtime=runtime,
+        tokens=_extract_tokens(stats),
+        cost=cost,
+        stats=stats,
+    )
+
+
+def decode_agent_response(response: Any) -> AgentResult:
+    """Decode an agent response into an AgentResult in a single pass."""
+    if not hasattr(response, "data"):
+        return AgentResult(answer=NO_ANSWER)
+
+    data = response.data
+    if isinstance(data, str):
+        payload = parse_payload(data)
+        if payload is None:
+            return AgentResult(answer=data)
+    elif isinstance(data, dict):
+        payload = data
+    else:
+        return _build_result(
+            getattr(data, "output", ""),
+            getattr(data, "execution_stats", None),
+            getattr(data, "session_id", None),
+        )
+
+    return _build_result(
+        payload.get("output", ""),
+        payload.get("execution_stats") or payload.get("executionStats"),
+        payload.get("session_id"),
+    )
+
+
+def record_agent_metrics(result: AgentResult, elapsed: float):
+    """Feed the execution stats of one agent run into the metrics registry."""
+    metrics.incr("agent.runs")
+    metrics.observe("agent.latency_s", elapsed)
+    if result.runtime is not None:
+        metrics.observe("agent.runtime_s", result.runtime)
+    if result.tokens is not None:
+        metrics.incr("agent.tokens", result.tokens)
+        metrics.observe("agent.tokens_per_run", result.tokens)
+    if result.cost is not None:
+        metrics.incr("agent.cost", result.cost)
@@ -0,0 +1,230 @@
+import re
+import time
+import importlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from config.settings import ROUTER
+from core.metrics import metrics
+from bot.responses import HELP_MESSAGE
+from bot.executive_orders import order_metadata
+
+GREETING = "greeting"
+THANKS = "thanks"
+HELP = "help"
+ORDER_LOOKUP = "order_lookup"
+AGENT = "agent"
+
+Model = Callable[[str], Tuple[str, float]]
+
+GREETING_ANSWER = (
+    "Hello! Ask me anything about the indexed documents or about any executive order, "
+    "or send me a document to add it. Type /help to see what else I can do."
+)
+THANKS_ANSWER = "You're welcome! Ask me anything else whenever you like."
+HELP_ANSWER = (
+    "Ask a question in plain words and I'll answer it from the indexed documents "
+    "and the Federal Register, citing the sources. Send a PDF, DOCX or TXT file to "
+    "add it to the knowledge base.\n\n" + HELP_MESSAGE
+)
+
+_GREETING_RE = re.compile(
+    r"^(?:hi+|hello+|hey+|hiya|howdy|yo|hola|greetings|good\s+(?:morning|afternoon|evening|day))"
+    r"(?:\s+(?:there|all|everyone|bot))?[\s!.,:)]*$",
+    re.I,
+)
+_THANKS_RE = re.compile(
+    r"^(?:thanks?(?:\s+(?:a\s+lot|so\s+much|again))?|thank\s+you(?:\s+(?:so\s+much|very\s+much))?"
+    r"|thx|ty|cheers|great|perfect|ok(?:ay)?\s+thanks?)[\s!.,:)]*$",
+    re.I,
+)
+_HELP_RE = re.compile(
+    r"^(?:help|/?help\s+me|how\s+(?:does\s+(?:this|it)\s+work|do\s+i\s+use\s+(?:this|you|it))"
+    r"|what\s+can\s+(?:you|i)\s+do(?:\s+here)?|what\s+(?:are|do)\s+you(?:\s+do)?"
+    r"|who\s+are\s+you|how\s+can\s+you\s+help(?:\s+me)?)[\s?!.]*$",
+    re.I,
+)
+# "what is EO 14114", "Executive Order 13849?", "link to E.O. 14067" -- nothing more
+_ORDER_LOOKUP_RE = re.compile(
+    r"^(?:(?:what|which)(?:'s|\s+is|\s+was)?|show(?:\s+me)?|find|get|give\s+me|look\s*up"
+    r"|(?:the\s+)?(?:link|pdf|url)\s+(?:to|for|of))?\s*(?:the\s+)?"
+    r"(?:executive\s+order|e\.?\s?o\.?)\s*(?:no\.?\s*|number\s*|#\s*)?(\d{4,5})[\s?!.]*$",
+    re.I,
+)
+
+# labelled examples for the built-in model ("MODEL": "examples")
+EXAMPLES = {
+    GREETING: [
+        "hi", "hello there", "hey bot", "good morning", "hello how are you",
+        "hi there how are you doing", "hey whats up", "good evening to you",
+    ],
+    THANKS: [
+        "thanks", "thank you very much", "thanks for the help", "that helped thanks",
+        "great thank you", "awesome thanks a lot",
+    ],
+    HELP: [
+        "how does this work", "what can you do", "how do i use this bot",
+        "what kind of questions can i ask", "how can you help me", "what is this bot for",
+        "help me get started", "what documents do you know about",
+    ],
+}
+
+
+@dataclass
+class Route:
+    """Where a message goes: answered locally (answer set) or sent to the agent."""
+
+    intent: str
+    answer: Optional[str] = None
+    order_numbers: List[str] = field(default_factory=list)
+
+    @property
+    def local(self) -> bool:
+        return self.answer is not None
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z']+", text.lower())
+
+
+class ExampleModel:
+    """Nearest labelled example by word cosine similarity; no dependencies, microseconds per call."""
+
+    def __init__(self, examples=EXAMPLES):
+        self.examples = [
+            (intent, Counter(_words(text))) for intent, texts in examples.items() for text in texts
+        ]
+
+    def __call__(self, text: str) -> Tuple[str, float]:
+        words = Counter(_words(text))
+        if not words:
+            return AGENT, 0.0
+        norm = sum(v * v for v in words.values()) ** 0.5
+        best, score = AGENT, 0.0
+        for intent, example in self.examples:
+            dot = sum(count * example[word] for word, count in words.items())
+            if dot:
+                similarity = dot / (norm * sum(v * v for v in example.values()) ** 0.5)
+                if similarity > score:
+                    best, score = intent, similarity
+        return best, score
+
+
+def load_model(name: Optional[str]) -> Optional[Model]:
+    """The optional model named in ROUTER['MODEL']."""
+    if not name:
+        return None
+    if name == "examples":
+        return ExampleModel()
+    module_name, _, function = name.partition(":")
+    return getattr(importlib.import_module(module_name), function)
+
+
+def _order_answer(number: str) -> Optional[str]:
+    order = order_metadata(number)
+    if not order or not order.get("pdf_url"):
+        return None
+    lines = [f"Executive Order {number}: {order['title']}"]
+    dates = []
+    if order.get("signing_date"):
+        dates.append(f"signed {order['signing_date']}")
+    if order.get("publication_date"):
+        dates.append(f"published {order['publication_date']}")
+    if dates:
+        lines.append(", ".join(dates).capitalize())
+    lines.append(f"PDF: {order['pdf_url']}")
+    return "\n".join(lines)
+
+
+class IntentRouter:
+    """Answers small talk, help and bare order lookups without the agent.
+
+    Rules decide first; the optional model only handles short messages the
+    rules missed. An order lookup is answered from the local Federal
+    Register mirror, and goes to the agent when the mirror lacks the order.
+    Everything else, i.e. every real question, goes to the agent.
+    """
+
+    def __init__(self, model: Optional[Model] = None, threshold: float = ROUTER["MODEL_THRESHOLD"]):
+        self.model = model
+        self.threshold = threshold
+
+    def classify(self, text: str) -> Tuple[str, List[str]]:
+        """Return the intent of a message and the order numbers it looks up."""
+        text = text.strip()
+        match = _ORDER_LOOKUP_RE.match(text)
+        if match:
+            return ORDER_LOOKUP, [match.group(1)]
+        if _GREETING_RE.match(text):
+            return GREETING, []
+        if _THANKS_RE.match(text):
+            return THANKS, []
+        if _HELP_RE.match(text):
+            return HELP, []
+        if self.model is not None and len(_words(text)) <= ROUTER["MAX_SMALL_TALK_WORDS"]:
+            intent, confidence = self.model(text)
+            if intent in (GREETING, THANKS, HELP) and confidence >= self.threshold:
+                return intent, []
+        return AGENT, []
+
+    def route(self, text: str) -> Route:
+        intent, numbers = self.classify(text)
+        if intent == GREETING:
+            return Route(intent, GREETING_ANSWER)
+        if intent == THANKS:
+            return Route(intent, THANKS_ANSWER)
+        if intent == HELP:
+            return Route(intent, HELP_ANSWER)
+        if intent == ORDER_LOOKUP:
+            return Route(intent, _order_answer(numbers[0]), numbers)
+        return Route(intent)
+
+
+def record_route(route: Route, elapsed: float):
+    """
+    Count a routed message and, for local answers, the agent time saved.
+
+    Args:
+        route: The route taken
+        elapsed: Seconds spent routing (and answering, when local)
+    """
+    metrics.incr(f"router.{route.intent}")
+    if not route.local:
+        metrics.incr("router.agent_routed")
+        return
+    metrics.incr("router.local")
+    metrics.observe("router.local_s", elapsed)
+    agent_s = metrics.percentile("agent.latency_s", 50) or ROUTER["AGENT_LATENCY_ESTIMATE_S"]
+    metrics.incr("router.saved_s", max(0.0, agent_s - elapsed))
+
+
+def router_stats() -> dict:
+    """Share of messages answered locally and the agent time saved."""
+    local = metrics.counter("router.local")
+    total = local + metrics.counter("router.agent_routed")
+    return {
+        "messages": int(total),
+        "local": int(local),
+        "local_share": local / total if total else 0.0,
+        "saved_seconds": metrics.counter("router.saved_s"),
+    }
+
+
+_router: Optional[IntentRouter] = None
+
+
+def get_router() -> IntentRouter:
+    """Return the process-wide router (model loaded on first use)."""
+    global _router
+    if _router is None:
+        _router = IntentRouter(load_model(ROUTER["MODEL"]))
+    return _router
+
+
+def route_message(text: str) -> Route:
+    """Route a message and record it; order lookups read the mirror, so run this off the loop."""
+    started = time.perf_counter()
+    route = get_router().route(text)
+    record_route(route, time.perf_counter() - started)
+    return route
@@ -0,0 +1,173 @@
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from config.settings import SESSIONS
+
+logger = logging.getLogger(__name__)
+
+# (session_id, last_seen, turns) - tuples keep per-user overhead small
+SessionEntry = Tuple[str, float, int]
+
+
+class SessionStore:
+    """Bounded store of agent session IDs keyed by Telegram user ID.
+
+    Entries are kept in an OrderedDict ordered by last access, so LRU eviction
+    and idle-TTL expiry both pop from the front in O(1). When ``persist_path``
+    is set, sessions are written through to SQLite and reloaded on start.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSIONS["MAX_SESSIONS"],
+        idle_ttl: float = SESSIONS["IDLE_TTL_SECONDS"],
+        persist_path: Optional[str] = SESSIONS["PERSIST_PATH"],
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[int, SessionEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.evictions = 0
+        self.expirations = 0
+
+        if persist_path:
+            self._open_db(str(Path(__file__).parent.parent / persist_path))
+
+    def _open_db(self, persist_path: str):
+        """Open the SQLite backing table and load unexpired sessions."""
+        self._db = sqlite3.connect(persist_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "user_id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, "
+            "last_seen REAL NOT NULL, turns INTEGER NOT NULL DEFAULT 0)"
+        )
+        cutoff = time.time() - self.idle_ttl
+        self._db.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,))
+        self._db.commit()
+
+        rows = self._db.execute(
+            "SELECT user_id, session_id, last_seen, turns FROM sessions "
+            "ORDER BY last_seen DESC LIMIT ?",
+            (self.max_sessions,),
+        ).fetchall()
+        for user_id, session_id, last_seen, turns in reversed(rows):
+            self._entries[user_id] = (session_id, last_seen, turns)
+        logger.info(f"Restored {len(rows)} sessions from {persist_path}")
+
+    def _expire(self, now: float):
+        """Drop idle entries from the least recently used end."""
+        cutoff = now - self.idle_ttl
+        while self._entries:
+            user_id, (_, last_seen, _) = next(iter(self._entries.items()))
+            if last_seen >= cutoff:
+                break
+            self._entries.popitem(last=False)
+            self.expirations += 1
+            self._db_delete(user_id)
+
+    def _db_delete(self, user_id: int):
+        if self._db is not None:
+            self._db.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+            self._db.commit()
+
+    def get(self, user_id: int) -> Optional[str]:
+        """Return the active session ID for a user, refreshing its recency."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.pop(user_id, None)
+            if entry is None:
+                return None
+            # order and last_seen move together, so expiry can stop at the first fresh entry
+            session_id, _, turns = entry
+            self._entries[user_id] = (session_id, now, turns)
+            if self._db is not None:
+                self._db.execute(
+                    "UPDATE sessions SET last_seen = ? WHERE user_id = ?", (now, user_id)
+                )
+                self._db.commit()
+            return session_id
+
+    def set(self, user_id: int, session_id: str):
+        """Record the session ID returned by the agent for a user."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            previous = self._entries.pop(user_id, None)
+            turns = previous[2] + 1 if previous and previous[0] == session_id else 1
+            self._entries[user_id] = (session_id, now, turns)
+
+            while len(self._entries) > self.max_sessions:
+                evicted_id, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                self._db_delete(evicted_id)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sessions (user_id, session_id, last_seen, turns) "
+                    "VALUES (?, ?, ?, ?)",
+                    (user_id, session_id, now, turns),
+                )
+                self._db.commit()
+
+    def info(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Return session details for a user without refreshing recency."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            session_id, last_seen, turns = entry
+            return {
+                "session_id": session_id,
+                "idle_seconds": int(now - last_seen),
+                "turns": turns,
+            }
+
+    def discard(self, user_id: int):
+        """Forget a user's session."""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self._db_delete(user_id)
+
+    def __contains__(self, user_id: int) -> bool:
+        return self.get(user_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.time())
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store size and eviction counters."""
+        return {
+            "active": len(self),
+            "capacity": self.max_sessions,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self):
+        """Close the persistence layer, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store shared by all handlers."""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore()
+    return _session_store
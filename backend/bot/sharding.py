@@ -0,0 +1,249 @@
+import asyncio
+import bisect
+import hashlib
+import signal
+import logging
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from telegram import Bot, Update
+from telegram.error import NetworkError
+from telegram.ext import Application
+
+from config.settings import DEPLOYMENT, SHARDING
+from bot.webhook import WebhookEndpoint, register_webhook
+from core.http import HttpServer
+from core.metrics import metrics
+from document.extraction import SharedExtractionPool, ExtractionClient, configure_extraction
+
+logger = logging.getLogger(__name__)
+
+
+class HashRing:
+    """Consistent hash ring mapping keys to worker slots.
+
+    Each slot is placed on the ring ``virtual_nodes`` times so keys spread
+    evenly, and adding or removing a slot only moves the keys adjacent to it.
+    """
+
+    def __init__(self, nodes: Iterable[int], virtual_nodes: int = SHARDING["VIRTUAL_NODES"]):
+        self.virtual_nodes = virtual_nodes
+        self._points: List[int] = []
+        self._owners: List[int] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def add_node(self, node: int):
+        for replica in range(self.virtual_nodes):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: int):
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def node_for(self, key: str) -> int:
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+def shard_key(data: Dict[str, Any]) -> str:
+    """Return the routing key of a raw update: its effective user ID when present."""
+    for key, value in data.items():
+        if key == "update_id" or not isinstance(value, dict):
+            continue
+        sender = value.get("from") or value.get("user")
+        if isinstance(sender, dict) and "id" in sender:
+            return str(sender["id"])
+        chat = value.get("chat")
+        if isinstance(chat, dict) and "id" in chat:
+            return f"chat:{chat['id']}"
+    return f"update:{data.get('update_id')}"
+
+
+async def _serve_shard(application: Application, queue: multiprocessing.Queue):
+    async with application:
+        await application.start()
+        while True:
+            data = await asyncio.to_thread(queue.get)
+            if data is None:
+                break
+            try:
+                update = Update.de_json(data, application.bot)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Dropping malformed update: {str(e)}")
+                continue
+            await application.update_queue.put(update)
+        # Application.stop waits for queued updates to be handled
+        await application.stop()
+
+
+def _shard_main(
+    build_application: Callable[[], Application],
+    shard: int,
+    queue: multiprocessing.Queue,
+    extraction: ExtractionClient,
+):
+    # the supervisor owns shutdown; workers stop on the queue sentinel
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_extraction(extraction)
+    logger.info(f"Bot worker {shard} starting")
+    asyncio.run(_serve_shard(build_application(), queue))
+
+
+class Supervisor:
+    """Forks bot worker processes and routes updates to them by user ID.
+
+    Every worker owns one slot on a consistent hash ring and has its own
+    update queue, so a user's updates (and session state) always land on
+    the same worker. Uploads are extracted by a SharedExtractionPool. Crashed
+    workers are restarted into the same slot with the same queue.
+    """
+
+    def __init__(
+        self,
+        build_application: Callable[[], Application],
+        workers: int = SHARDING["WORKERS"],
+        extraction_workers: int = SHARDING["EXTRACTION_WORKERS"],
+        virtual_nodes: int = SHARDING["VIRTUAL_NODES"],
+    ):
+        self.build_application = build_application
+        self.workers = max(1, workers)
+        self.context = multiprocessing.get_context(SHARDING["START_METHOD"])
+        self.ring = HashRing(range(self.workers), virtual_nodes)
+        self.queues = [self.context.Queue() for _ in range(self.workers)]
+        self.extraction = SharedExtractionPool(
+            extraction_workers, self.workers, self.context
+        )
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * self.workers
+
+    def _spawn(self, shard: int) -> multiprocessing.Process:
+        process = self.context.Process(
+            target=_shard_main,
+            args=(
+                self.build_application,
+                shard,
+                self.queues[shard],
+                self.extraction.client(shard),
+            ),
+            name=f"bot-worker-{shard}",
+        )
+        process.start()
+        return process
+
+    def start(self):
+        self.extraction.start()
+        for shard in range(self.workers):
+            self.processes[shard] = self._spawn(shard)
+
+    def dispatch(self, data: Dict[str, Any]) -> int:
+        """Queue a raw update on the worker that owns its user; return the shard."""
+        shard = self.ring.node_for(shard_key(data))
+        self.queues[shard].put(data)
+        metrics.incr(f"sharding.dispatched.{shard}")
+        return shard
+
+    async def dispatch_async(self, data: Dict[str, Any]):
+        self.dispatch(data)
+
+    def check_workers(self) -> int:
+        """Restart dead bot or extraction workers; return how many were restarted."""
+        restarted = self.extraction.ensure_alive()
+        for shard, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                logger.warning(
+                    f"Bot worker {shard} exited with code {process.exitcode}; restarting"
+                )
+                self.processes[shard] = self._spawn(shard)
+                restarted += 1
+        if restarted:
+            metrics.incr("sharding.restarts", restarted)
+        return restarted
+
+    def stop(self, timeout: float = DEPLOYMENT["DRAIN_TIMEOUT_SECONDS"]):
+        """Let workers finish queued updates, then stop everything."""
+        for queue in self.queues:
+            queue.put(None)
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.extraction.stop()
+
+
+async def _poll_into(bot: Bot, supervisor: Supervisor):
+    offset = None
+    async with bot:
+        await bot.delete_webhook()
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset, timeout=30, allowed_updates=Update.ALL_TYPES
+                )
+            except NetworkError as e:
+                logger.warning(f"Polling error: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+            for update in updates:
+                supervisor.dispatch(update.to_dict())
+                offset = update.update_id + 1
+
+
+async def _supervise(supervisor: Supervisor, bot: Bot, ingress: str = SHARDING["INGRESS"]):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    server = None
+    polling = None
+    if ingress == "webhook":
+        await register_webhook(bot)
+        server = HttpServer(
+            WebhookEndpoint(supervisor.dispatch_async),
+            DEPLOYMENT["WEBHOOK_LISTEN"],
+            DEPLOYMENT["WEBHOOK_PORT"],
+        )
+        await server.start()
+    else:
+        polling = asyncio.create_task(_poll_into(bot, supervisor))
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), SHARDING["HEALTH_CHECK_SECONDS"])
+        except asyncio.TimeoutError:
+            supervisor.check_workers()
+
+    if server is not None:
+        await server.drain(DEPLOYMENT["DRAIN_TIMEOUT_SECONDS"])
+    if polling is not None:
+        polling.cancel()
+        try:
+            await polling
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+def run_sharded(
+    build_application: Callable[[], Application],
+    workers: int = SHARDING["WORKERS"],
+    ingress: str = SHARDING["INGRESS"],
+):
+    """Run the bot as a supervisor with ``workers`` worker processes."""
+    supervisor = Supervisor(build_application, workers=workers)
+    supervisor.start()
+    try:
+        asyncio.run(_supervise(supervisor, build_application().bot, ingress))
+    finally:
+        supervisor.stop()
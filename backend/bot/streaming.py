@@ -0,0 +1,194 @@
+import asyncio
+import time
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, AsyncIterator, Optional
+
+from telegram import Message
+from telegram.error import BadRequest, RetryAfter
+
+from config.settings import STREAMING, SECURITY
+from bot.utils import split_message, truncate_message
+from core.metrics import metrics
+from core.resilience import resilient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentEvent:
+    """One event of an agent run: a progress update or the final response."""
+
+    kind: str  # "progress" or "result"
+    text: str = ""
+    response: Any = None
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a dict-like or attribute-style SDK object."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    value = getattr(obj, name, None)
+    if value is None and hasattr(obj, "get"):
+        try:
+            value = obj.get(name)
+        except Exception:
+            value = None
+    return default if value is None else value
+
+
+def describe_progress(polled: Any) -> str:
+    """Render the partial state of a polled agent run as user-facing text."""
+    lines = []
+
+    additional = _field(polled, "additional_fields", {}) or {}
+    progress = additional.get("progress") if isinstance(additional, dict) else None
+    if isinstance(progress, dict):
+        tool = progress.get("tool")
+        stage = str(progress.get("stage") or "working").replace("_", " ")
+        lines.append(f"⏳ {tool if tool else stage.capitalize()}...")
+
+    data = _field(polled, "data", {})
+    steps = _field(data, "intermediate_steps") or []
+    if isinstance(steps, list) and steps:
+        last = steps[-1]
+        output = last.get("output") if isinstance(last, dict) else None
+        if isinstance(output, str) and output.strip():
+            lines.append(output.strip())
+
+    partial = _field(data, "output")
+    if isinstance(partial, str) and partial.strip():
+        lines.append(partial.strip())
+
+    return "\n\n".join(lines)
+
+
+async def stream_agent_run(
+    agent: Any,
+    query: str,
+    session_id: Optional[str] = None,
+    poll_interval: float = STREAMING["POLL_INTERVAL_SECONDS"],
+    timeout: float = STREAMING["AGENT_TIMEOUT_SECONDS"],
+) -> AsyncIterator[AgentEvent]:
+    """Run an agent without blocking the event loop, yielding progress as it polls.
+
+    Agents exposing ``run_async``/``poll`` are polled for intermediate steps;
+    anything else falls back to a single ``run`` call in a worker thread.
+    The final event always has kind "result".
+    """
+    kwargs = {"query": query}
+    if session_id:
+        kwargs["session_id"] = session_id
+
+    if not (hasattr(agent, "run_async") and hasattr(agent, "poll")):
+        response = await asyncio.to_thread(resilient("agent").call, agent.run, **kwargs)
+        yield AgentEvent("result", response=response)
+        return
+
+    started = await asyncio.to_thread(resilient("agent").call, agent.run_async, **kwargs)
+    poll_url = _field(started, "url")
+    if not poll_url:
+        yield AgentEvent("result", response=started)
+        return
+
+    deadline = time.monotonic() + timeout
+    last_text = ""
+    while True:
+        polled = await asyncio.to_thread(resilient("agent_poll").call, agent.poll, poll_url)
+        if _field(polled, "completed", False) or str(
+            _field(polled, "status", "")
+        ).upper().endswith("FAILED"):
+            yield AgentEvent("result", response=polled)
+            return
+
+        text = describe_progress(polled)
+        if text and text != last_text:
+            last_text = text
+            yield AgentEvent("progress", text=text)
+
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Agent did not finish within {timeout} seconds")
+        await asyncio.sleep(poll_interval)
+
+
+class ProgressiveReply:
+    """A reply that starts as a placeholder and is edited as output arrives.
+
+    Edits are throttled to one per ``min_interval`` seconds (and pushed back
+    further when Telegram answers with RetryAfter); intermediate updates that
+    arrive in between are coalesced. ``finish`` splits the final answer at
+    paragraph boundaries into as many messages as needed.
+    """
+
+    def __init__(
+        self,
+        message: Message,
+        min_interval: float = STREAMING["EDIT_INTERVAL_SECONDS"],
+        max_length: int = SECURITY["MAX_MESSAGE_LENGTH"],
+    ):
+        self.message = message
+        self.min_interval = min_interval
+        self.max_length = max_length
+        self.placeholder: Optional[Message] = None
+        self._shown = ""
+        self._next_edit_at = 0.0
+        self._created_at = time.perf_counter()
+        self._first_update_recorded = False
+
+    async def start(self, text: str = STREAMING["PLACEHOLDER"]):
+        """Post the placeholder message."""
+        self.placeholder = await self.message.reply_text(text)
+        self._shown = text
+        self._next_edit_at = time.monotonic() + self.min_interval
+        metrics.observe("reply.placeholder_s", time.perf_counter() - self._created_at)
+
+    async def _edit(self, text: str) -> bool:
+        if self.placeholder is None or text == self._shown:
+            return True
+        try:
+            await self.placeholder.edit_text(text)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            self._next_edit_at = time.monotonic() + float(retry_after)
+            metrics.incr("reply.edits_throttled")
+            return False
+        except BadRequest as e:
+            # "message is not modified" and similar are harmless
+            logger.debug(f"Skipped message edit: {str(e)}")
+            return False
+        self._shown = text
+        self._next_edit_at = time.monotonic() + self.min_interval
+        metrics.incr("reply.edits")
+        return True
+
+    async def update(self, text: str):
+        """Show partial output, unless an edit was made too recently."""
+        if not self._first_update_recorded:
+            self._first_update_recorded = True
+            metrics.observe("reply.first_update_s", time.perf_counter() - self._created_at)
+        if time.monotonic() < self._next_edit_at:
+            return
+        await self._edit(truncate_message(text, self.max_length))
+
+    async def finish(self, text: str):
+        """Deliver the final answer, split into several messages if needed."""
+        parts = split_message(text, self.max_length) or [text]
+
+        if self.placeholder is None:
+            await self.message.reply_text(parts[0])
+        else:
+            delay = self._next_edit_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not await self._edit(parts[0]):
+                if self._shown != parts[0]:
+                    await self.message.reply_text(parts[0])
+
+        for part in parts[1:]:
+            await self.message.reply_text(part)
+
+        metrics.observe("reply.total_s", time.perf_counter() - self._created_at)
+        metrics.observe("reply.messages", len(parts))
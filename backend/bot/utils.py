@@ -1,6 +1,6 @@
 import os
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from telegram import Update, Message
 from telegram.ext import ContextTypes
 from pathlib import Path
@@ -56,6 +56,30 @@ def truncate_message(
     return text[: max_length - 3] + "..."
 
 
+def split_message(
+    text: str, max_length: int = SECURITY["MAX_MESSAGE_LENGTH"]
+) -> List[str]:
+    """Split text into messages of at most max_length, preferring paragraph breaks."""
+    parts = []
+    remaining = text.strip()
+    while len(remaining) > max_length:
+        window = remaining[:max_length]
+        # paragraph, then line, then sentence, then word boundary
+        cut = -1
+        for separator in ("\n\n", "\n", ". ", " "):
+            index = window.rfind(separator)
+            if index > max_length // 2:
+                cut = index + (1 if separator == ". " else 0)
+                break
+        if cut <= 0:
+            cut = max_length
+        parts.append(remaining[:cut].rstrip())
+        remaining = remaining[cut:].lstrip()
+    if remaining:
+        parts.append(remaining)
+    return parts
+
+
 def get_file_extension(file_name: str) -> str:
     """Return file extension."""
     return os.path.splitext(file_name)[1].lower()
@@ -0,0 +1,124 @@
+import asyncio
+import hmac
+import signal
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from telegram import Bot, Update
+from telegram.ext import Application
+
+from config.settings import DEPLOYMENT
+from config.secrets import WEBHOOK_URL, WEBHOOK_SECRET_TOKEN
+from core.http import HttpServer, Request, Response
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+UpdateSink = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def application_sink(application: Application) -> UpdateSink:
+    """Return a sink that queues raw updates on an Application."""
+
+    async def sink(data: Dict[str, Any]):
+        await application.update_queue.put(Update.de_json(data, application.bot))
+
+    return sink
+
+
+class WebhookEndpoint:
+    """HTTP handler that hands Telegram webhook updates to a sink."""
+
+    def __init__(
+        self,
+        sink: UpdateSink,
+        path: str = DEPLOYMENT["WEBHOOK_PATH"],
+        secret_token: str = WEBHOOK_SECRET_TOKEN,
+    ):
+        self.sink = sink
+        self.path = path
+        self.secret_token = secret_token
+
+    async def __call__(self, request: Request) -> Response:
+        if request.path != self.path:
+            return Response(404, b"Not found")
+        if request.method != "POST":
+            return Response(405, b"Method not allowed")
+
+        if self.secret_token:
+            received = request.headers.get("x-telegram-bot-api-secret-token", "")
+            if not hmac.compare_digest(received, self.secret_token):
+                metrics.incr("webhook.rejected")
+                return Response(403, b"Forbidden")
+
+        # acknowledge immediately; handlers run from the update queue
+        try:
+            await self.sink(request.json())
+        except (ValueError, KeyError, TypeError):
+            return Response(400, b"Invalid update")
+
+        metrics.incr("webhook.updates")
+        return Response(200)
+
+
+async def register_webhook(bot: Bot):
+    """Point Telegram at this deployment's webhook URL."""
+    if not WEBHOOK_URL:
+        raise EnvironmentError("WEBHOOK_URL must be set to run in webhook mode")
+    async with bot:
+        await bot.set_webhook(
+            url=WEBHOOK_URL.rstrip("/") + DEPLOYMENT["WEBHOOK_PATH"],
+            secret_token=WEBHOOK_SECRET_TOKEN or None,
+        )
+    logger.info(f"Webhook registered at {WEBHOOK_URL}")
+
+
+async def serve_application(
+    application: Application,
+    host: str = DEPLOYMENT["WEBHOOK_LISTEN"],
+    port: int = DEPLOYMENT["WEBHOOK_PORT"],
+    ready: Optional[Callable[[HttpServer], None]] = None,
+    stop: Optional[asyncio.Event] = None,
+):
+    """Serve webhook updates until SIGTERM/SIGINT, then drain gracefully.
+
+    On shutdown the listener closes first, in-flight HTTP requests finish,
+    and ``Application.stop`` waits for queued updates to be handled.
+    """
+    if stop is None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+
+    async with application:
+        await application.start()
+        server = HttpServer(WebhookEndpoint(application_sink(application)), host, port)
+        await server.start()
+        if ready is not None:
+            ready(server)
+
+        await stop.wait()
+        logger.info("Draining webhook server...")
+        await server.drain(DEPLOYMENT["DRAIN_TIMEOUT_SECONDS"])
+        await application.stop()
+
+
+def run_webhook(build_application: Callable[[], Application]):
+    """Run the bot in webhook mode.
+
+    With DEPLOYMENT['WORKERS'] > 1 one process receives the webhook and
+    routes updates by user ID to spawned worker processes (bot.sharding),
+    so a user's session always lives in the same worker.
+    """
+    workers = max(1, DEPLOYMENT["WORKERS"])
+    if workers > 1:
+        from bot.sharding import run_sharded
+
+        run_sharded(build_application, workers=workers, ingress="webhook")
+        return
+
+    application = build_application()
+    asyncio.run(register_webhook(application.bot))
+    asyncio.run(serve_application(application))
@@ -16,3 +16,7 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 # Optional defaults (IDs) can be provided via env vars.
 DEFAULT_INDEX_ID = os.getenv("DEFAULT_INDEX_ID", "")
 DEFAULT_AGENT_ID = os.getenv("DEFAULT_AGENT_ID", "")
+
+# Webhook mode: public HTTPS base URL Telegram should call, and the secret it echoes back.
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN", "")
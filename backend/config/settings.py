@@ -17,15 +17,116 @@ TELEGRAM = {
 
 # Document processing settings
 DOCUMENT_PROCESSING = {
+    "CHUNKER": "legal",  # "legal" (section-aware, see document/chunking.py) or "sentence"
     "CHUNK_SIZE": 200,
     "CHUNK_OVERLAP": 20,
     "TEMP_DIR": "temp_uploads",
+    "TEXT_CACHE_SIZE": 32,  # extracted texts kept per extraction process, by file checksum
+}
+
+# OCR fallback for PDF pages without a text layer (scanned documents)
+OCR = {
+    "ENABLED": True,  # only used when the engine below is installed
+    "TESSERACT_CMD": "tesseract",
+    "LANGUAGE": "eng",
+    "DPI": 300,
+    "MAX_WORKERS": 2,  # concurrent engine processes per extraction process
+    "PAGE_TIMEOUT_SECONDS": 120,
+    "CACHE_DIR": "data/ocr_cache",  # page texts by page hash, relative to backend
 }
 
 # Indexing settings
 INDEXING = {
     "INDEX_NAME": "Knowledge Base",
     "EMBEDDING_MODEL": "673248d66eb563b2b00f75d1",  
+    "UPSERT_BATCH_SIZE": 100,  # records per upsert when reporting ingest progress
+}
+
+# Full index rebuilds (document/rebuild.py)
+REBUILD = {
+    "STATE_FILE": "data/index_state.json",  # active index and rebuild progress, relative to backend
+    "SOURCES_DIR": "data/sources",  # uploaded originals kept for re-extraction, relative to backend
+    "WORKERS": 4,  # extraction processes
+    "BATCH_SIZE": 200,  # records per upsert into the shadow index
+}
+
+# Local document catalog for listing (document/catalog.py)
+CATALOG = {
+    "PATH": "data/catalog.sqlite3",  # relative to backend
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 1000,
+}
+
+# Executive order retrieval chain (aixplain/executive_order_retrieval_agent/pipeline.py)
+EXECUTIVE_ORDERS = {
+    "MODE": "agent",  # "agent" (hosted agent answers) or "local" (chain runs in the bot)
+    "MAX_CONCURRENT_ORDERS": 4,
+    "PER_HOST_CONCURRENCY": 2,  # Federal Register, govinfo and the LLM each
+    "HTTP_POOL_PER_HOST": 4,  # keep-alive connections per upstream host
+    # local Federal Register mirror, filled by federal_register_mirror.py sync;
+    # the path is relative to backend
+    "MIRROR_PATH": "data/federal_register.sqlite3",
+    "MAX_ORDERS_PER_QUESTION": 5,
+}
+
+# Local intent router in front of the agent (bot/router.py)
+ROUTER = {
+    "ENABLED": True,
+    # None (rules only), "examples" (built-in nearest-example model) or
+    # "package.module:function" returning (intent, confidence) for a text
+    "MODEL": None,
+    "MODEL_THRESHOLD": 0.6,
+    "MAX_SMALL_TALK_WORDS": 8,  # longer messages always go to the agent
+    "AGENT_LATENCY_ESTIMATE_S": 8.0,  # until agent latencies have been measured
+}
+
+# Admission control and fair scheduling of questions and uploads (core/admission.py)
+ADMISSION = {
+    "ENABLED": True,
+    "QUERY_SLOTS": 32,  # questions running at once
+    "INGEST_SLOTS": 2,  # uploads being extracted and indexed at once
+    "MAX_QUERY_BACKLOG_S": 300,  # estimated seconds of queued questions before shedding
+    "MAX_INGEST_BACKLOG_S": 600,  # estimated seconds of queued uploads before shedding
+    "QUERY_COST_S": 8.0,  # until agent latencies have been measured
+    "INGEST_BASE_S": 2.0,
+    "INGEST_S_PER_MB": 1.0,
+    "INGEST_S_PER_PAGE": 0.2,
+    "USER_WEIGHTS": {},  # user ID -> share weight (default 1)
+}
+
+# Timeouts, retries, hedging and circuit breakers for aiXplain calls (core/resilience.py)
+RESILIENCE = {
+    "ENABLED": True,
+    "FAILURE_THRESHOLD": 5,  # consecutive failures that open a call's circuit
+    "OPEN_SECONDS": 30,  # fail fast this long, then let one trial call through
+    "TIMEOUT_PERCENTILE": 99,
+    "TIMEOUT_MULTIPLIER": 3.0,  # timeout = multiplier x recent p99, within the call's bounds
+    "HEDGE_PERCENTILE": 95,  # hedged calls slower than this get a second request
+    "HEDGE_BUDGET": 0.1,  # at most this share of calls is hedged
+    "MIN_SAMPLES": 20,  # until then TIMEOUT_S applies and nothing is hedged
+    "THREADS_PER_CALL": 16,
+    "RETRY_BACKOFF_S": 0.2,
+    # TIMEOUT_S applies until latencies are known; only read-only calls are hedged
+    "CALLS": {
+        "agent": {"TIMEOUT_S": 120, "MIN_TIMEOUT_S": 10, "MAX_TIMEOUT_S": 300, "RETRIES": 0, "HEDGE": False},
+        "agent_poll": {"TIMEOUT_S": 15, "MIN_TIMEOUT_S": 2, "MAX_TIMEOUT_S": 60, "RETRIES": 1, "HEDGE": False},
+        "search": {"TIMEOUT_S": 10, "MIN_TIMEOUT_S": 1, "MAX_TIMEOUT_S": 30, "RETRIES": 1, "HEDGE": True},
+        "upsert": {"TIMEOUT_S": 60, "MIN_TIMEOUT_S": 5, "MAX_TIMEOUT_S": 300, "RETRIES": 1, "HEDGE": False},
+        "index_lookup": {"TIMEOUT_S": 15, "MIN_TIMEOUT_S": 2, "MAX_TIMEOUT_S": 60, "RETRIES": 1, "HEDGE": True},
+    },
+}
+
+# Index search caches (document/search_cache.py)
+SEARCH_CACHE = {
+    "ENABLED": True,
+    "MAX_QUERIES": 2048,
+    "MAX_CHUNK_BYTES": 16 * 1024 * 1024,
+    "TTL_SECONDS": 60 * 60,
+    "PREFETCH_HOT_QUERIES": 20,  # re-run after an upsert invalidates results
+    # upserts in any worker process retire every process's cached results;
+    # the path is relative to backend
+    "GENERATIONS_PATH": "data/search_generations.sqlite3",  # "" keeps them per process
+    "GENERATION_CHECK_SECONDS": 1.0,
 }
 
 # Security settings
@@ -33,3 +134,59 @@ SECURITY = {
     "AUTHORIZED_USER_IDS": [], 
     "MAX_MESSAGE_LENGTH": 4000,
 }
+
+# Conversation session settings
+SESSIONS = {
+    "MAX_SESSIONS": 10000,
+    "IDLE_TTL_SECONDS": 6 * 60 * 60,
+    "PERSIST_PATH": "",  # e.g. "data/sessions.sqlite3", relative to backend, to survive restarts
+}
+
+# Progressive answer delivery settings
+STREAMING = {
+    "PLACEHOLDER": "Looking into your question...",
+    "EDIT_INTERVAL_SECONDS": 1.5,  # Telegram allows roughly one edit per second per chat
+    "POLL_INTERVAL_SECONDS": 0.5,
+    "AGENT_TIMEOUT_SECONDS": 300,
+}
+
+# Deployment settings
+DEPLOYMENT = {
+    "MODE": "polling",  # "polling", "webhook" or "sharded"
+    "WEBHOOK_LISTEN": "0.0.0.0",
+    "WEBHOOK_PORT": 8443,
+    "WEBHOOK_PATH": "/telegram/webhook",
+    "WORKERS": 1,  # webhook worker processes; above 1 updates are routed by user (bot/sharding.py)
+    "DRAIN_TIMEOUT_SECONDS": 30,
+}
+
+# HTTP API for the web frontend (api/server.py)
+API = {
+    "HOST": "127.0.0.1",
+    "PORT": 5001,
+    "ALLOWED_ORIGIN": "*",  # Access-Control-Allow-Origin sent to browsers
+    "MAX_UPLOAD_MB": 20,
+    "KEEP_ALIVE_SECONDS": 75,
+    "EXECUTOR_THREADS": 64,  # concurrent blocking agent/index calls
+    "SSE_HEARTBEAT_SECONDS": 15,  # comment sent on quiet event streams
+}
+
+# Sharded supervisor settings (DEPLOYMENT["MODE"] == "sharded")
+SHARDING = {
+    "WORKERS": 4,  # bot worker processes; users are pinned to one by consistent hashing
+    "VIRTUAL_NODES": 128,
+    "EXTRACTION_WORKERS": 2,  # document extraction processes shared by all workers
+    "EXTRACTION_TIMEOUT_SECONDS": 600,  # an upload fails if its extraction takes longer
+    "INGRESS": "polling",  # how the supervisor receives updates: "polling" or "webhook"
+    "HEALTH_CHECK_SECONDS": 1.0,
+    "START_METHOD": "spawn",  # fresh interpreters; forking a running event loop is unsafe
+}
+
+# Default corpus settings (every supported file in data/default is loaded)
+DEFAULT_CONTENT = {
+    "MANIFEST_FILE": "default_manifest.json",  # local checksums, kept next to data/default
+    "MAX_FILE_SIZE_MB": 20,
+    "MAX_WORKERS": 4,
+    "SNAPSHOT_FILE": "default_snapshot.json.gz",  # pre-built records, next to data/default
+    "SNAPSHOT_BATCH_SIZE": 500,
+}
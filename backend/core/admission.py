@@ -0,0 +1,192 @@
+import re
+import math
+import heapq
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, List, Optional
+
+from config.settings import ADMISSION
+from core.metrics import metrics
+
+QUERY = "query"
+INGEST = "ingest"
+
+_PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?!s)")
+
+
+class Overloaded(Exception):
+    """Work shed because the backlog is over its limit."""
+
+    def __init__(self, kind: str, retry_after: int):
+        super().__init__(f"Busy, retry in {retry_after} s")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+def sniff_page_count(data: bytes, file_name: str) -> Optional[int]:
+    """Count the page objects of a PDF without parsing it; None for other files."""
+    if not file_name.lower().endswith(".pdf"):
+        return None
+    # compressed object streams hide page objects; those PDFs estimate by size
+    return len(_PDF_PAGE_RE.findall(data)) or None
+
+
+def estimate_upload_cost(file_name: str, size: int, pages: Optional[int] = None) -> float:
+    """Estimated seconds to extract and index an upload."""
+    cost = ADMISSION["INGEST_BASE_S"] + ADMISSION["INGEST_S_PER_MB"] * size / (1024 * 1024)
+    if pages:
+        cost += ADMISSION["INGEST_S_PER_PAGE"] * pages
+    return cost
+
+
+def estimate_query_cost() -> float:
+    """Estimated seconds of one agent run: the recent median, else the configured guess."""
+    return metrics.percentile("agent.latency_s", 50) or ADMISSION["QUERY_COST_S"]
+
+
+class _Waiter:
+    def __init__(self, user: Hashable, cost: float, start: float, future: asyncio.Future):
+        self.user = user
+        self.cost = cost
+        self.start = start
+        self.future = future
+
+
+class FairQueue:
+    """Slots for one kind of work, handed out by weighted fair queueing across users.
+
+    Every request gets a virtual finish time: the later of the queue's
+    virtual clock and the user's previous finish, plus cost / weight. Free
+    slots go to the smallest finish time. A user with many queued uploads
+    therefore waits behind other users' work, and cheap work goes ahead of
+    expensive work. Requests over the backlog limit are shed at once.
+    """
+
+    def __init__(self, kind: str, slots: int, max_backlog_s: float, weights: Dict = None):
+        self.kind = kind
+        self.slots = slots
+        self.max_backlog_s = max_backlog_s
+        self.weights = weights or {}
+        self.running = 0
+        self.backlog_s = 0.0  # estimated cost of queued requests
+        self._heap: List = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._finish: Dict[Hashable, float] = {}
+
+    def queued(self) -> int:
+        return sum(1 for *_, waiter in self._heap if not waiter.future.done())
+
+    def retry_after(self, cost: float = 0.0) -> int:
+        """Seconds until the queued work (plus cost) has likely drained."""
+        return max(1, math.ceil((self.backlog_s + cost) / self.slots))
+
+    def _tag(self, user: Hashable, cost: float):
+        weight = self.weights.get(user, self.weights.get(str(user), 1)) or 1
+        start = max(self._vtime, self._finish.get(user, 0.0))
+        finish = start + cost / weight
+        self._finish[user] = finish
+        return start, finish
+
+    async def acquire(self, user: Hashable, cost: float):
+        while self._heap and self._heap[0][2].future.done():
+            heapq.heappop(self._heap)  # gave up while queued
+        if self.running < self.slots and not self._heap:
+            self._vtime = self._tag(user, cost)[0]
+            self.running += 1
+            return
+        if self.backlog_s + cost > self.max_backlog_s:
+            metrics.incr(f"admission.{self.kind}.shed")
+            raise Overloaded(self.kind, self.retry_after(cost))
+
+        start, finish = self._tag(user, cost)
+        waiter = _Waiter(user, cost, start, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._heap, (finish, next(self._seq), waiter))
+        self.backlog_s += cost
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # a slot was handed over just as the caller gave up
+                self.release()
+            else:
+                self.backlog_s -= cost
+            raise
+
+    def release(self):
+        self.running -= 1
+        while self._heap and self.running < self.slots:
+            _, _, waiter = heapq.heappop(self._heap)
+            if waiter.future.done():
+                continue
+            self.backlog_s -= waiter.cost
+            self._vtime = waiter.start
+            self.running += 1
+            waiter.future.set_result(None)
+        if not self._heap and self.running == 0:
+            # idle: forget old finish times so the clock stays small
+            self._vtime = 0.0
+            self._finish.clear()
+
+
+class AdmissionController:
+    """Admits questions and uploads into separate fair queues, or sheds them.
+
+    Questions and uploads have their own slots, so a burst of large PDFs
+    only queues behind other uploads and questions keep their capacity.
+    Costs are estimated up front: uploads from file size and a page count
+    sniff, questions from recent agent latency.
+    """
+
+    def __init__(self, settings: Dict = ADMISSION):
+        weights = settings["USER_WEIGHTS"]
+        self.enabled = settings["ENABLED"]
+        self.queues = {
+            QUERY: FairQueue(QUERY, settings["QUERY_SLOTS"], settings["MAX_QUERY_BACKLOG_S"], weights),
+            INGEST: FairQueue(INGEST, settings["INGEST_SLOTS"], settings["MAX_INGEST_BACKLOG_S"], weights),
+        }
+
+    @asynccontextmanager
+    async def admit(self, kind: str, user: Hashable, cost: float) -> AsyncIterator[None]:
+        """
+        Hold a slot of the given kind for the duration of the block.
+
+        Args:
+            kind: QUERY or INGEST
+            user: Who the work is for (fairness is per user)
+            cost: Estimated seconds of work
+
+        Raises:
+            Overloaded: The backlog is over its limit; retry_after says when to retry
+        """
+        if not self.enabled:
+            yield
+            return
+        queue = self.queues[kind]
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        await queue.acquire(user, cost)
+        metrics.incr(f"admission.{kind}.admitted")
+        metrics.observe(f"admission.{kind}.wait_s", loop.time() - queued_at)
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            kind: {"running": q.running, "queued": q.queued(), "backlog_s": q.backlog_s}
+            for kind, q in self.queues.items()
+        }
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission() -> AdmissionController:
+    """Return the process-wide admission controller."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
@@ -0,0 +1,321 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class BadRequest(Exception):
+    """The client sent something that cannot be served; answered with ``status``."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class FormField:
+    """One part of a multipart/form-data body."""
+
+    name: str
+    data: bytes
+    filename: Optional[str] = None
+    content_type: str = "text/plain"
+
+
+class Request:
+    """A parsed HTTP/1.1 request."""
+
+    def __init__(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes,
+        peer: Any = None,
+    ):
+        self.method = method
+        self.target = target
+        parts = urlsplit(target)
+        self.path = parts.path
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+        self.peer = peer
+
+    def json(self) -> Any:
+        """Decode the request body as JSON."""
+        return json.loads(self.body or b"null")
+
+    def form(self) -> Dict[str, FormField]:
+        """Decode a multipart/form-data body into its fields by name."""
+        content_type = self.headers.get("content-type", "")
+        if not content_type.startswith("multipart/form-data"):
+            raise ValueError("Expected a multipart/form-data body")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + self.body
+        )
+        if not message.is_multipart():
+            raise ValueError("Malformed multipart body")
+
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name:
+                fields[name] = FormField(
+                    name=name,
+                    data=part.get_payload(decode=True) or b"",
+                    filename=part.get_filename(),
+                    content_type=part.get_content_type(),
+                )
+        return fields
+
+
+class Response:
+    """An HTTP response with a fully buffered body."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"",
+        content_type: str = "text/plain; charset=utf-8",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.status = status
+        self.body = body
+        self.headers = {"Content-Type": content_type, **(headers or {})}
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        return cls(
+            status,
+            json.dumps(data).encode("utf-8"),
+            "application/json",
+            headers,
+        )
+
+    def _framing(self) -> Dict[str, str]:
+        return {"Content-Length": str(len(self.body))}
+
+    def head(self, keep_alive: bool) -> bytes:
+        reason = HTTPStatus(self.status).phrase
+        lines = [f"HTTP/1.1 {self.status} {reason}"]
+        headers = {
+            **self.headers,
+            **self._framing(),
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def write(self, writer: asyncio.StreamWriter, keep_alive: bool):
+        writer.write(self.head(keep_alive) + self.body)
+        await writer.drain()
+
+
+class StreamingResponse(Response):
+    """A response whose body is written as it is produced, with chunked encoding.
+
+    Each chunk from ``chunks`` is flushed to the client immediately, so the
+    first bytes arrive before the work behind the later ones is done. If the
+    client goes away, the iterator is closed so its producer can stop.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        status: int = 200,
+        content_type: str = "text/event-stream; charset=utf-8",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(
+            status,
+            b"",
+            content_type,
+            {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})},
+        )
+        self.chunks = chunks
+
+    def _framing(self) -> Dict[str, str]:
+        return {"Transfer-Encoding": "chunked"}
+
+    async def write(self, writer: asyncio.StreamWriter, keep_alive: bool):
+        writer.write(self.head(keep_alive))
+        await writer.drain()
+        try:
+            async for chunk in self.chunks:
+                if chunk:
+                    writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+        finally:
+            aclose = getattr(self.chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+class HttpServer:
+    """Minimal asyncio HTTP/1.1 server with keep-alive and graceful draining.
+
+    ``reuse_port`` lets several worker processes bind the same port so the
+    kernel balances connections between them. ``drain`` stops accepting new
+    connections, closes idle keep-alive connections and waits for requests
+    that are already being handled.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reuse_port: bool = False,
+        max_body_bytes: int = 25 * 1024 * 1024,
+        keep_alive_timeout: float = 75.0,
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.max_body_bytes = max_body_bytes
+        self.keep_alive_timeout = keep_alive_timeout
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._idle: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._idle_event = asyncio.Event()
+        self._draining = False
+
+    async def start(self):
+        """Bind and start accepting connections."""
+        self._server = await asyncio.start_server(
+            self._on_connection,
+            self.host,
+            self.port,
+            reuse_port=self.reuse_port or None,
+            limit=MAX_HEADER_BYTES,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._idle_event.set()
+        logger.info(f"HTTP server listening on {self.host}:{self.port}")
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await self._serve_connection(reader, writer, task)
+        except (asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"HTTP connection error: {str(e)}", exc_info=True)
+        finally:
+            self._connections.discard(task)
+            self._idle.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader, peer: Any) -> Optional[Request]:
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), self.keep_alive_timeout
+            )
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise BadRequest(f"Request head over {MAX_HEADER_BYTES} bytes", 431)
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise BadRequest("Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise BadRequest("Invalid Content-Length")
+        if length < 0:
+            raise BadRequest("Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise BadRequest(f"Request body too large: {length} bytes", 413)
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            return None  # client went away mid-body
+        return Request(method.upper(), target, headers, body, peer)
+
+    async def _serve_connection(self, reader, writer, task: asyncio.Task):
+        peer = writer.get_extra_info("peername")
+        while not self._draining:
+            self._idle.add(task)
+            try:
+                request = await self._read_request(reader, peer)
+            except BadRequest as e:
+                await Response(e.status, str(e).encode()).write(writer, keep_alive=False)
+                return
+            finally:
+                self._idle.discard(task)
+            if request is None:
+                return
+
+            self._in_flight += 1
+            self._idle_event.clear()
+            try:
+                try:
+                    response = await self.handler(request)
+                except Exception as e:
+                    logger.error(f"Unhandled error for {request.path}: {str(e)}", exc_info=True)
+                    response = Response.json({"error": "Internal server error"}, status=500)
+
+                keep_alive = (
+                    not self._draining
+                    and request.headers.get("connection", "").lower() != "close"
+                )
+                await response.write(writer, keep_alive)
+            finally:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle_event.set()
+
+            if not keep_alive:
+                return
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def drain(self, timeout: float = 30.0):
+        """Stop accepting connections and wait for in-flight requests."""
+        self._draining = True
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._idle):
+            task.cancel()
+        try:
+            await asyncio.wait_for(self._idle_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain timed out with {self._in_flight} requests in flight")
+        for task in list(self._connections):
+            task.cancel()
+        if self._server is not None:
+            await self._server.wait_closed()
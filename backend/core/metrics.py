@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Any, Optional
+
+
+class Metrics:
+    """Thread-safe in-process counters and timing windows.
+
+    Counters accumulate for the lifetime of the process. Observations keep
+    only the most recent ``window`` samples per name, so percentiles reflect
+    current behaviour and memory stays bounded.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: float = 1):
+        """Add value to a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float):
+        """Record one sample of a measured value."""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Observe the wall-clock duration of the wrapped block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name: str) -> float:
+        """Return the current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) of recent samples, if any."""
+        with self._lock:
+            samples = sorted(self._samples.get(name) or ())
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(q / 100 * (len(samples) - 1)))))
+        return samples[rank]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters plus count/mean/p50/p95/p99 for every timing."""
+        with self._lock:
+            counters = dict(self._counters)
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+
+        timings = {}
+        for name, values in samples.items():
+            if not values:
+                continue
+            last = len(values) - 1
+            timings[name] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": values[int(round(0.50 * last))],
+                "p95": values[int(round(0.95 * last))],
+                "p99": values[int(round(0.99 * last))],
+            }
+        return {"counters": counters, "timings": timings}
+
+    def reset(self):
+        """Clear all counters and samples."""
+        with self._lock:
+            self._counters.clear()
+            self._samples.clear()
+
+
+# Process-wide registry
+metrics = Metrics()
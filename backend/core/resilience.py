@@ -0,0 +1,249 @@
+import time
+import random
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from config.settings import RESILIENCE
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Call refused without trying: the backend failed repeatedly and is resting."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"{name} is unavailable, retry in {retry_after} s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class BackendTimeout(TimeoutError):
+    """Call abandoned after its timeout; the backend may still finish it."""
+
+    def __init__(self, name: str, timeout: float):
+        super().__init__(f"{name} did not answer within {timeout:.1f} s")
+        self.name = name
+        self.timeout = timeout
+
+
+# backend degraded rather than missing what was asked for
+UNAVAILABLE = (CircuitOpen, BackendTimeout)
+
+
+class CircuitBreaker:
+    """Fails calls fast once a backend keeps failing.
+
+    Closed: calls go through; failure_threshold consecutive failures open
+    the circuit. Open: calls fail with CircuitOpen for open_seconds. Then
+    half-open: one trial call goes through; its success closes the circuit,
+    its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, open_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go through now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            waited = time.monotonic() - self._opened_at
+            if self.state == OPEN and waited >= self.open_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+            retry_after = max(1, int(self.open_seconds - waited + 0.999))
+        metrics.incr(f"resilience.{self.name}.rejected")
+        raise CircuitOpen(self.name, retry_after)
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"{self.name} recovered, closing circuit")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                logger.warning(f"{self.name} failing ({self.failures} in a row), opening circuit")
+                metrics.incr(f"resilience.{self.name}.opened")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+class ResilientCall:
+    """One kind of blocking backend call behind a timeout, retries, hedging and a breaker.
+
+    Calls run on a thread pool of their own, so hung calls of one kind never
+    take the threads of another. The timeout follows observed latency: a
+    multiple of the recent p99 within the call's bounds, or its configured
+    TIMEOUT_S until enough calls have been seen. Calls marked HEDGE (read-only
+    ones only) send a second request when the first is slower than the
+    recent p95, within a budget, and return whichever answers first.
+    """
+
+    def __init__(self, name: str, call: Dict[str, Any], settings: Dict[str, Any] = RESILIENCE):
+        self.name = name
+        self.enabled = settings["ENABLED"]
+        self.call_settings = call
+        self.settings = settings
+        self.breaker = CircuitBreaker(name, settings["FAILURE_THRESHOLD"], settings["OPEN_SECONDS"])
+        self._pool = ThreadPoolExecutor(
+            max_workers=settings["THREADS_PER_CALL"], thread_name_prefix=f"resilience-{name}"
+        )
+
+    def _metric(self, suffix: str) -> str:
+        return f"resilience.{self.name}.{suffix}"
+
+    def _known(self) -> bool:
+        return metrics.counter(self._metric("successes")) >= self.settings["MIN_SAMPLES"]
+
+    def timeout(self) -> float:
+        """Seconds to wait for one attempt."""
+        call = self.call_settings
+        if not self._known():
+            return call["TIMEOUT_S"]
+        p = metrics.percentile(self._metric("latency_s"), self.settings["TIMEOUT_PERCENTILE"])
+        adaptive = p * self.settings["TIMEOUT_MULTIPLIER"]
+        return min(call["MAX_TIMEOUT_S"], max(call["MIN_TIMEOUT_S"], adaptive))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a second request is sent; None for no hedge."""
+        if not self.call_settings["HEDGE"] or self.breaker.state != CLOSED or not self._known():
+            return None
+        hedged = metrics.counter(self._metric("hedged"))
+        if hedged >= self.settings["HEDGE_BUDGET"] * metrics.counter(self._metric("calls")):
+            return None
+        return metrics.percentile(self._metric("latency_s"), self.settings["HEDGE_PERCENTILE"])
+
+    def _timed(self, fn: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> T:
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        metrics.observe(self._metric("latency_s"), time.perf_counter() - started)
+        metrics.incr(self._metric("successes"))
+        return result
+
+    def _attempt(self, fn: Callable[..., T], args: tuple, kwargs: Dict[str, Any]) -> T:
+        timeout = self.timeout()
+        deadline = time.monotonic() + timeout
+        futures: List[Future] = [self._pool.submit(self._timed, fn, args, kwargs)]
+
+        delay = self.hedge_delay()
+        if delay is not None and delay < timeout:
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                metrics.incr(self._metric("hedged"))
+                futures.append(self._pool.submit(self._timed, fn, args, kwargs))
+
+        error: Optional[BaseException] = None
+        while futures:
+            done, pending = wait(
+                futures, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                error = error or future.exception()
+            futures = list(pending)
+
+        if error is not None and not futures:
+            raise error
+        for future in futures:
+            future.cancel()  # still queued; running ones cannot be stopped
+        metrics.incr(self._metric("timeouts"))
+        raise BackendTimeout(self.name, timeout)
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call fn(*args, **kwargs) with the call's timeout, retries, hedging and breaker.
+
+        Args:
+            fn: Blocking backend call
+            *args, **kwargs: Its arguments
+
+        Returns:
+            What fn returned
+
+        Raises:
+            CircuitOpen: The breaker is open; nothing was sent
+            BackendTimeout: The last attempt did not answer in time
+            Exception: Whatever the last attempt raised
+        """
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        attempts = 1 + self.call_settings["RETRIES"]
+        for attempt in range(attempts):
+            self.breaker.before_call()
+            metrics.incr(self._metric("calls"))
+            try:
+                result = self._attempt(fn, args, kwargs)
+            except Exception as e:
+                self.breaker.record_failure()
+                metrics.incr(self._metric("failures"))
+                if attempt + 1 >= attempts:
+                    raise
+                logger.info(f"{self.name} attempt {attempt + 1} failed, retrying: {str(e)}")
+                metrics.incr(self._metric("retries"))
+                backoff = self.settings["RETRY_BACKOFF_S"] * 2**attempt
+                time.sleep(backoff * random.uniform(0.5, 1.5))
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "timeout_s": self.timeout(),
+            "calls": int(metrics.counter(self._metric("calls"))),
+            "failures": int(metrics.counter(self._metric("failures"))),
+            "timeouts": int(metrics.counter(self._metric("timeouts"))),
+            "hedged": int(metrics.counter(self._metric("hedged"))),
+            "rejected": int(metrics.counter(self._metric("rejected"))),
+        }
+
+
+_calls: Dict[str, ResilientCall] = {}
+_calls_lock = threading.Lock()
+
+
+def resilient(name: str) -> ResilientCall:
+    """Return the process-wide guard for a call named in RESILIENCE['CALLS']."""
+    with _calls_lock:
+        guard = _calls.get(name)
+        if guard is None:
+            guard = _calls[name] = ResilientCall(name, RESILIENCE["CALLS"][name])
+        return guard
+
+
+def resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Breaker state and counters of every call used so far."""
+    with _calls_lock:
+        guards = list(_calls.values())
+    return {guard.name: guard.stats() for guard in guards}
@@ -0,0 +1,100 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+from core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Listener = Callable[..., Any]
+Notify = Callable[..., None]
+
+
+class _Call:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.task: Optional[asyncio.Task] = None
+        self.listeners: List[Listener] = []
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts fn(notify) as a task of its own; every
+    caller arriving before it finishes awaits that same task and gets the
+    same result (or exception). Cancelling a waiter never cancels the shared
+    task. Progress reported through notify(*args) is passed to the listener
+    of every current waiter; notify may be called from any thread, and
+    listeners may be plain functions or coroutine functions.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def pending(self, key: Hashable) -> bool:
+        """True if a call for key is running, i.e. do(key, ...) would join it."""
+        return key in self._calls
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[Notify], Awaitable[T]],
+        listener: Optional[Listener] = None,
+    ) -> T:
+        """
+        Run fn(notify) for key, or join the run already in flight.
+
+        Args:
+            key: Identity of the request; equal keys share one execution
+            fn: Coroutine function doing the work, given a notify callable
+            listener: Optional progress callback for this caller
+
+        Returns:
+            The shared result of fn
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.get_running_loop())
+            call.task = asyncio.create_task(fn(lambda *args: self._notify(call, args)))
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            metrics.incr(f"singleflight.{self.name}.executions")
+        else:
+            metrics.incr(f"singleflight.{self.name}.coalesced")
+
+        if listener is not None:
+            call.listeners.append(listener)
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if listener is not None:
+                call.listeners.remove(listener)
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.task.cancelled() or call.task.exception() is None:
+            return
+        if call.waiters == 0:
+            # nobody is left to see it
+            logger.warning(f"{self.name} call failed: {call.task.exception()}")
+
+    def _notify(self, call: _Call, args: tuple):
+        call.loop.call_soon_threadsafe(self._dispatch, call, args)
+
+    def _dispatch(self, call: _Call, args: tuple):
+        for listener in list(call.listeners):
+            try:
+                result = listener(*args)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.warning(f"{self.name} progress listener failed: {str(e)}")
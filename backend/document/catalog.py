@@ -0,0 +1,236 @@
+import json
+import time
+import base64
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import CATALOG
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = str(Path(__file__).parent.parent / CATALOG["PATH"])
+
+SORT_COLUMNS = {
+    "name": "file_name",
+    "date": "processed_at",
+    "size": "file_size",
+    "chunks": "chunks",
+}
+COLUMNS = (
+    "id", "file_path", "file_name", "file_type", "file_size",
+    "checksum", "chunks", "source", "processed_at", "index_id",
+)
+
+
+def _encode_cursor(value: Any, row_id: int) -> str:
+    raw = json.dumps([value, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        return value, int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class DocumentCatalog:
+    """Local table of indexed documents, one row per document.
+
+    The remote index can only count and search, so listing goes through
+    this table instead. Pages are fetched by keyset (sort column, row ID),
+    so a deep page costs the same as the first; name prefixes use the
+    NOCASE name index and substrings a trigram full-text index.
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                file_path TEXT NOT NULL UNIQUE,
+                file_name TEXT NOT NULL COLLATE NOCASE,
+                file_type TEXT NOT NULL DEFAULT '',
+                file_size INTEGER NOT NULL DEFAULT 0,
+                checksum TEXT NOT NULL DEFAULT '',
+                chunks INTEGER NOT NULL DEFAULT 0,
+                source TEXT NOT NULL DEFAULT '',
+                processed_at REAL NOT NULL,
+                index_id TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS documents_name ON documents (file_name, id);
+            CREATE INDEX IF NOT EXISTS documents_date ON documents (processed_at, id);
+            CREATE INDEX IF NOT EXISTS documents_size ON documents (file_size, id);
+            CREATE INDEX IF NOT EXISTS documents_chunks ON documents (chunks, id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                file_name, content='documents', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, file_name) VALUES (new.id, new.file_name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, file_name)
+                VALUES ('delete', old.id, old.file_name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE OF file_name ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, file_name)
+                VALUES ('delete', old.id, old.file_name);
+                INSERT INTO documents_fts (rowid, file_name) VALUES (new.id, new.file_name);
+            END;
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _row(metadata: Dict[str, Any], chunks: int, index_id: str) -> Dict[str, Any]:
+        file_path = metadata["file_path"]
+        return {
+            "file_path": file_path,
+            "file_name": metadata.get("file_name") or Path(file_path).name,
+            "file_type": metadata.get("file_type") or Path(file_path).suffix.lower(),
+            "file_size": int(metadata.get("file_size") or 0),
+            "checksum": metadata.get("checksum") or "",
+            "chunks": int(chunks or 0),
+            "source": metadata.get("source") or "",
+            "processed_at": float(metadata.get("processing_date") or time.time()),
+            "index_id": index_id or "",
+        }
+
+    def upsert_many(self, rows: List[Tuple[Dict[str, Any], int, str]]):
+        """Insert or update documents from (metadata, chunks, index_id) tuples."""
+        values = [self._row(*row) for row in rows]
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO documents (file_path, file_name, file_type, file_size, checksum, "
+                "chunks, source, processed_at, index_id) VALUES (:file_path, :file_name, "
+                ":file_type, :file_size, :checksum, :chunks, :source, :processed_at, :index_id) "
+                "ON CONFLICT (file_path) DO UPDATE SET file_name = excluded.file_name, "
+                "file_type = excluded.file_type, file_size = excluded.file_size, "
+                "checksum = excluded.checksum, chunks = excluded.chunks, source = excluded.source, "
+                "processed_at = excluded.processed_at, index_id = excluded.index_id",
+                values,
+            )
+            self._db.commit()
+
+    def upsert(self, metadata: Dict[str, Any], chunks: int, index_id: str = ""):
+        """Record a document that was just indexed."""
+        self.upsert_many([(metadata, chunks, index_id)])
+
+    def ensure(self, metadata: Dict[str, Any], index_id: str = ""):
+        """Record a document found already indexed, unless it is known."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO documents (file_path, file_name, file_type, file_size, "
+                "checksum, chunks, source, processed_at, index_id) VALUES (:file_path, "
+                ":file_name, :file_type, :file_size, :checksum, :chunks, :source, "
+                ":processed_at, :index_id)",
+                self._row(metadata, 0, index_id),
+            )
+            self._db.commit()
+
+    def remove(self, file_path: str):
+        with self._lock:
+            self._db.execute("DELETE FROM documents WHERE file_path = ?", (file_path,))
+            self._db.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def page(
+        self,
+        limit: int = CATALOG["PAGE_SIZE"],
+        cursor: Optional[str] = None,
+        query: str = "",
+        match: str = "substring",
+        sort: str = "name",
+        descending: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of documents.
+
+        Args:
+            limit: Page size, capped at CATALOG['MAX_PAGE_SIZE']
+            cursor: next_cursor of the previous page, None for the first page
+            query: Filter on the file name (case-insensitive)
+            match: "prefix" or "substring"
+            sort: "name", "date", "size" or "chunks"
+            descending: Sort order
+
+        Returns:
+            The rows of the page, and the cursor of the next page (None at the end)
+        """
+        column = SORT_COLUMNS.get(sort)
+        if column is None:
+            raise ValueError(f"Unknown sort: {sort}")
+        if match not in ("prefix", "substring"):
+            raise ValueError(f"Unknown match: {match}")
+        limit = max(1, min(int(limit), CATALOG["MAX_PAGE_SIZE"]))
+
+        where, params = [], []
+        if query:
+            if match == "prefix":
+                where.append("file_name LIKE ? ESCAPE '\\'")
+                params.append(_like_escape(query) + "%")
+            elif len(query) >= 3:
+                # a quoted trigram phrase matches as a substring; LIKE with an
+                # ESCAPE clause would make FTS5 scan the whole table instead
+                where.append("id IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)")
+                params.append('"' + query.replace('"', '""') + '"')
+            else:
+                # shorter substrings have no trigram to look up
+                where.append("file_name LIKE ? ESCAPE '\\'")
+                params.append("%" + _like_escape(query) + "%")
+        if cursor:
+            value, row_id = _decode_cursor(cursor)
+            where.append(f"({column}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend([value, row_id])
+
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {', '.join(COLUMNS)} FROM documents"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY {column} {direction}, id {direction} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._db.execute(sql, [*params, limit + 1]).fetchall()
+
+        items = [dict(zip(COLUMNS, row)) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = _encode_cursor(last[column], last["id"])
+        return items, next_cursor
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_catalog: Optional[DocumentCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> DocumentCatalog:
+    """Return the process-wide document catalog."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DocumentCatalog()
+        return _catalog
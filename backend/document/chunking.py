@@ -0,0 +1,266 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+# "Sec. 2.", "Section 2.", "§ 2" at the start of a line
+SECTION_RE = re.compile(r"^(?:Sec(?:tion)?\.?|§)\s*(\d+[A-Za-z]?(?:-\d+)?)\.?(?:\s+|$)")
+# "PART II", "Subpart A", "Article 3"
+PART_RE = re.compile(r"^(PART|Part|SUBPART|Subpart|ARTICLE|Article)\s+([IVXLC]+|\d+|[A-Z])\b\.?(?:\s+|$)")
+# "(a)", "(1)", "(iv)", "(A)" followed by text
+MARKER_RE = re.compile(r"^\(([a-z]{1,4}|\d{1,3}|[A-Z]{1,4})\)(?:\s+|$)")
+# a short section title ending before the first inline marker: "Definitions. (a) ..."
+TITLE_RE = re.compile(r"^([^.]{1,120}\.)\s+(?=\([a-zA-Z0-9]{1,4}\)\s)")
+ROMAN_RE = re.compile(r"^m{0,3}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})$")
+# enumerations run inline after a clause: "...; (ii) a credit union; (iii) ..."
+INLINE_MARKER_RE = re.compile(r"(?<=[;:])\s+(?=\([a-zA-Z0-9]{1,4}\)\s)")
+# a heading may only start a line when the previous line ended a sentence or clause
+TERMINATOR_RE = re.compile(r"([.:;]|\band|\bor)$")
+
+ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100, "d": 500, "m": 1000}
+
+
+@dataclass
+class Segment:
+    """Text under one heading, up to the next heading."""
+
+    path: List[Tuple[str, str]]  # (kind, label) from the outermost heading down
+    page_start: int
+    page_end: int
+    lines: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.lines)
+
+
+def _roman_value(token: str) -> int:
+    total = 0
+    values = [ROMAN_VALUES[c] for c in token.lower()]
+    for i, value in enumerate(values):
+        total += -value if i + 1 < len(values) and values[i + 1] > value else value
+    return total
+
+
+def _marker_kind(token: str, path: List[Tuple[str, str]]) -> str:
+    """Classify a "(x)" marker, telling letters from roman numerals by context."""
+    if token.isdigit():
+        return "digit"
+    letter_kind, roman_kind = ("lower", "roman") if token.islower() else ("upper", "ROMAN")
+    is_roman = bool(ROMAN_RE.match(token.lower()))
+    is_letter = len(token) == 1
+    if not is_roman:
+        return letter_kind
+    if not is_letter:
+        return roman_kind
+
+    # ambiguous: "(i)", "(v)", "(x)", "(c)"... continue whichever sequence it extends
+    open_labels = {kind: label.strip("()") for kind, label in path}
+    letter = open_labels.get(letter_kind)
+    roman = open_labels.get(roman_kind)
+    letter_next = letter is not None and len(letter) == 1 and ord(token) == ord(letter) + 1
+    roman_next = roman is not None and _roman_value(token) == _roman_value(roman) + 1
+    if letter_next != roman_next:
+        return letter_kind if letter_next else roman_kind
+    if letter_next:
+        # both continue: the most recently opened one wins
+        kinds = [kind for kind, _ in path]
+        return roman_kind if kinds.index(roman_kind) > kinds.index(letter_kind) else letter_kind
+    return roman_kind if token.lower() == "i" and letter is not None else letter_kind
+
+
+def _enter(path: List[Tuple[str, str]], kind: str, label: str) -> List[Tuple[str, str]]:
+    """Return the path after a heading of `kind`: siblings are replaced, others nest."""
+    if kind == "part":
+        return [(kind, label)]
+    if kind == "section":
+        return [entry for entry in path if entry[0] == "part"] + [(kind, label)]
+    kinds = [k for k, _ in path]
+    if kind in kinds:
+        path = path[: kinds.index(kind)]
+    return path + [(kind, label)]
+
+
+def parse_segments(text: str) -> List[Segment]:
+    """
+    Split a legal document into segments at its section and subsection headings.
+
+    Headings are "PART I", "Sec. 1." / "Section 1." and the "(a)", "(1)",
+    "(i)", "(A)" markers, in whatever nesting order the document uses. A
+    marker at the start of a line only counts when the previous line ended a
+    clause, so wrapped cross-references ("subsection\\n(a) of this order")
+    are not mistaken for headings; enumerations inside a line are split
+    after ";" or ":". Pages are separated by form feeds.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Segments in document order; text before the first heading has an empty path
+    """
+    segments = [Segment(path=[], page_start=1, page_end=1)]
+    path: List[Tuple[str, str]] = []
+    previous = ""
+    after_heading = False
+
+    for page_number, page in enumerate(text.split("\f"), start=1):
+        lines = [part for line in page.split("\n") for part in INLINE_MARKER_RE.split(line)]
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            headed = False
+            at_boundary = not previous or after_heading or bool(TERMINATOR_RE.search(previous))
+            while True:
+                part = PART_RE.match(line) if at_boundary or headed else None
+                section = SECTION_RE.match(line) if at_boundary or headed else None
+                marker = MARKER_RE.match(line) if at_boundary or headed else None
+                if part:
+                    path = _enter(path, "part", f"{part.group(1).title()} {part.group(2)}")
+                    line = line[part.end() :]
+                elif section:
+                    path = _enter(path, "section", f"Sec. {section.group(1)}")
+                    line = line[section.end() :]
+                    title = TITLE_RE.match(line)
+                elif marker:
+                    token = marker.group(1)
+                    path = _enter(path, _marker_kind(token, path), f"({token})")
+                    line = line[marker.end() :]
+                else:
+                    break
+                if not headed or segments[-1].lines:
+                    segments.append(Segment(path=path, page_start=page_number, page_end=page_number))
+                else:
+                    # "Sec. 1. (a)": the section heading has no text of its own
+                    segments[-1].path = path
+                headed = True
+                if section and title:
+                    segments[-1].lines.append(title.group(1))
+                    line = line[title.end() :]
+
+            if line:
+                segments[-1].lines.append(line)
+                segments[-1].page_end = page_number
+                previous = line
+            after_heading = headed and not line
+
+    return [segment for segment in segments if segment.lines]
+
+
+def section_label(path: List[Tuple[str, str]]) -> str:
+    """Compact citation for a path, e.g. "Part I, Sec. 1(a)(iv)"."""
+    label = ""
+    for kind, name in path:
+        if kind == "part":
+            label = name
+        elif kind == "section":
+            label = f"{label}, {name}" if label else name
+        else:
+            label += name
+    return label
+
+
+def split_passage(text: str, max_chunk_size: int = 200, overlap: int = 20) -> List[str]:
+    """
+    Split one passage into pieces of at most max_chunk_size characters, in order.
+
+    Sentences are packed whole; a sentence longer than a piece is split at
+    word boundaries. Each piece after the first repeats up to `overlap`
+    characters of trailing words from the piece before it.
+    """
+    words: List[str] = []
+    for sentence in re.split(r"(?<=[.!?;:])\s+", text.strip()):
+        words.extend(sentence.split())
+        words.append("")  # sentence boundary marker
+
+    pieces: List[str] = []
+    current: List[str] = []
+    size = 0
+    last_boundary = 0
+    for word in words:
+        if not word:
+            # a sentence end is a good place to cut, unless the piece would be short
+            if size >= max_chunk_size // 2:
+                last_boundary = len(current)
+            continue
+        if current and size + len(word) + 1 > max_chunk_size:
+            cut = last_boundary if last_boundary else len(current)
+            pieces.append(" ".join(current[:cut]))
+            rest = current[cut:]
+            budget = min(overlap, max_chunk_size - sum(len(w) + 1 for w in rest) - len(word) - 1)
+            carried: List[str] = []
+            for previous in reversed(current[:cut]):
+                budget -= len(previous) + 1
+                if budget < 0:
+                    break
+                carried.insert(0, previous)
+            current = carried + rest
+            size = sum(len(w) + 1 for w in current)
+            last_boundary = 0
+        current.append(word)
+        size += len(word) + 1
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def chunk_legal_text(
+    text: str, max_chunk_size: int = 200, overlap: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Chunk a legal document within its section boundaries.
+
+    A heading and its nested clauses are packed into one chunk while they
+    fit; a chunk never spans two sections or two sibling subsections. Each
+    chunk starts with its citation ("Sec. 1(b)") so the clause is found
+    together with its heading. Long clauses, text before the first heading
+    and documents without headings are split with split_passage.
+
+    Args:
+        text: Input text; PDF pages separated by form feeds
+        max_chunk_size: Maximum size of a chunk body in characters
+        overlap: Characters repeated between pieces of a long clause
+
+    Returns:
+        List of dicts with 'text', 'section_path', 'page_start' and 'page_end'
+    """
+    segments = parse_segments(text)
+    chunks: List[Dict[str, Any]] = []
+
+    def emit(body: str, path, page_start: int, page_end: int):
+        label = section_label(path)
+        chunks.append(
+            {
+                "text": f"{label} {body}" if label else body,
+                "section_path": " > ".join(name for _, name in path),
+                "page_start": page_start,
+                "page_end": page_end,
+            }
+        )
+
+    i = 0
+    while i < len(segments):
+        first = segments[i]
+        body = first.text
+        page_end = first.page_end
+        i += 1
+
+        if len(body) > max_chunk_size or not first.path:
+            for piece in split_passage(body, max_chunk_size, overlap):
+                emit(piece, first.path, first.page_start, page_end)
+            continue
+
+        # pack the heading's own clauses while they fit
+        while i < len(segments):
+            child = segments[i]
+            if child.path[: len(first.path)] != first.path or len(child.path) == len(first.path):
+                break
+            addition = f" {''.join(name for _, name in child.path[len(first.path):])} {child.text}"
+            if len(body) + len(addition) > max_chunk_size:
+                break
+            body += addition
+            page_end = child.page_end
+            i += 1
+        emit(body, first.path, first.page_start, page_end)
+
+    return chunks
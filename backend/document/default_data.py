@@ -1,8 +1,24 @@
 import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from config.settings import DEFAULT_CONTENT
 from .processor import DocumentProcessor
-from .indexer import get_or_create_index, document_exists
+from .extraction import extract_file, get_executor
+from .catalog import get_catalog
+from .index_state import active_index_id
+from .indexer import (
+    build_records,
+    delete_document,
+    find_document,
+    get_or_create_index,
+    indexed_chunks,
+    process_and_upsert_document,
+)
+from .snapshot import IndexSnapshot, bulk_load, corpus_checksum, read_snapshot, write_snapshot
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,75 +27,303 @@ logger = logging.getLogger(__name__)
 class DefaultDataLoader:
     def __init__(self):
         self.default_dir = Path(__file__).parent.parent / "data" / "default"
+        self.manifest_path = self.default_dir.parent / DEFAULT_CONTENT["MANIFEST_FILE"]
+        self.snapshot_path = self.default_dir.parent / DEFAULT_CONTENT["SNAPSHOT_FILE"]
         self.processor = DocumentProcessor()
 
-    def get_default_pdf_path(self) -> Optional[str]:
-        """Get path to default PDF file if it exists."""
+    def get_default_files(self) -> List[Path]:
+        """Get every supported file in the default directory, sorted by name."""
         if not self.default_dir.exists():
+            return []
+
+        return sorted(
+            path
+            for path in self.default_dir.iterdir()
+            if path.is_file() and self.processor.is_supported_file(str(path))
+        )
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the local manifest of already indexed default files."""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"index_id": active_index_id(), "files": {}}
+
+        # a different configured index means nothing in the manifest is there
+        index_id = active_index_id()
+        if index_id and manifest.get("index_id") != index_id:
+            return {"index_id": index_id, "files": {}}
+        return manifest
+
+    def save_manifest(self, manifest: Dict[str, Any]):
+        """Atomically write the manifest."""
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+        self._sync_catalog(manifest)
+
+    def _sync_catalog(self, manifest: Dict[str, Any]):
+        """Record the manifest's files in the document catalog."""
+        rows = [
+            (
+                {
+                    "file_path": f"data/default/{name}",
+                    "file_name": name,
+                    "file_size": entry["size"],
+                    "checksum": entry["checksum"],
+                    "source": "default_content",
+                    "processing_date": entry["indexed_at"],
+                },
+                entry["chunks"],
+                manifest.get("index_id") or "",
+            )
+            for name, entry in manifest.get("files", {}).items()
+        ]
+        try:
+            get_catalog().upsert_many(rows)
+        except Exception as e:
+            logger.warning(f"Could not sync default content to the catalog: {str(e)}")
+
+    def find_changed_files(
+        self, files: List[Path], manifest: Dict[str, Any]
+    ) -> List[Path]:
+        """
+        Return files that are new or changed since they were last indexed.
+
+        Size and mtime are compared first; a file is only hashed when they
+        differ, and is skipped if its checksum still matches. No network
+        calls are made.
+        """
+        changed = []
+        entries = manifest["files"]
+        for path in files:
+            entry = entries.get(path.name)
+            stat = path.stat()
+            if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+                continue
+            if entry and entry["checksum"] == self.processor._compute_file_checksum(str(path)):
+                entry["mtime"] = stat.st_mtime
+                continue
+            changed.append(path)
+        return changed
+
+    def _extract(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Extract one default file in the process pool and tag its metadata."""
+        file_size = path.stat().st_size
+        if file_size > DEFAULT_CONTENT["MAX_FILE_SIZE_MB"] * 1024 * 1024:
+            logger.error(f"Default file too large: {path.name} ({file_size/1024/1024:.2f}MB)")
             return None
 
-        for file in self.default_dir.glob("*.pdf"):
-            return str(file)
-        return None
+        result = get_executor().submit(extract_file, str(path)).result()
+        if not result:
+            logger.error(f"Failed to process default file: {path.name}")
+            return None
 
-    def load_default_content(self) -> bool:
+        # a path relative to the backend keeps record IDs identical across
+        # machines, so a snapshot built anywhere matches the per-file path
+        result["metadata"]["file_path"] = f"data/default/{path.name}"
+        result["metadata"]["source"] = "default_content"
+        return result
+
+    @staticmethod
+    def legacy_path(path: Path) -> str:
+        """file_path loaders before the snapshot gave a default file: its absolute path."""
+        return os.path.abspath(str(path))
+
+    def find_legacy_files(self, files: List[Path], changed: List[Path], index: Any) -> List[Path]:
         """
-        Load default PDF content into the index if not already present.
-        Returns True if successful, False otherwise.
+        Add files the index still holds under their legacy absolute path to changed.
+
+        Reloading such a file indexes it under data/default/<name>, and
+        _load_file then deletes the legacy records.
+
+        Args:
+            files: Every default file
+            changed: Files already due to be loaded
+            index: Index to look in
+
+        Returns:
+            changed, extended by the files with legacy records
         """
-        try:
-            # Get default PDF path
-            pdf_path = self.get_default_pdf_path()
+        due = set(changed)
+        for path in files:
+            if path not in due and find_document(index, self.legacy_path(path)) is not None:
+                changed.append(path)
+        return changed
 
-            # Add more detailed error logging
-            if not pdf_path:
-                logger.error("Default PDF file not found in data/default directory")
-                return False
+    def _manifest_entry(self, path: Path, checksum: str, chunks: int) -> Dict[str, Any]:
+        stat = path.stat()
+        return {
+            "checksum": checksum,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "chunks": chunks,
+            "indexed_at": int(time.time()),
+        }
 
-            if not os.path.exists(pdf_path):
-                logger.error(f"PDF file not accessible: {pdf_path}")
-                return False
+    def _load_file(self, path: Path, index: Any) -> Optional[Dict[str, Any]]:
+        """Process and index one default file; return its manifest entry."""
+        # extraction runs in the process pool, upsert in this thread
+        result = self._extract(path)
+        if not result:
+            return None
+
+        # only new or changed files get here: overwrite whatever the index
+        # holds under this path instead of skipping it as already present
+        index_result = process_and_upsert_document(index, result, replace=True)
+        if index_result["status"] != "success":
+            logger.error(
+                f"Failed to index default file {path.name}: {index_result['message']}"
+            )
+            return None
 
-            # Add file size check
-            file_size = os.path.getsize(pdf_path)
-            if file_size > (20 * 1024 * 1024):  # 20MB limit
-                logger.error(f"PDF file too large: {file_size/1024/1024:.2f}MB")
+        legacy_chunks = indexed_chunks(index, self.legacy_path(path))
+        if legacy_chunks:
+            delete_document(index, self.legacy_path(path), total=legacy_chunks)
+            logger.info(f"Removed {legacy_chunks} legacy records of default file {path.name}")
+
+        return self._manifest_entry(
+            path, result["metadata"]["checksum"], index_result.get("total_chunks", 0)
+        )
+
+    def corpus_checksum(self, files: List[Path]) -> str:
+        """Version of the default corpus, as recorded in snapshots."""
+        return corpus_checksum(
+            {path.name: self.processor._compute_file_checksum(str(path)) for path in files}
+        )
+
+    def build_snapshot(self, files: List[Path]) -> Optional[IndexSnapshot]:
+        """
+        Extract and chunk every default file and write the records as a snapshot.
+
+        Args:
+            files: Default files to include
+
+        Returns:
+            The new snapshot, or None if any file failed to extract
+        """
+        checksum = self.corpus_checksum(files)
+        records = []
+        workers = min(DEFAULT_CONTENT["MAX_WORKERS"], len(files))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, result in zip(files, pool.map(self._extract, files)):
+                if not result:
+                    return None
+                records.extend(build_records(result["text"], result["metadata"]))
+
+        snapshot = IndexSnapshot(corpus_checksum=checksum, records=records)
+        write_snapshot(str(self.snapshot_path), snapshot)
+        logger.info(f"Wrote default snapshot: {len(files)} files, {len(records)} records")
+        return snapshot
+
+    def load_snapshot(self, index: Any, files: List[Path], manifest: Dict[str, Any]) -> bool:
+        """
+        Bulk-load the default snapshot into an empty index.
+
+        A missing snapshot, or one whose corpus checksum no longer matches the
+        default files, is rebuilt first. On success every file is recorded in
+        the manifest.
+        """
+        snapshot = read_snapshot(str(self.snapshot_path))
+        if snapshot is None or snapshot.corpus_checksum != self.corpus_checksum(files):
+            logger.info("Default snapshot missing or stale; rebuilding it")
+            snapshot = self.build_snapshot(files)
+            if snapshot is None:
                 return False
 
-            index = get_or_create_index()
+        loaded = bulk_load(index, snapshot, DEFAULT_CONTENT["SNAPSHOT_BATCH_SIZE"])
 
-            # Check if document already exists in index
-            file_path = os.path.abspath(pdf_path)
-            metadata = {"file_path": file_path}
+        chunks: Dict[str, int] = {}
+        checksums: Dict[str, str] = {}
+        for record in snapshot.records:
+            name = record["attributes"]["file_name"]
+            chunks[name] = chunks.get(name, 0) + 1
+            checksums[name] = record["attributes"]["checksum"]
+        for path in files:
+            manifest["files"][path.name] = self._manifest_entry(
+                path, checksums.get(path.name, ""), chunks.get(path.name, 0)
+            )
+        logger.info(f"Bulk-loaded {loaded} records from the default snapshot")
+        return True
 
-            if document_exists(index, metadata):
-                logger.info("Default content already indexed")
-                return True
+    def _index_is_empty(self, index: Any) -> bool:
+        try:
+            return index.count() == 0
+        except Exception as e:
+            logger.warning(f"Could not count index records: {str(e)}")
+            return False
 
-            # Process the PDF
-            result = self.processor.process_file(pdf_path)
-            if not result:
-                logger.error("Failed to process default PDF")
+    def load_default_content(self) -> bool:
+        """
+        Load every new or changed default file into the index.
+        An empty index is bulk-loaded from the default snapshot instead.
+        Returns True if all default files are indexed, False otherwise.
+        """
+        try:
+            files = self.get_default_files()
+            if not files:
+                logger.error("No supported default files found in data/default directory")
                 return False
 
-            # Add metadata
-            result["metadata"]["source"] = "default_content"
+            manifest = self.load_manifest()
+            present = {path.name for path in files}
+            for name in list(manifest["files"]):
+                if name not in present:
+                    del manifest["files"][name]
 
-            # Index the content
-            from .indexer import process_and_upsert_document
+            changed = self.find_changed_files(files, manifest)
+            index = None
+            if not manifest.get("relative_paths"):
+                # once per index: earlier loaders keyed records by absolute path
+                index = get_or_create_index()
+                changed = self.find_legacy_files(files, changed, index)
+            if not changed:
+                manifest["relative_paths"] = True
+                self.save_manifest(manifest)
+                logger.info(f"Default content up to date ({len(files)} files)")
+                return True
 
-            index_result = process_and_upsert_document(index, result)
+            index = index or get_or_create_index()
+            manifest["index_id"] = index.id
 
-            success = index_result["status"] == "success"
-            if success:
-                logger.info("Successfully loaded default content")
-            else:
-                logger.error(
-                    f"Failed to index default content: {index_result['message']}"
-                )
+            # a fresh index is filled from the pre-built snapshot in one pass
+            if self._index_is_empty(index) and self.load_snapshot(index, files, manifest):
+                manifest["relative_paths"] = True
+                self.save_manifest(manifest)
+                return True
+
+            success = True
+            workers = min(DEFAULT_CONTENT["MAX_WORKERS"], len(changed))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(self._load_file, path, index): path for path in changed}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        logger.error(f"Error loading {path.name}: {str(e)}", exc_info=True)
+                        entry = None
+                    if entry is None:
+                        success = False
+                        continue
+                    manifest["files"][path.name] = entry
+                    logger.info(f"Indexed default file {path.name} ({entry['chunks']} chunks)")
 
+            if success:
+                manifest["relative_paths"] = True
+            self.save_manifest(manifest)
             return success
 
         except Exception as e:
             logger.error(f"Error loading default content: {str(e)}", exc_info=True)
             return False
+
+
+if __name__ == "__main__":
+    # Rebuild the shipped snapshot: python -m document.default_data
+    logging.basicConfig(level=logging.INFO)
+    loader = DefaultDataLoader()
+    if loader.build_snapshot(loader.get_default_files()) is None:
+        raise SystemExit(1)
@@ -0,0 +1,192 @@
+import os
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config.settings import SHARDING, TELEGRAM
+from .processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def extract_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Process one file; runs inside an extraction worker process."""
+    return DocumentProcessor().process_file(file_path)
+
+
+# per extraction process: client_id, job pid, job number of the job it is running
+_SLOT_FIELDS = 3
+_IDLE = -1
+
+
+def _extraction_worker(
+    jobs: multiprocessing.Queue, results: List[multiprocessing.Queue], running, slot: int
+):
+    """Serve extraction jobs from the shared queue until a None sentinel arrives.
+
+    The job being extracted is recorded in the running array, so the pool
+    can fail it if this process dies.
+    """
+    base = slot * _SLOT_FIELDS
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, client_id, file_path = job
+        running[base : base + _SLOT_FIELDS] = [client_id, *job_id]
+        try:
+            outcome = (job_id, extract_file(file_path), None)
+        except Exception as e:
+            outcome = (job_id, None, str(e))
+        running[base] = _IDLE
+        results[client_id].put(outcome)
+
+
+class SharedExtractionPool:
+    """Extraction processes shared by several bot worker processes.
+
+    Jobs go through one shared queue; each client (bot worker) has its own
+    result queue, so workers never see each other's results. Create the pool
+    in the supervisor before forking workers and hand each worker its
+    ``client(i)``.
+    """
+
+    def __init__(self, size: int, clients: int, context=None):
+        self.size = max(1, size)
+        self.context = context or multiprocessing.get_context()
+        self.jobs = self.context.Queue()
+        self.results = [self.context.Queue() for _ in range(clients)]
+        self.running = self.context.Array("q", [_IDLE] * (self.size * _SLOT_FIELDS), lock=False)
+        self.processes: List[multiprocessing.Process] = []
+
+    def _spawn(self, index: int) -> multiprocessing.Process:
+        process = self.context.Process(
+            target=_extraction_worker,
+            args=(self.jobs, self.results, self.running, index),
+            name=f"extraction-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def start(self):
+        self.processes = [self._spawn(i) for i in range(self.size)]
+
+    def ensure_alive(self) -> int:
+        """Restart crashed extraction processes, failing the job each was running.
+
+        Returns how many were restarted.
+        """
+        restarted = 0
+        for i, process in enumerate(self.processes):
+            if not process.is_alive():
+                logger.warning(f"Extraction process {process.name} died; restarting")
+                self._fail_running(i, f"extraction process died (exit code {process.exitcode})")
+                self.processes[i] = self._spawn(i)
+                restarted += 1
+        return restarted
+
+    def _fail_running(self, slot: int, error: str):
+        base = slot * _SLOT_FIELDS
+        client_id, pid, number = self.running[base : base + _SLOT_FIELDS]
+        if client_id == _IDLE:
+            return
+        self.running[base] = _IDLE
+        self.results[client_id].put(((pid, number), None, error))
+
+    def client(self, client_id: int) -> "ExtractionClient":
+        return ExtractionClient(self.jobs, self.results[client_id], client_id)
+
+    def stop(self, timeout: float = 5.0):
+        for _ in self.processes:
+            self.jobs.put(None)
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+class ExtractionClient:
+    """Submits jobs to a SharedExtractionPool from inside one bot worker."""
+
+    def __init__(self, jobs, results, client_id: int):
+        self.jobs = jobs
+        self.results = results
+        self.client_id = client_id
+        self._ids = itertools.count()
+        self._pending: Dict[tuple, tuple] = {}
+        self._reader: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"jobs": self.jobs, "results": self.results, "client_id": self.client_id}
+
+    def __setstate__(self, state):
+        self.__init__(state["jobs"], state["results"], state["client_id"])
+
+    def _read_results(self):
+        while True:
+            job_id, result, error = self.results.get()
+            with self._lock:
+                loop, future = self._pending.pop(job_id, (None, None))
+            if future is None:
+                continue
+            if error:
+                loop.call_soon_threadsafe(future.set_exception, RuntimeError(error))
+            else:
+                loop.call_soon_threadsafe(future.set_result, result)
+
+    async def process_file(
+        self, file_path: str, timeout: float = SHARDING["EXTRACTION_TIMEOUT_SECONDS"]
+    ) -> Optional[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # pid-qualified so a restarted worker never matches a stale result
+        job_id = (os.getpid(), next(self._ids))
+        with self._lock:
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read_results, daemon=True)
+                self._reader.start()
+            self._pending[job_id] = (loop, future)
+        self.jobs.put((job_id, self.client_id, file_path))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Extraction of {os.path.basename(file_path)} took over {timeout} s")
+        finally:
+            with self._lock:
+                self._pending.pop(job_id, None)
+
+
+_client: Optional[ExtractionClient] = None
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def configure_extraction(client: Optional[ExtractionClient]):
+    """Route this process's extraction jobs to a shared pool client."""
+    global _client
+    _client = client
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return this process's own extraction pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # spawned: forking this threaded process could copy held locks
+        _executor = ProcessPoolExecutor(
+            max_workers=TELEGRAM["MAX_CONCURRENT_PROCESSES"],
+            mp_context=multiprocessing.get_context(SHARDING["START_METHOD"]),
+        )
+    return _executor
+
+
+async def extract_document(file_path: str) -> Optional[Dict[str, Any]]:
+    """Extract a document off the event loop, in a shared or local process pool."""
+    if _client is not None:
+        return await _client.process_file(file_path)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), extract_file, file_path)
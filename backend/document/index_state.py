@@ -0,0 +1,36 @@
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from config.secrets import DEFAULT_INDEX_ID
+from config.settings import REBUILD
+
+STATE_FILE = str(Path(__file__).parent.parent / REBUILD["STATE_FILE"])
+
+_state_lock = threading.Lock()
+
+
+def load_state(path: str = STATE_FILE) -> Dict[str, Any]:
+    """Load the index state: the active index and any rebuild in progress."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, Any], path: str = STATE_FILE):
+    """Atomically write the index state."""
+    with _state_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+def active_index_id() -> str:
+    """ID of the index queries should use: the last completed rebuild, else DEFAULT_INDEX_ID."""
+    return load_state().get("active_index_id") or DEFAULT_INDEX_ID
@@ -1,57 +1,92 @@
 import os
 import re
 import hashlib
-from typing import Any, Dict, List, Optional
-
-from config.secrets import AIxPLAIN_API_KEY, DEFAULT_INDEX_ID
-from config.settings import INDEXING
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config.secrets import AIxPLAIN_API_KEY
+from config.settings import INDEXING, DOCUMENT_PROCESSING, SEARCH_CACHE
+from core.metrics import metrics
+from core.resilience import UNAVAILABLE, resilient
+from .catalog import get_catalog
+from .index_state import active_index_id
+from .search_cache import get_search_cache
 
 if AIxPLAIN_API_KEY and not os.environ.get("AIxPLAIN_API_KEY"):
     os.environ["AIxPLAIN_API_KEY"] = AIxPLAIN_API_KEY
     os.environ["TEAM_API_KEY"] = AIxPLAIN_API_KEY
 
-from aixplain.factories import IndexFactory
-from aixplain.modules.model.record import Record
-from aixplain.modules.model.index_model import IndexFilter, IndexFilterOperator
+logger = logging.getLogger(__name__)
+
+# aiXplain SDK modules are imported inside the functions that need them:
+# importing the SDK takes most of the bot's startup time.
+
+
+# Serializes lookups so concurrent callers never create the index twice
+_index_lock = threading.Lock()
 
 
 def get_or_create_index(index_name: str = INDEXING.get("INDEX_NAME")) -> Any:
     """
-    Get an existing index by DEFAULT_INDEX_ID, then by name, or create a new one.
+    Get the active index (the last completed rebuild, else DEFAULT_INDEX_ID),
+    then by name, or create a new one.
     """
+    with _index_lock:
+        return _get_or_create_index(index_name)
+
+
+def _get_or_create_index(index_name: str) -> Any:
+    from aixplain.factories import IndexFactory
+
     try:
-        # 1) Try to get index using DEFAULT_INDEX_ID (if specified)
-        if DEFAULT_INDEX_ID:
+        # 1) Try to get index using the active ID (if specified)
+        index_id = active_index_id()
+        if index_id:
             try:
-                idx = IndexFactory.get(DEFAULT_INDEX_ID)
+                idx = resilient("index_lookup").call(IndexFactory.get, index_id)
                 return idx
+            except UNAVAILABLE:
+                # the backend is down, not the index missing: never create another
+                raise
             except Exception:
                 # Failed to get default index - continue trying
                 pass
 
         # 2) Search for index by name
         try:
-            indexes = IndexFactory.list().get("results", [])
+            indexes = resilient("index_lookup").call(IndexFactory.list).get("results", [])
             for idx in indexes:
                 if getattr(idx, "name", None) == index_name:
                     return idx
+        except UNAVAILABLE:
+            raise
         except Exception:
             # Ignore index list errors and continue to creation attempt
             pass
 
-        # 3) Create new index (use correct EMBEDDING_MODEL key)
-        embedding_model = INDEXING.get("EMBEDDING_MODEL")
-        new_index = IndexFactory.create(
-            name=index_name,
-            description="Knowledge base for document storage and retrieval",
-            embedding_model=embedding_model,
-        )
-        return new_index
+        # 3) Create new index
+        return create_index(index_name)
 
+    except UNAVAILABLE:
+        raise
     except Exception as e:
         raise RuntimeError(f"Error managing index: {str(e)}")
 
 
+def create_index(index_name: str) -> Any:
+    """Create an empty index with the configured embedding model."""
+    from aixplain.factories import IndexFactory
+
+    return IndexFactory.create(
+        name=index_name,
+        description="Knowledge base for document storage and retrieval",
+        embedding_model=INDEXING.get("EMBEDDING_MODEL"),
+    )
+
+
 def compute_document_checksum(text: str) -> str:
     """
     Compute document checksum for change detection.
@@ -65,6 +100,94 @@ def compute_document_checksum(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
 
+def search_index(
+    index: Any, query: str, top_k: int = 10, filters: Optional[List[Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Search an index through the query and chunk caches.
+
+    Args:
+        index: Index object to search
+        query: Query text ("" for a filter-only lookup)
+        top_k: Number of results
+        filters: Optional IndexFilter list
+
+    Returns:
+        List of result items (dicts with 'data', 'document', 'metadata', 'score')
+    """
+    cache = get_search_cache() if SEARCH_CACHE["ENABLED"] else None
+    if cache is not None:
+        details = cache.get(index.id, query, top_k, filters)
+        if details is not None:
+            return details
+        # read before searching, so a search overlapping an upsert is not cached
+        generation = cache.generation(index.id)
+
+    started = time.perf_counter()
+    response = resilient("search").call(
+        index.search, query=query, top_k=top_k, filters=filters or []
+    )
+    latency = time.perf_counter() - started
+    metrics.observe("search.latency_s", latency)
+
+    details = list(response.details or [])
+    if cache is not None:
+        cache.put(index.id, query, top_k, filters, details, latency, generation)
+    return details
+
+
+def invalidate_search_cache(index: Any, file_paths: Optional[List[str]] = None):
+    """
+    Invalidate cached searches after an upsert, then pre-fetch hot queries.
+
+    Args:
+        index: Index that was written to
+        file_paths: Upserted documents; None for a bulk load
+    """
+    if not SEARCH_CACHE["ENABLED"]:
+        return
+    cache = get_search_cache()
+    cache.invalidate(index.id, file_paths)
+
+    hot = cache.hot_queries(index.id, SEARCH_CACHE["PREFETCH_HOT_QUERIES"])
+    if not hot:
+        return
+
+    def prefetch():
+        for query, top_k in hot:
+            try:
+                search_index(index, query, top_k)
+            except Exception:
+                return
+
+    threading.Thread(target=prefetch, name="search-prefetch", daemon=True).start()
+
+
+def find_document(index: Any, file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up one record of a document by its file_path.
+
+    Args:
+        index: Index object to search
+        file_path: The document's file_path attribute
+
+    Returns:
+        The record's attributes (including total_chunks), or None if the
+        document is not in the index
+    """
+    from aixplain.modules.model.index_model import IndexFilter, IndexFilterOperator
+
+    filters = [
+        IndexFilter(field="file_path", value=file_path, operator=IndexFilterOperator.EQUALS)
+    ]
+    # uncached: existence must be authoritative
+    response = resilient("search").call(index.search, query="", top_k=1, filters=filters)
+    details = list(response.details or [])
+    if not details:
+        return None
+    return details[0].get("metadata") or {}
+
+
 def document_exists(index: Any, metadata: Dict[str, Any]) -> bool:
     """
     Check if a document already exists in the index using metadata.
@@ -79,25 +202,48 @@ def document_exists(index: Any, metadata: Dict[str, Any]) -> bool:
     if "file_path" not in metadata:
         return False
 
-    # Create filter to search for the document
-    filters = [
-        IndexFilter(
-            field="file_path",
-            value=metadata["file_path"],
-            operator=IndexFilterOperator.EQUALS,
-        )
-    ]
-
-    # Search the index
     try:
-        response = index.search(query="", top_k=1, filters=filters)
-
-        # If we found a result, the document exists
-        return len(response.details) > 0
+        return find_document(index, metadata["file_path"]) is not None
     except Exception:
         return False
 
 
+def indexed_chunks(index: Any, file_path: str) -> int:
+    """Number of chunks the index holds for a document (0 if absent)."""
+    found = find_document(index, file_path)
+    return int(found.get("total_chunks") or 0) if found is not None else 0
+
+
+def delete_document(
+    index: Any, file_path: str, keep: int = 0, total: Optional[int] = None
+) -> int:
+    """
+    Delete a document's records, or only those past the first keep chunks.
+
+    Record IDs are derived from the file path, so a document re-upserted
+    under the same path overwrites its first chunks; delete_document(...,
+    keep=new_chunks, total=old_chunks) then removes what a longer previous
+    version left.
+
+    Args:
+        index: Index object
+        file_path: The document's file_path attribute
+        keep: Number of leading chunks to keep
+        total: Chunks the document has in the index; looked up if None
+
+    Returns:
+        Number of records deleted
+    """
+    if total is None:
+        total = indexed_chunks(index, file_path)
+    prefix = record_prefix({"file_path": file_path})
+    for i in range(keep, total):
+        resilient("upsert").call(index.delete_record, f"{prefix}_{i}")
+    if total > keep:
+        invalidate_search_cache(index, [file_path])
+    return max(0, total - keep)
+
+
 def chunk_text(text: str, max_chunk_size: int = 200, overlap: int = 20) -> List[str]:
     """
     Split text into chunks while preserving context.
@@ -144,11 +290,9 @@ def chunk_text(text: str, max_chunk_size: int = 200, overlap: int = 20) -> List[
                 # Save current chunk and start a new one
                 chunks.append(" ".join(current_chunk))
                 # Add slight overlap with next chunk to preserve context
-                overlap_sentences = (
-                    current_chunk[-(overlap // 50) :]
-                    if len(current_chunk) > overlap // 50
-                    else current_chunk
-                )
+                # (about one sentence per 50 characters; none below 50)
+                keep = overlap // 50
+                overlap_sentences = current_chunk[-keep:] if keep else []
                 current_chunk = overlap_sentences + [sentence]
                 current_size = sum(len(s) + 1 for s in current_chunk)
 
@@ -159,8 +303,110 @@ def chunk_text(text: str, max_chunk_size: int = 200, overlap: int = 20) -> List[
     return chunks
 
 
+def record_prefix(metadata: Dict[str, Any]) -> str:
+    """Prefix of a document's record IDs: its id, else a hash of its file_path."""
+    if "id" in metadata:
+        return metadata.get("id", "doc")
+    return hashlib.md5(metadata["file_path"].encode()).hexdigest()
+
+
+def build_records(
+    text: str,
+    metadata: Dict[str, Any],
+    chunker: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    overlap: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Chunk a document and build the records to insert for it.
+
+    Args:
+        text: Document text
+        metadata: Document metadata (must contain file_path unless it has an id)
+        chunker: "legal" or "sentence"; defaults to DOCUMENT_PROCESSING["CHUNKER"]
+        chunk_size: Maximum chunk size; defaults to DOCUMENT_PROCESSING["CHUNK_SIZE"]
+        overlap: Chunk overlap; defaults to DOCUMENT_PROCESSING["CHUNK_OVERLAP"]
+
+    Returns:
+        List of plain dicts with 'id', 'value' and 'attributes'
+    """
+    chunker = chunker or DOCUMENT_PROCESSING["CHUNKER"]
+    chunk_size = chunk_size or DOCUMENT_PROCESSING["CHUNK_SIZE"]
+    overlap = DOCUMENT_PROCESSING["CHUNK_OVERLAP"] if overlap is None else overlap
+
+    if chunker == "legal":
+        from .chunking import chunk_legal_text
+
+        chunks = chunk_legal_text(text, max_chunk_size=chunk_size, overlap=overlap)
+        # page numbers only mean something for PDFs; a single-page PDF has no "\f"
+        file_type = metadata.get("file_type") or Path(metadata.get("file_path", "")).suffix.lower()
+        if file_type != ".pdf":
+            for chunk in chunks:
+                del chunk["page_start"], chunk["page_end"]
+    else:
+        chunks = [
+            {"text": chunk}
+            for chunk in chunk_text(
+                text.replace("\f", "\n"), max_chunk_size=chunk_size, overlap=overlap
+            )
+        ]
+
+    checksum = compute_document_checksum(text)
+    prefix = record_prefix(metadata)
+
+    records = []
+    for i, chunk in enumerate(chunks):
+        value = chunk.pop("text")
+        records.append(
+            {
+                "id": f"{prefix}_{i}",
+                "value": value,
+                "attributes": {
+                    **metadata,
+                    **chunk,
+                    "chunk_index": i,
+                    "total_chunks": len(chunks),
+                    "chunk_size": len(value),
+                    "document_checksum": checksum,
+                },
+            }
+        )
+    return records
+
+
+def to_index_records(records: List[Dict[str, Any]]) -> List[Any]:
+    """Convert plain record dicts into aiXplain Record objects."""
+    from aixplain.modules.model.record import Record
+
+    return [
+        Record(id=r["id"], value=r["value"], attributes=r["attributes"])
+        for r in records
+    ]
+
+
+def record_in_catalog(metadata: Dict[str, Any], chunks: Optional[int], index_id: str):
+    """
+    Record an indexed document in the local catalog; failures are only logged.
+
+    Args:
+        metadata: Document metadata (must contain file_path)
+        chunks: Number of chunks upserted; None if the document was already indexed
+        index_id: Index the document is in
+    """
+    try:
+        if chunks is None:
+            get_catalog().ensure(metadata, index_id)
+        else:
+            get_catalog().upsert(metadata, chunks, index_id)
+    except Exception as e:
+        logger.warning(f"Could not record {metadata.get('file_path')} in the catalog: {str(e)}")
+
+
 def process_and_upsert_document(
-    index: Any, document_data: Dict[str, Any]
+    index: Any,
+    document_data: Dict[str, Any],
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    replace: bool = False,
 ) -> Dict[str, Any]:
     """
     Process and upsert a document into the index after checking if it exists.
@@ -168,6 +414,11 @@ def process_and_upsert_document(
     Args:
         index: Target index object
         document_ Dictionary containing 'text' and 'metadata'
+        progress: Optional callback, called as progress(stage, details) after
+            chunking and after each upsert batch (records are then upserted in
+            batches of INDEXING['UPSERT_BATCH_SIZE'])
+        replace: Skip the existence check and overwrite the document's
+            records, deleting any left over from a longer previous version
 
     Returns:
         Dictionary with operation status and details
@@ -186,48 +437,40 @@ def process_and_upsert_document(
         metadata["file_path"] = "unknown_path"
 
     # Check if document already exists in the index
-    if document_exists(index, metadata):
+    if not replace and document_exists(index, metadata):
+        record_in_catalog(metadata, None, index.id)
         return {
             "status": "skipped",
             "message": "Document already exists in the index. Skipping insertion.",
             "file_path": metadata["file_path"],
         }
 
-    # Split text into chunks
-    chunks = chunk_text(text)
-
-    # Create records for insertion
-    records = []
-    for i, chunk in enumerate(chunks):
-        # Create unique ID for the record
-        chunk_id = (
-            f"{metadata.get('id', 'doc')}_{i}"
-            if "id" in metadata
-            else f"{hashlib.md5(metadata['file_path'].encode()).hexdigest()}_{i}"
-        )
-
-        # Create record with metadata
-        record = Record(
-            id=chunk_id,
-            value=chunk,
-            attributes={
-                **metadata,
-                "chunk_index": i,
-                "total_chunks": len(chunks),
-                "chunk_size": len(chunk),
-                "document_checksum": compute_document_checksum(text),
-            },
-        )
-        records.append(record)
+    # Split text into chunks & build records
+    records = to_index_records(build_records(text, metadata))
+    if progress is not None:
+        progress("chunked", {"chunks": len(records)})
 
     # Insert records into the index
     try:
-        index.upsert(records)
+        # chunks of the version being replaced, counted before they are overwritten
+        previous_chunks = indexed_chunks(index, metadata["file_path"]) if replace else 0
+        if progress is None:
+            resilient("upsert").call(index.upsert, records)
+        else:
+            batch_size = INDEXING["UPSERT_BATCH_SIZE"]
+            for start in range(0, len(records), batch_size):
+                resilient("upsert").call(index.upsert, records[start : start + batch_size])
+                upserted = min(start + batch_size, len(records))
+                progress("upserted", {"upserted": upserted, "chunks": len(records)})
+        if previous_chunks > len(records):
+            delete_document(index, metadata["file_path"], len(records), previous_chunks)
+        invalidate_search_cache(index, [metadata["file_path"]])
+        record_in_catalog(metadata, len(records), index.id)
         return {
             "status": "success",
-            "message": f"Successfully added {len(chunks)} chunks to the index",
+            "message": f"Successfully added {len(records)} chunks to the index",
             "index_id": index.id,
-            "total_chunks": len(chunks),
+            "total_chunks": len(records),
             "file_path": metadata["file_path"],
             "file_size": metadata["file_size"],
         }
@@ -0,0 +1,186 @@
+import io
+import os
+import time
+import shutil
+import hashlib
+import logging
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config.settings import OCR
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent.parent / OCR["CACHE_DIR"]
+
+# Engine processes are started from these threads, so the pool bounds how
+# many run at once. Extraction workers are daemon processes, which may not
+# start multiprocessing children of their own.
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def ocr_available() -> bool:
+    """Return True if OCR is enabled and the local engine is installed."""
+    return bool(OCR["ENABLED"] and shutil.which(OCR["TESSERACT_CMD"]))
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=OCR["MAX_WORKERS"], thread_name_prefix="ocr"
+            )
+        return _pool
+
+
+def page_hashes(file_path: str, page_numbers: List[int]) -> Dict[int, str]:
+    """
+    Hash the raw content of PDF pages without rendering them.
+
+    A page's hash covers its content stream and the data of the images and
+    forms it draws, plus the OCR settings, so the same scan inside a
+    different file still hits the cache.
+
+    Args:
+        file_path: Path to the PDF file
+        page_numbers: Zero-based page numbers to hash
+
+    Returns:
+        Mapping of page number to hex digest
+    """
+    import PyPDF2
+
+    settings = f"{OCR['LANGUAGE']}/{OCR['DPI']}".encode()
+    hashes = {}
+    with open(file_path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for number in page_numbers:
+            page = reader.pages[number]
+            digest = hashlib.sha256(settings)
+            contents = page.get_contents()
+            if contents is not None:
+                digest.update(contents.get_data())
+            resources = page.get("/Resources")
+            xobjects = resources.get_object().get("/XObject") if resources else None
+            if xobjects:
+                xobjects = xobjects.get_object()
+                for name in sorted(xobjects):
+                    digest.update(xobjects[name].get_object().get_data())
+            hashes[number] = digest.hexdigest()
+    return hashes
+
+
+def _cache_path(page_hash: str) -> Path:
+    return CACHE_DIR / page_hash[:2] / f"{page_hash}.txt"
+
+
+def cached_text(page_hash: str) -> Optional[str]:
+    try:
+        return _cache_path(page_hash).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def cache_text(page_hash: str, text: str):
+    """Store a page's text; safe with several extraction processes writing."""
+    path = _cache_path(page_hash)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    temp_path.write_text(text, encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def _run_engine(image: bytes) -> str:
+    result = subprocess.run(
+        [OCR["TESSERACT_CMD"], "stdin", "stdout", "-l", OCR["LANGUAGE"]],
+        input=image,
+        capture_output=True,
+        timeout=OCR["PAGE_TIMEOUT_SECONDS"],
+        check=True,
+    )
+    return result.stdout.decode("utf-8", errors="ignore").strip()
+
+
+def ocr_pages(file_path: str, page_numbers: List[int]) -> Dict[int, str]:
+    """
+    OCR the given pages of a PDF, reusing cached page texts.
+
+    Pages are rendered one at a time in this thread (pdfium is not thread
+    safe) while earlier pages are recognized in the OCR pool. At most
+    OCR["MAX_WORKERS"] + 1 rendered pages wait for the engine at a time, so
+    a long scan is never held in memory as images all at once. Each page's
+    time and cache status is logged.
+
+    Args:
+        file_path: Path to the PDF file
+        page_numbers: Zero-based numbers of the pages without a text layer
+
+    Returns:
+        Mapping of page number to recognized text, for pages that succeeded
+    """
+    import pypdfium2
+
+    started = time.perf_counter()
+    texts: Dict[int, str] = {}
+    timings: Dict[int, float] = {}
+    try:
+        hashes = page_hashes(file_path, page_numbers)
+    except Exception as e:
+        logger.warning(f"Could not hash pages of {file_path}, OCR cache disabled: {str(e)}")
+        hashes = {}
+
+    def collect(number: int, page_started: float, future: Future):
+        try:
+            text = future.result()
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.error(f"OCR failed on page {number + 1} of {file_path}: {str(e)}")
+            return
+        texts[number] = text
+        timings[number] = time.perf_counter() - page_started
+        logger.info(f"OCR page {number + 1}: {timings[number]:.2f} s")
+        if number in hashes:
+            cache_text(hashes[number], text)
+
+    # one page rendering while the pool works through the others
+    window = OCR["MAX_WORKERS"] + 1
+    pending: Deque[Tuple[int, float, Future]] = deque()
+    recognized = 0
+    document = pypdfium2.PdfDocument(file_path)
+    try:
+        for number in page_numbers:
+            page_started = time.perf_counter()
+            page_hash = hashes.get(number)
+            text = cached_text(page_hash) if page_hash else None
+            if text is not None:
+                texts[number] = text
+                timings[number] = time.perf_counter() - page_started
+                logger.info(f"OCR page {number + 1}: cache hit ({timings[number] * 1e3:.1f} ms)")
+                continue
+
+            if len(pending) >= window:
+                collect(*pending.popleft())
+            page = document[number]
+            bitmap = page.render(scale=OCR["DPI"] / 72, grayscale=True)
+            image = io.BytesIO()
+            bitmap.to_pil().save(image, format="PNG")
+            page.close()
+            pending.append((number, page_started, _get_pool().submit(_run_engine, image.getvalue())))
+            recognized += 1
+    finally:
+        document.close()
+
+    while pending:
+        collect(*pending.popleft())
+
+    logger.info(
+        f"OCR of {file_path}: {len(texts)}/{len(page_numbers)} pages, "
+        f"{len(page_numbers) - recognized} from cache, "
+        f"{time.perf_counter() - started:.2f} s"
+    )
+    return texts
@@ -1,14 +1,22 @@
 import os
 import re
 import hashlib
-import PyPDF2
-import docx
-import pdfplumber
-from bs4 import BeautifulSoup
+import threading
+import zipfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import time
 
+from config.settings import DOCUMENT_PROCESSING
+
+# WordprocessingML namespace, as it appears in ElementTree tags
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Extracted text by (file checksum, extension); each extraction process keeps its own
+_text_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_text_cache_lock = threading.Lock()
+
 
 class DocumentProcessor:
     """Processes documents and extracts content and metadata for indexing using alternative libraries."""
@@ -51,16 +59,22 @@ class DocumentProcessor:
                 raise ValueError(f"File size exceeds maximum limit of 20 MB")
 
             extension = Path(file_path).suffix.lower()
+            checksum = self._compute_file_checksum(file_path)
 
-            # Process file based on type
-            if extension in self.supported_extensions["pdf"]:
-                text_content = self._process_pdf(file_path)
-            elif extension in self.supported_extensions["office"]:
-                text_content = self._process_docx(file_path)
-            elif extension in self.supported_extensions["text"]:
-                text_content = self._process_text(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {extension}")
+            # Re-uploads of the same content skip parsing
+            text_content = self._cached_text(checksum, extension)
+            if text_content is None:
+                # Process file based on type
+                if extension in self.supported_extensions["pdf"]:
+                    text_content = self._process_pdf(file_path)
+                elif extension in self.supported_extensions["office"]:
+                    text_content = self._process_docx(file_path)
+                elif extension in self.supported_extensions["text"]:
+                    text_content = self._process_text(file_path)
+                else:
+                    raise ValueError(f"Unsupported file type: {extension}")
+                if text_content:
+                    self._cache_text(checksum, extension, text_content)
 
             if not text_content:
                 return None
@@ -73,7 +87,7 @@ class DocumentProcessor:
                 "file_type": extension,
                 "file_size": file_stat.st_size,
                 "last_modified": file_stat.st_mtime,
-                "checksum": self._compute_file_checksum(file_path),
+                "checksum": checksum,
                 "processing_date": int(time.time()),
                 "source": "telegram_upload",
             }
@@ -85,37 +99,57 @@ class DocumentProcessor:
             return None
 
     def _process_pdf(self, file_path: str) -> str:
-        """Process PDF file using pdfplumber for better text extraction."""
-        text = ""
+        """Process PDF file using pdfplumber, with OCR for pages without a text layer."""
+        # parsers are imported on first use to keep startup fast
+        import PyPDF2
+        import pdfplumber
+
+        pages: List[str] = []
         try:
             # Try using pdfplumber first (for better text)
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-
-            # If pdfplumber fails, use PyPDF2 as fallback
-            if not text.strip():
-                with open(file_path, "rb") as file:
-                    reader = PyPDF2.PdfReader(file)
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
+                pages = [page.extract_text() or "" for page in pdf.pages]
         except Exception as e:
             print(f"Error processing PDF {file_path}: {str(e)}")
-            # Try using PyPDF2 as fallback
+
+        # If pdfplumber fails, use PyPDF2 as fallback
+        if not any(text.strip() for text in pages):
             try:
                 with open(file_path, "rb") as file:
                     reader = PyPDF2.PdfReader(file)
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
+                    pages = [page.extract_text() or "" for page in reader.pages]
             except Exception as e2:
                 print(f"Secondary error processing PDF {file_path}: {str(e2)}")
 
-        return text.strip()
+        # Pages still without text are scanned images; only those are OCRed
+        blank = [number for number, text in enumerate(pages) if not text.strip()]
+        if blank:
+            from .ocr import ocr_available, ocr_pages
+
+            if ocr_available():
+                try:
+                    for number, text in ocr_pages(file_path, blank).items():
+                        pages[number] = text
+                except Exception as e:
+                    print(f"Error running OCR on PDF {file_path}: {str(e)}")
+            else:
+                print(f"{len(blank)} page(s) of {file_path} have no text layer and OCR is not installed")
+
+        if not any(text.strip() for text in pages):
+            return ""
+        # form feeds keep page boundaries for the chunker's page numbers
+        return "\f".join(text.strip() for text in pages)
 
     def _process_docx(self, file_path: str) -> str:
-        """Process DOCX file using python-docx."""
+        """Process DOCX file by streaming word/document.xml, tables included."""
+        try:
+            return self._docx_text(file_path)
+        except Exception as e:
+            print(f"Error streaming DOCX {file_path}: {str(e)}")
+
+        # Fall back to python-docx (paragraphs only)
+        import docx
+
         try:
             doc = docx.Document(file_path)
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
@@ -124,6 +158,69 @@ class DocumentProcessor:
             print(f"Error processing DOCX {file_path}: {str(e)}")
             return ""
 
+    def _docx_text(self, file_path: str) -> str:
+        """
+        Extract the body text of a DOCX file without building a document tree.
+
+        Paragraphs become lines. Each table row becomes one line with its
+        cells separated by " | "; rows of nested tables become part of the
+        enclosing cell. Finished elements are cleared, so memory stays flat
+        on large documents.
+
+        Args:
+            file_path: Path to the DOCX file
+
+        Returns:
+            Extracted text
+        """
+        from xml.etree.ElementTree import iterparse
+
+        lines: List[str] = []
+        runs: List[str] = []
+        # one (cells, cell_paragraphs) pair per open table
+        tables: List[Tuple[List[str], List[str]]] = []
+
+        with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+            for event, elem in iterparse(xml, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == W + "tbl":
+                        tables.append(([], []))
+                    continue
+
+                if tag == W + "t":
+                    runs.append(elem.text or "")
+                elif tag == W + "tab":
+                    runs.append("\t")
+                elif tag in (W + "br", W + "cr"):
+                    runs.append("\n")
+                elif tag == W + "p":
+                    paragraph = "".join(runs)
+                    runs.clear()
+                    if tables:
+                        tables[-1][1].append(paragraph)
+                    else:
+                        lines.append(paragraph)
+                    elem.clear()
+                elif tag == W + "tc":
+                    cells, paragraphs = tables[-1]
+                    cells.append(" ".join(p.strip() for p in paragraphs if p.strip()))
+                    paragraphs.clear()
+                elif tag == W + "tr":
+                    cells, _ = tables[-1]
+                    row = " | ".join(cells)
+                    cells.clear()
+                    if len(tables) > 1:
+                        tables[-2][1].append(row)
+                    else:
+                        lines.append(row)
+                    elem.clear()
+                elif tag == W + "tbl":
+                    tables.pop()
+                    elem.clear()
+
+        return "\n".join(lines).strip()
+
     def _process_text(self, file_path: str) -> str:
         """Process text-based files (txt, html, etc.)."""
         extension = Path(file_path).suffix.lower()
@@ -133,20 +230,59 @@ class DocumentProcessor:
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                     return f.read().strip()
 
-            # Process HTML files using BeautifulSoup
             elif extension in [".html", ".htm"]:
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    soup = BeautifulSoup(f, "html.parser")
-                    # Remove script tags and invisible text
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    return soup.get_text(separator="\n", strip=True)
+                    html = f.read()
+                return self._html_text(html)
 
             return ""
         except Exception as e:
             print(f"Error processing text file {file_path}: {str(e)}")
             return ""
 
+    def _html_text(self, html: str) -> str:
+        """Extract visible text from HTML with lxml, or BeautifulSoup if lxml is missing."""
+        try:
+            import lxml.html
+            from lxml import etree
+        except ImportError:
+            lxml = None
+
+        if lxml is not None:
+            try:
+                tree = lxml.html.document_fromstring(html)
+                # Remove script tags and invisible text
+                etree.strip_elements(tree, "script", "style", with_tail=False)
+                return "\n".join(
+                    text.strip() for text in tree.itertext() if text.strip()
+                )
+            except (etree.ParserError, ValueError):
+                # empty documents, or an encoding declaration in a str
+                pass
+
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        # Remove script tags and invisible text
+        for script in soup(["script", "style"]):
+            script.decompose()
+        return soup.get_text(separator="\n", strip=True)
+
+    def _cached_text(self, checksum: str, extension: str) -> Optional[str]:
+        """Return previously extracted text for this content, if cached."""
+        key = (checksum, extension)
+        with _text_cache_lock:
+            text = _text_cache.get(key)
+            if text is not None:
+                _text_cache.move_to_end(key)
+            return text
+
+    def _cache_text(self, checksum: str, extension: str, text: str):
+        with _text_cache_lock:
+            _text_cache[(checksum, extension)] = text
+            while len(_text_cache) > DOCUMENT_PROCESSING["TEXT_CACHE_SIZE"]:
+                _text_cache.popitem(last=False)
+
     def _compute_file_checksum(self, file_path: str) -> str:
         """Compute MD5 checksum of a file."""
         hash_md5 = hashlib.md5()
@@ -0,0 +1,445 @@
+import os
+import time
+import fcntl
+import shutil
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config.secrets import DEFAULT_AGENT_ID
+from config.settings import DOCUMENT_PROCESSING, INDEXING, REBUILD, SHARDING
+from core.metrics import metrics
+from core.resilience import resilient
+from .default_data import DefaultDataLoader
+from .extraction import extract_file
+from .index_state import active_index_id, load_state, save_state
+from .indexer import (
+    build_records,
+    create_index,
+    get_or_create_index,
+    record_in_catalog,
+    to_index_records,
+)
+from .processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+SOURCES_DIR = Path(__file__).parent.parent / REBUILD["SOURCES_DIR"]
+
+Progress = Callable[[str, Dict[str, Any]], None]
+
+# one rebuild per process at a time
+_rebuild_lock = threading.Lock()
+
+
+@dataclass
+class Source:
+    """An original document the index can be rebuilt from."""
+
+    key: str  # "default/<name>" or "upload/<name>"
+    path: Path
+    file_path: str  # path recorded in the index, which fixes the record IDs
+    source: str
+
+
+def retain_source(file_path: str, file_name: Optional[str] = None):
+    """Keep an uploaded original in REBUILD['SOURCES_DIR'] so rebuilds can re-extract it."""
+    os.makedirs(SOURCES_DIR, exist_ok=True)
+    target = os.path.join(SOURCES_DIR, os.path.basename(file_name or file_path))
+    temp_path = f"{target}.tmp"
+    shutil.copyfile(file_path, temp_path)
+    os.replace(temp_path, target)
+
+
+@contextmanager
+def sources_lock() -> Iterator[None]:
+    """Exclusive lock on REBUILD['SOURCES_DIR'], shared by every process on the machine.
+
+    Uploads hold it while retaining their original and resolving the index
+    to write to; a rebuild holds it while taking its last source listing and
+    swapping. An upload is therefore either in the rebuild's listing or
+    written to the index swapped in.
+    """
+    os.makedirs(SOURCES_DIR, exist_ok=True)
+    with open(os.path.join(SOURCES_DIR, ".lock"), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def retain_for_indexing(file_path: str) -> Any:
+    """Retain an upload's original, then return the index to upsert it into."""
+    with sources_lock():
+        retain_source(file_path)
+        return get_or_create_index()
+
+
+def list_sources() -> List[Source]:
+    """Every document a rebuild re-ingests: the default corpus, then retained uploads."""
+    sources = [
+        Source(f"default/{path.name}", path, f"data/default/{path.name}", "default_content")
+        for path in DefaultDataLoader().get_default_files()
+    ]
+    processor = DocumentProcessor()
+    uploads_dir = SOURCES_DIR
+    if uploads_dir.is_dir():
+        for path in sorted(uploads_dir.iterdir()):
+            if path.is_file() and processor.is_supported_file(str(path)):
+                # the path a Telegram or API upload of this file is indexed under
+                file_path = os.path.abspath(os.path.join(processor.temp_dir, path.name))
+                sources.append(Source(f"upload/{path.name}", path, file_path, "telegram_upload"))
+    return sources
+
+
+def settings_fingerprint() -> str:
+    """Version of the settings that shape records; a rebuild only resumes under the same one."""
+    return hashlib.md5(
+        f"{DOCUMENT_PROCESSING['CHUNKER']}/{DOCUMENT_PROCESSING['CHUNK_SIZE']}/"
+        f"{DOCUMENT_PROCESSING['CHUNK_OVERLAP']}/{INDEXING['EMBEDDING_MODEL']}".encode()
+    ).hexdigest()
+
+
+def rebuild_running() -> bool:
+    return _rebuild_lock.locked()
+
+
+def _get_index(index_id: str) -> Any:
+    from aixplain.factories import IndexFactory
+
+    return resilient("index_lookup").call(IndexFactory.get, index_id)
+
+
+def _load_agent(agent_id: str) -> Any:
+    """The agent or team agent with this ID."""
+    from aixplain.factories import AgentFactory, TeamAgentFactory
+
+    try:
+        return resilient("index_lookup").call(AgentFactory.get, agent_id)
+    except Exception as agent_error:
+        try:
+            return resilient("index_lookup").call(TeamAgentFactory.get, agent_id)
+        except Exception:
+            raise agent_error
+
+
+def point_agent_at(index_id: str, previous_id: str, agent_id: str = DEFAULT_AGENT_ID):
+    """
+    Rebind the hosted agent's index tools from the previous index to a new one.
+
+    The configured agent may be a team (aixplain/team_agents), whose index
+    tool sits on a member agent, so the members are searched too. Every
+    agent holding a tool on the previous index is updated and saved.
+
+    Args:
+        index_id: Index the agent should search from now on
+        previous_id: Index its tools search now
+        agent_id: Agent or team to update; nothing to do when none is configured
+
+    Raises:
+        RuntimeError: Neither the agent nor a team member has a tool on the
+            previous index, so it would keep answering from an index nothing
+            writes to any more
+    """
+    if not agent_id:
+        return
+    from aixplain.factories import AgentFactory
+
+    root = _load_agent(agent_id)
+    updated = 0
+    for agent in [root, *(getattr(root, "agents", None) or [])]:
+        tools = getattr(agent, "tools", None) or []
+        bound = [i for i, tool in enumerate(tools) if getattr(tool, "model", None) == previous_id]
+        for i in bound:
+            tool = tools[i]
+            tools[i] = AgentFactory.create_model_tool(
+                model=index_id, name=tool.name or None, description=tool.description
+            )
+        if bound:
+            agent.save()
+            updated += 1
+            logger.info(f"Agent {agent.id} now searches index {index_id}")
+    if not updated:
+        raise RuntimeError(f"Agent {agent_id} has no tool on index {previous_id}")
+
+
+class IndexRebuilder:
+    """Re-ingests every known document into a fresh shadow index, then swaps it in.
+
+    Documents are extracted across a process pool and upserted into the
+    shadow index in batches while queries keep using the active index.
+    Progress is saved in the index state file after every document, so an
+    interrupted rebuild resumes with the same shadow index (as long as the
+    chunking settings are unchanged). The active index ID is switched only
+    when every document is in, and only after the hosted agent's index tool
+    has been moved to the new index, so queries and writes use one index.
+    """
+
+    def __init__(
+        self,
+        workers: int = REBUILD["WORKERS"],
+        batch_size: int = REBUILD["BATCH_SIZE"],
+        get_index: Callable[[str], Any] = _get_index,
+        new_index: Callable[[str], Any] = create_index,
+        repoint_agent: Callable[[str, str], None] = point_agent_at,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.get_index = get_index
+        self.new_index = new_index
+        self.repoint_agent = repoint_agent
+        self.processor = DocumentProcessor()
+
+    def _shadow_index(self, state: Dict[str, Any]) -> Any:
+        rebuild = state.get("rebuild")
+        if rebuild and rebuild.get("settings") == settings_fingerprint():
+            try:
+                index = self.get_index(rebuild["shadow_index_id"])
+                logger.info(
+                    f"Resuming rebuild into {index.id}: {len(rebuild['done'])} documents already in"
+                )
+                return index
+            except Exception as e:
+                logger.warning(f"Shadow index {rebuild['shadow_index_id']} unavailable: {str(e)}")
+
+        index = self.new_index(f"{INDEXING['INDEX_NAME']} {time.strftime('%Y%m%d-%H%M%S')}")
+        state["rebuild"] = {
+            "shadow_index_id": index.id,
+            "settings": settings_fingerprint(),
+            "started_at": int(time.time()),
+            "done": {},
+        }
+        save_state(state)
+        logger.info(f"Rebuilding into new shadow index {index.id}")
+        return index
+
+    def _upsert(self, index: Any, source: Source, document: Dict[str, Any]) -> int:
+        metadata = document["metadata"]
+        metadata["file_path"] = source.file_path
+        metadata["source"] = source.source
+        records = to_index_records(build_records(document["text"], metadata))
+        for start in range(0, len(records), self.batch_size):
+            resilient("upsert").call(index.upsert, records[start : start + self.batch_size])
+        record_in_catalog(metadata, len(records), index.id)
+        return len(records)
+
+    def run(self, progress: Optional[Progress] = None) -> Dict[str, Any]:
+        """
+        Rebuild (or resume rebuilding) the index from every known document.
+
+        Args:
+            progress: Optional callback, called as progress(event, details)
+                with "started", "document", "failed" and "swapped" events
+
+        Returns:
+            Summary with 'status' ("success" or "incomplete"), index IDs,
+            document and chunk counts, and throughput
+        """
+        if not _rebuild_lock.acquire(blocking=False):
+            raise RuntimeError("An index rebuild is already running")
+        try:
+            return self._run(progress or (lambda event, details: None))
+        finally:
+            _rebuild_lock.release()
+
+    def _checksums(self, sources: List[Source]) -> Dict[str, str]:
+        return {s.key: self.processor._compute_file_checksum(str(s.path)) for s in sources}
+
+    @staticmethod
+    def _pending(sources: List[Source], rebuild: Dict[str, Any], checksums) -> List[Source]:
+        """Sources not yet in the shadow index, or changed since they were put in."""
+        return [
+            s for s in sources if rebuild["done"].get(s.key, {}).get("checksum") != checksums[s.key]
+        ]
+
+    def _run(self, emit: Progress) -> Dict[str, Any]:
+        started = time.perf_counter()
+        state = load_state()
+        shadow = self._shadow_index(state)
+        rebuild = state["rebuild"]
+
+        sources = list_sources()
+        checksums = self._checksums(sources)
+        pending = self._pending(sources, rebuild, checksums)
+        emit(
+            "started",
+            {"index_id": shadow.id, "documents": len(sources), "pending": len(pending)},
+        )
+
+        counts = {"done": 0, "chunks": 0, "pending": len(pending)}
+        failed: Dict[str, str] = {}
+        while True:
+            self._ingest(shadow, state, pending, checksums, counts, failed, emit, started)
+            if failed:
+                break
+            # uploads retained while the pass ran are ingested by another pass;
+            # the last listing and the swap share the sources lock with uploads,
+            # so none can land in between
+            with sources_lock():
+                sources = list_sources()
+                checksums = self._checksums(sources)
+                pending = self._pending(sources, rebuild, checksums)
+                if not pending:
+                    return self._finish(state, shadow, sources, checksums, counts, started, emit)
+            logger.info(f"{len(pending)} documents arrived during the rebuild; adding them")
+            counts["pending"] += len(pending)
+
+        # the active index stays; running again retries only what is missing
+        logger.warning(f"Rebuild incomplete: {len(failed)} documents failed")
+        summary = self._summary(shadow, sources, counts, started)
+        return {**summary, "status": "incomplete", "failed": failed}
+
+    def _ingest(
+        self,
+        shadow: Any,
+        state: Dict[str, Any],
+        pending: List[Source],
+        checksums: Dict[str, str],
+        counts: Dict[str, int],
+        failed: Dict[str, str],
+        emit: Progress,
+        started: float,
+    ):
+        """Extract and upsert pending sources into the shadow index, recording progress."""
+        rebuild = state["rebuild"]
+        workers = max(1, min(self.workers, len(pending)))
+        context = multiprocessing.get_context(SHARDING["START_METHOD"])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(extract_file, str(s.path)): s for s in pending}
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    document = future.result()
+                    if not document:
+                        raise ValueError("extraction returned no text")
+                    count = self._upsert(shadow, source, document)
+                except Exception as e:
+                    failed[source.key] = str(e)
+                    logger.error(f"Rebuild failed for {source.key}: {str(e)}")
+                    emit("failed", {"document": source.key, "error": str(e)})
+                    continue
+
+                rebuild["done"][source.key] = {"checksum": checksums[source.key], "chunks": count}
+                save_state(state)
+                counts["done"] += 1
+                counts["chunks"] += count
+                elapsed = time.perf_counter() - started
+                metrics.incr("rebuild.documents")
+                metrics.incr("rebuild.chunks", count)
+                emit(
+                    "document",
+                    {
+                        "document": source.key,
+                        "chunks": count,
+                        "done": counts["done"],
+                        "pending": counts["pending"],
+                        "documents_per_s": counts["done"] / elapsed,
+                        "chunks_per_s": counts["chunks"] / elapsed,
+                    },
+                )
+
+    @staticmethod
+    def _summary(shadow: Any, sources: List[Source], counts: Dict[str, int], started: float):
+        elapsed = time.perf_counter() - started
+        return {
+            "index_id": shadow.id,
+            "documents": len(sources),
+            "rebuilt": counts["done"],
+            "chunks": counts["chunks"],
+            "seconds": elapsed,
+            "documents_per_s": counts["done"] / elapsed if elapsed else 0.0,
+            "chunks_per_s": counts["chunks"] / elapsed if elapsed else 0.0,
+        }
+
+    def _finish(
+        self,
+        state: Dict[str, Any],
+        shadow: Any,
+        sources: List[Source],
+        checksums: Dict[str, str],
+        counts: Dict[str, int],
+        started: float,
+        emit: Progress,
+    ) -> Dict[str, Any]:
+        """Point the agent at the shadow index and make it the active one."""
+        summary = self._summary(shadow, sources, counts, started)
+        # the index uploads write to now: the active one, else the one found by name
+        previous = active_index_id() or get_or_create_index().id
+        try:
+            self.repoint_agent(shadow.id, previous)
+        except Exception as e:
+            # swapping anyway would leave every later upload invisible to the agent
+            logger.error(f"Not swapping in {shadow.id}: {str(e)}")
+            return {**summary, "status": "incomplete", "failed": {"agent": str(e)}}
+        try:
+            self._swap(state, shadow, sources, checksums, previous)
+        except Exception:
+            # the state still names the previous index, so the agent goes back to it
+            try:
+                self.repoint_agent(previous, shadow.id)
+            except Exception as e:
+                logger.error(f"Could not move agent back to {previous}: {str(e)}")
+            raise
+        emit("swapped", {"index_id": shadow.id, "previous_index_id": previous})
+        logger.info(
+            f"Rebuild complete: {len(sources)} documents in {shadow.id} "
+            f"({summary['documents_per_s']:.2f} docs/s, {summary['chunks_per_s']:.0f} chunks/s)"
+        )
+        return {**summary, "status": "success", "previous_index_id": previous}
+
+    def _swap(
+        self, state: Dict[str, Any], shadow: Any, sources: List[Source], checksums, previous: str
+    ):
+        """Make the shadow index the active one; raises only if the state was not saved."""
+        before = dict(state)
+        rebuild = state.pop("rebuild")
+        state["previous_index_id"] = previous
+        state["active_index_id"] = shadow.id
+        state["swapped_at"] = int(time.time())
+        try:
+            save_state(state)
+        except Exception:
+            state.clear()
+            state.update(before)
+            raise
+
+        # the default corpus is now fully in the new index; without the
+        # manifest the loader only re-upserts the files, so failing is fine
+        try:
+            loader = DefaultDataLoader()
+            manifest = {"index_id": shadow.id, "files": {}}
+            for source in sources:
+                if source.key.startswith("default/"):
+                    manifest["files"][source.path.name] = loader._manifest_entry(
+                        source.path, checksums[source.key], rebuild["done"][source.key]["chunks"]
+                    )
+            loader.save_manifest(manifest)
+        except Exception as e:
+            logger.warning(f"Could not record default content in the new index: {str(e)}")
+
+
+if __name__ == "__main__":
+    # Rebuild (or resume) from the command line: python -m document.rebuild
+    logging.basicConfig(level=logging.INFO)
+
+    def report(event: str, details: Dict[str, Any]):
+        if event == "document":
+            print(
+                f"{details['done']}/{details['pending']} {details['document']} "
+                f"({details['chunks']} chunks, {details['documents_per_s']:.2f} docs/s, "
+                f"{details['chunks_per_s']:.0f} chunks/s)"
+            )
+        else:
+            print(f"{event}: {details}")
+
+    result = IndexRebuilder().run(report)
+    print(result)
+    if result["status"] != "success":
+        raise SystemExit(1)
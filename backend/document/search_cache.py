@@ -0,0 +1,306 @@
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import SEARCH_CACHE
+from core.metrics import metrics
+
+GENERATIONS_PATH = (
+    str(Path(__file__).parent.parent / SEARCH_CACHE["GENERATIONS_PATH"])
+    if SEARCH_CACHE["GENERATIONS_PATH"]
+    else ""
+)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache entry."""
+    return re.sub(r"\s+", " ", query.lower()).strip().rstrip("?!. ")
+
+
+def _filters_key(filters: Any) -> str:
+    if not filters:
+        return ""
+    items = [f.to_dict() if hasattr(f, "to_dict") else f for f in filters]
+    return json.dumps(items, sort_keys=True, default=str)
+
+
+def chunk_id(detail: Dict[str, Any]) -> str:
+    """Return the record ID of a search result item."""
+    return str(detail.get("document") or detail.get("id") or hash(detail.get("data")))
+
+
+class SharedGenerations:
+    """Per-index generation counters in SQLite, shared by every process.
+
+    Each process caches searches on its own, so an upsert in one process
+    bumps the counter here and the others notice on their next check.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "index_id TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, index_id: str) -> int:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT generation FROM generations WHERE index_id = ?", (index_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, index_id: str) -> int:
+        """Increment an index's generation and return the new value."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO generations (index_id, generation) VALUES (?, 1) "
+                "ON CONFLICT (index_id) DO UPDATE SET generation = generation + 1",
+                (index_id,),
+            )
+            return self._db.execute(
+                "SELECT generation FROM generations WHERE index_id = ?", (index_id,)
+            ).fetchone()[0]
+
+
+@dataclass
+class _QueryEntry:
+    chunk_ids: List[str]
+    generation: int
+    created: float
+    latency: float  # seconds the index search took, saved on every hit
+    hits: int = 0
+
+
+class SearchCache:
+    """Caches in front of index search.
+
+    The query cache maps a normalized (query, top_k, filters) to the ordered
+    record IDs it returned. The chunk cache holds the result items by record
+    ID under a byte budget with LRU eviction, so chunks shared by many
+    questions are stored once and popular ones stay resident.
+
+    An upsert bumps the index's generation, which retires every cached query
+    result for that index (new records can change any ranking), and evicts
+    the chunks of the upserted documents only. With ``generations_path`` the
+    generations are shared between processes: a process that finds one
+    bumped elsewhere (checked at most every ``check_seconds``) drops its
+    results and chunks of that index.
+    """
+
+    def __init__(
+        self,
+        max_queries: int = SEARCH_CACHE["MAX_QUERIES"],
+        max_chunk_bytes: int = SEARCH_CACHE["MAX_CHUNK_BYTES"],
+        ttl_seconds: float = SEARCH_CACHE["TTL_SECONDS"],
+        generations_path: Optional[str] = GENERATIONS_PATH,
+        check_seconds: float = SEARCH_CACHE["GENERATION_CHECK_SECONDS"],
+    ):
+        self.max_queries = max_queries
+        self.max_chunk_bytes = max_chunk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.check_seconds = check_seconds
+        self._shared = SharedGenerations(generations_path) if generations_path else None
+        self._checked: Dict[str, float] = {}
+        self._queries: "OrderedDict[Tuple[str, str, int, str], _QueryEntry]" = OrderedDict()
+        self._chunks: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._chunk_bytes = 0
+        self._generations: Dict[str, int] = {}
+        # hit counts survive invalidation, so hot queries can be pre-fetched again
+        self._popularity: Dict[Tuple[str, str, int, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, index_id: str, query: str, top_k: int, filters: Any):
+        return (index_id, normalize_query(query), top_k, _filters_key(filters))
+
+    def _evict_chunks(self, index_id: str, paths: Optional[set] = None) -> int:
+        evicted = [
+            chunk_key
+            for chunk_key, (detail, _) in self._chunks.items()
+            if chunk_key[0] == index_id
+            and (paths is None or (detail.get("metadata") or {}).get("file_path") in paths)
+        ]
+        for chunk_key in evicted:
+            _, size = self._chunks.pop(chunk_key)
+            self._chunk_bytes -= size
+        return len(evicted)
+
+    def _generation(self, index_id: str) -> int:
+        """The index's current generation, following other processes' upserts."""
+        local = self._generations.get(index_id, 0)
+        if self._shared is None:
+            return local
+        now = time.monotonic()
+        if now - self._checked.get(index_id, float("-inf")) < self.check_seconds:
+            return local
+        self._checked[index_id] = now
+        shared = self._shared.get(index_id)
+        if shared != local:
+            # which documents changed is unknown here, so drop all of the index
+            self._generations[index_id] = shared
+            self._evict_chunks(index_id)
+            metrics.incr("search_cache.remote_invalidations")
+        return shared
+
+    def generation(self, index_id: str) -> int:
+        """The index's current generation; read it before searching, pass it to put."""
+        with self._lock:
+            return self._generation(index_id)
+
+    def get(
+        self, index_id: str, query: str, top_k: int, filters: Any = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return cached result items, or None on a miss."""
+        key = self._key(index_id, query, top_k, filters)
+        with self._lock:
+            entry = self._queries.get(key)
+            details = None
+            if (
+                entry is not None
+                and entry.generation == self._generation(index_id)
+                and time.monotonic() - entry.created < self.ttl_seconds
+            ):
+                cached = [self._chunks.get((index_id, cid)) for cid in entry.chunk_ids]
+                if all(cached):
+                    details = [detail for detail, _ in cached]
+                    for cid in entry.chunk_ids:
+                        self._chunks.move_to_end((index_id, cid))
+                    self._queries.move_to_end(key)
+                    entry.hits += 1
+            if details is None and entry is not None:
+                del self._queries[key]
+            if details is not None:
+                self._popularity[key] = self._popularity.get(key, 0) + 1
+
+        if details is None:
+            metrics.incr("search_cache.misses")
+            return None
+        metrics.incr("search_cache.hits")
+        metrics.incr("search_cache.saved_s", entry.latency)
+        return details
+
+    def put(
+        self,
+        index_id: str,
+        query: str,
+        top_k: int,
+        filters: Any,
+        details: List[Dict[str, Any]],
+        latency: float,
+        generation: int,
+    ):
+        """
+        Cache the result items of one search.
+
+        Args:
+            index_id, query, top_k, filters: The search
+            details: Its result items
+            latency: Seconds the search took
+            generation: generation(index_id) read before the search was sent;
+                if an upsert has bumped it since, the results may predate the
+                upsert and nothing is cached
+        """
+        key = self._key(index_id, query, top_k, filters)
+        with self._lock:
+            if generation != self._generation(index_id):
+                metrics.incr("search_cache.stale_puts")
+                return
+            for detail in details:
+                chunk_key = (index_id, chunk_id(detail))
+                size = len(json.dumps(detail, default=str))
+                old = self._chunks.pop(chunk_key, None)
+                if old is not None:
+                    self._chunk_bytes -= old[1]
+                self._chunks[chunk_key] = (detail, size)
+                self._chunk_bytes += size
+            while self._chunk_bytes > self.max_chunk_bytes and self._chunks:
+                _, (_, size) = self._chunks.popitem(last=False)
+                self._chunk_bytes -= size
+                metrics.incr("search_cache.chunk_evictions")
+
+            self._queries[key] = _QueryEntry(
+                chunk_ids=[chunk_id(detail) for detail in details],
+                generation=generation,
+                created=time.monotonic(),
+                latency=latency,
+            )
+            self._queries.move_to_end(key)
+            self._popularity.setdefault(key, 0)
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+            while len(self._popularity) > self.max_queries * 2:
+                coldest = min(self._popularity, key=self._popularity.get)
+                del self._popularity[coldest]
+
+    def invalidate(self, index_id: str, file_paths: Optional[Iterable[str]] = None) -> int:
+        """
+        Invalidate cached results after an upsert.
+
+        Args:
+            index_id: Index that was written to
+            file_paths: Upserted documents; None evicts every chunk of the index
+
+        Returns:
+            Number of chunks evicted
+        """
+        paths = set(file_paths) if file_paths is not None else None
+        shared = self._shared.bump(index_id) if self._shared is not None else None
+        with self._lock:
+            if shared is None:
+                self._generations[index_id] = self._generations.get(index_id, 0) + 1
+            else:
+                self._generations[index_id] = shared
+                self._checked[index_id] = time.monotonic()
+            evicted = self._evict_chunks(index_id, paths)
+        metrics.incr("search_cache.invalidations")
+        return evicted
+
+    def hot_queries(self, index_id: str, n: int) -> List[Tuple[str, int]]:
+        """Return (query, top_k) of the n most hit unfiltered queries of an index."""
+        with self._lock:
+            keys = [key for key in self._popularity if key[0] == index_id and not key[3]]
+            keys.sort(key=self._popularity.get, reverse=True)
+        return [(query, top_k) for _, query, top_k, _ in keys[:n]]
+
+    def stats(self) -> Dict[str, Any]:
+        hits = metrics.counter("search_cache.hits")
+        misses = metrics.counter("search_cache.misses")
+        with self._lock:
+            return {
+                "queries": len(self._queries),
+                "chunks": len(self._chunks),
+                "chunk_bytes": self._chunk_bytes,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                "saved_seconds": metrics.counter("search_cache.saved_s"),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._queries.clear()
+            self._chunks.clear()
+            self._chunk_bytes = 0
+            self._popularity.clear()
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchCache()
+        return _search_cache
@@ -0,0 +1,115 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config.settings import DOCUMENT_PROCESSING
+from core.resilience import resilient
+from .indexer import invalidate_search_cache, to_index_records
+
+SNAPSHOT_FORMAT = "policy-navigator-index-snapshot"
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class IndexSnapshot:
+    """Records of an index, ready to be bulk-loaded into an empty one."""
+
+    corpus_checksum: str
+    records: List[Dict[str, Any]]
+    created_at: int = field(default_factory=lambda: int(time.time()))
+
+
+def corpus_checksum(file_checksums: Dict[str, str]) -> str:
+    """
+    Compute the version of a corpus for snapshot staleness checks.
+
+    Args:
+        file_checksums: Mapping of file name to file content checksum
+
+    Returns:
+        MD5 over the snapshot format, chunker settings and every file checksum
+    """
+    digest = hashlib.md5()
+    digest.update(f"{SNAPSHOT_FORMAT}/{SNAPSHOT_VERSION}\n".encode())
+    digest.update(
+        f"{DOCUMENT_PROCESSING['CHUNKER']}/{DOCUMENT_PROCESSING['CHUNK_SIZE']}/"
+        f"{DOCUMENT_PROCESSING['CHUNK_OVERLAP']}\n".encode()
+    )
+    for name in sorted(file_checksums):
+        digest.update(f"{name}\0{file_checksums[name]}\n".encode())
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, snapshot: IndexSnapshot):
+    """
+    Write a snapshot as gzip-compressed columnar JSON.
+
+    Each record field is stored as its own column, which compresses far
+    better than a list of objects. The file is written atomically.
+    """
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "corpus_checksum": snapshot.corpus_checksum,
+        "created_at": snapshot.created_at,
+        "count": len(snapshot.records),
+        "columns": {
+            "id": [r["id"] for r in snapshot.records],
+            "value": [r["value"] for r in snapshot.records],
+            "attributes": [r["attributes"] for r in snapshot.records],
+        },
+    }
+
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+        json.dump(payload, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str) -> Optional[IndexSnapshot]:
+    """Read a snapshot; return None if it is missing or in an unknown format."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+    if payload.get("format") != SNAPSHOT_FORMAT or payload.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    columns = payload["columns"]
+    records = [
+        {"id": record_id, "value": value, "attributes": attributes}
+        for record_id, value, attributes in zip(
+            columns["id"], columns["value"], columns["attributes"]
+        )
+    ]
+    return IndexSnapshot(
+        corpus_checksum=payload["corpus_checksum"],
+        records=records,
+        created_at=payload.get("created_at", 0),
+    )
+
+
+def bulk_load(index: Any, snapshot: IndexSnapshot, batch_size: int = 500) -> int:
+    """
+    Upsert every snapshot record into an index in large batches.
+
+    Args:
+        index: Target index object
+        snapshot: Snapshot to load
+        batch_size: Records per upsert call
+
+    Returns:
+        Number of records loaded
+    """
+    records = snapshot.records
+    for start in range(0, len(records), batch_size):
+        batch = to_index_records(records[start : start + batch_size])
+        resilient("upsert").call(index.upsert, batch)
+    invalidate_search_cache(index)
+    return len(records)
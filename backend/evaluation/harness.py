@@ -0,0 +1,232 @@
+"""Offline retrieval evaluation: quality, size and latency of chunking settings.
+
+Indexes a labelled dataset into a LocalIndex once per configuration and
+reports recall@k, MRR, index size, ingest time and query latency. A sweep
+over chunkers, chunk sizes and overlaps runs in parallel across cores and
+picks the cheapest configuration that meets the quality bar.
+
+Run from the backend directory:
+    python -m evaluation.harness --dataset executive_order_13849 \\
+        --chunkers legal sentence --sizes 200 300 400 600 --overlaps 0 20 50 \\
+        --min-recall 0.8 --at 5
+"""
+
+import os
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from config.settings import DOCUMENT_PROCESSING
+from core.metrics import Metrics
+from document.indexer import build_records
+from document.processor import DocumentProcessor
+from .local_index import LocalIndex
+from .retrieval import load_dataset, recall_at_k, reciprocal_rank
+
+DEFAULT_KS = (1, 3, 5, 10)
+
+
+@dataclass(frozen=True)
+class EvalConfig:
+    chunker: str
+    chunk_size: int
+    overlap: int
+
+
+@dataclass
+class EvalResult:
+    config: EvalConfig
+    recall: Dict[int, float]
+    mrr: float
+    chunks: int
+    index_bytes: int
+    ingest_s: float
+    query_p50_ms: float
+    query_p95_ms: float
+    context_chars: Dict[int, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def evaluate(
+    config: EvalConfig,
+    documents: List[Dict[str, Any]],
+    queries: List[Dict[str, Any]],
+    ks: Sequence[int] = DEFAULT_KS,
+) -> EvalResult:
+    """
+    Index the documents with one configuration and score every query.
+
+    Args:
+        config: Chunker and chunking parameters
+        documents: Extracted documents ('text' and 'metadata')
+        queries: Labelled queries ('question' and 'expected')
+        ks: Cut-offs for recall and context size
+
+    Returns:
+        Quality, size and timing figures for the configuration
+    """
+    index = LocalIndex()
+    started = time.perf_counter()
+    for document in documents:
+        index.upsert(
+            build_records(
+                document["text"],
+                dict(document["metadata"]),
+                chunker=config.chunker,
+                chunk_size=config.chunk_size,
+                overlap=config.overlap,
+            )
+        )
+    ingest_s = time.perf_counter() - started
+
+    timings = Metrics(window=max(1, len(queries)))
+    top_k = max(ks)
+    recall = {k: 0.0 for k in ks}
+    context = {k: 0.0 for k in ks}
+    mrr = 0.0
+    for query in queries:
+        with timings.timer("query"):
+            details = index.search(query["question"], top_k=top_k).details
+        mrr += reciprocal_rank(details, query["expected"])
+        for k in ks:
+            recall[k] += recall_at_k(details, query["expected"], k)
+            context[k] += sum(len(detail["data"]) for detail in details[:k])
+
+    n = len(queries)
+    return EvalResult(
+        config=config,
+        recall={k: value / n for k, value in recall.items()},
+        mrr=mrr / n,
+        chunks=index.count(),
+        index_bytes=sum(len(r["value"].encode("utf-8")) for r in index.records.values()),
+        ingest_s=ingest_s,
+        query_p50_ms=timings.percentile("query", 50) * 1e3,
+        query_p95_ms=timings.percentile("query", 95) * 1e3,
+        context_chars={k: value / n for k, value in context.items()},
+    )
+
+
+# documents and queries are sent to each sweep worker once, not per config
+_worker_data: Dict[str, Any] = {}
+
+
+def _init_worker(documents, queries, ks):
+    _worker_data.update(documents=documents, queries=queries, ks=ks)
+
+
+def _evaluate_in_worker(config: EvalConfig) -> EvalResult:
+    return evaluate(config, _worker_data["documents"], _worker_data["queries"], _worker_data["ks"])
+
+
+def sweep(
+    configs: List[EvalConfig],
+    documents: List[Dict[str, Any]],
+    queries: List[Dict[str, Any]],
+    ks: Sequence[int] = DEFAULT_KS,
+    workers: Optional[int] = None,
+) -> List[EvalResult]:
+    """Evaluate every configuration, in parallel across processes."""
+    workers = min(workers or os.cpu_count() or 1, len(configs))
+    if workers <= 1:
+        return [evaluate(config, documents, queries, ks) for config in configs]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(documents, queries, tuple(ks))
+    ) as pool:
+        return list(pool.map(_evaluate_in_worker, configs))
+
+
+def cheapest(
+    results: List[EvalResult], min_recall: float, at: int, min_mrr: float = 0.0
+) -> Optional[EvalResult]:
+    """
+    Pick the configuration that meets the quality bar at the lowest cost.
+
+    Cost is the text the agent reads per question (context at `at`), then
+    the number of chunks stored.
+    """
+    passing = [r for r in results if r.recall[at] >= min_recall and r.mrr >= min_mrr]
+    return min(passing, key=lambda r: (r.context_chars[at], r.chunks), default=None)
+
+
+def load_documents(paths: List[str]) -> List[Dict[str, Any]]:
+    processor = DocumentProcessor()
+    documents = []
+    for path in paths:
+        document = processor.process_file(path)
+        if document is None:
+            raise RuntimeError(f"Could not extract evaluation document {path}")
+        documents.append(document)
+    return documents
+
+
+def print_table(
+    results: List[EvalResult], ks: Sequence[int], at: int, best: Optional[EvalResult]
+):
+    header = f"{'chunker':<9}{'size':>5}{'ovl':>4}{'chunks':>7}{'KB':>6}"
+    header += "".join(f"{f'R@{k}':>6}" for k in ks)
+    header += f"{'MRR':>6}{'ingest ms':>10}{'q p50 ms':>9}{'q p95 ms':>9}{f'ctx@{at}':>8}"
+    print(header)
+    for r in results:
+        c = r.config
+        line = f"{c.chunker:<9}{c.chunk_size:>5}{c.overlap:>4}{r.chunks:>7}{r.index_bytes / 1024:>6.0f}"
+        line += "".join(f"{r.recall[k]:>6.2f}" for k in ks)
+        line += f"{r.mrr:>6.2f}{r.ingest_s * 1e3:>10.1f}{r.query_p50_ms:>9.2f}{r.query_p95_ms:>9.2f}"
+        line += f"{r.context_chars[at]:>8.0f}"
+        print(line + ("  <- cheapest passing" if r is best else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", default="executive_order_13849")
+    parser.add_argument("--chunkers", nargs="+", default=["legal", "sentence"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[DOCUMENT_PROCESSING["CHUNK_SIZE"]])
+    parser.add_argument("--overlaps", type=int, nargs="+", default=[DOCUMENT_PROCESSING["CHUNK_OVERLAP"]])
+    parser.add_argument("--k", type=int, nargs="+", default=list(DEFAULT_KS))
+    parser.add_argument("--min-recall", type=float, default=0.8)
+    parser.add_argument("--min-mrr", type=float, default=0.0)
+    parser.add_argument("--at", type=int, default=5, help="k at which the recall bar applies")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    ks = sorted(set(args.k) | {args.at})
+    dataset = load_dataset(args.dataset)
+    documents = load_documents(dataset["documents"])
+    configs = [
+        EvalConfig(chunker, size, overlap)
+        for chunker, size, overlap in itertools.product(args.chunkers, args.sizes, args.overlaps)
+    ]
+
+    started = time.perf_counter()
+    results = sweep(configs, documents, dataset["queries"], ks, args.workers)
+    elapsed = time.perf_counter() - started
+
+    best = cheapest(results, args.min_recall, args.at, args.min_mrr)
+    print(
+        f"{len(configs)} configurations, {len(dataset['queries'])} queries, "
+        f"{len(documents)} document(s) in {elapsed:.1f} s"
+    )
+    print_table(results, ks, args.at, best)
+    if best is None:
+        print(f"No configuration reaches recall@{args.at} >= {args.min_recall}")
+    else:
+        c = best.config
+        print(
+            f"Cheapest passing: CHUNKER={c.chunker!r} CHUNK_SIZE={c.chunk_size} "
+            f"CHUNK_OVERLAP={c.overlap} (recall@{args.at} {best.recall[args.at]:.2f}, "
+            f"MRR {best.mrr:.2f}, {best.context_chars[args.at]:.0f} chars read)"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([r.to_dict() for r in results], f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+import math
+import heapq
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was "
+    "were what which who with does do can any under".split()
+)
+
+
+def stem(token: str) -> str:
+    """Crude suffix stripping, so "evades", "evading" and "evade" match."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            token = token[: -len(suffix)]
+            break
+    return token[:-1] if len(token) > 4 and token.endswith("e") else token
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(t) for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+@dataclass
+class SearchResponse:
+    """Search result in the shape of an aiXplain index response."""
+
+    details: List[Dict[str, Any]]
+
+
+class LocalIndex:
+    """In-memory BM25 index with the upsert/search/count API of an aiXplain index.
+
+    Used for offline evaluation of chunking and retrieval settings; it accepts
+    the plain record dicts built by document.indexer.build_records as well as
+    aiXplain Record objects.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.id = "local"
+        self.k1 = k1
+        self.b = b
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+
+    def _remove(self, record_id: str):
+        for term in set(tokenize(self.records[record_id]["value"])):
+            self._postings[term].pop(record_id, None)
+        del self.records[record_id]
+        del self._lengths[record_id]
+
+    def upsert(self, records: List[Any]):
+        for record in records:
+            if not isinstance(record, dict):
+                record = {"id": record.id, "value": record.value, "attributes": record.attributes}
+            record_id = str(record["id"])
+            if record_id in self.records:
+                self._remove(record_id)
+            terms = tokenize(record["value"])
+            self.records[record_id] = record
+            self._lengths[record_id] = len(terms)
+            for term, frequency in Counter(terms).items():
+                self._postings[term][record_id] = frequency
+
+    def count(self) -> int:
+        return len(self.records)
+
+    def search(self, query: str, top_k: int = 10, filters: Any = None) -> SearchResponse:
+        # filters are accepted for API compatibility but not applied
+        if not self.records:
+            return SearchResponse(details=[])
+        average_length = sum(self._lengths.values()) / len(self._lengths)
+        scores: Dict[str, float] = defaultdict(float)
+        total = len(self.records)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for record_id, frequency in postings.items():
+                norm = 1 - self.b + self.b * self._lengths[record_id] / average_length
+                scores[record_id] += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return SearchResponse(
+            details=[
+                {
+                    "score": score,
+                    "document": record_id,
+                    "data": self.records[record_id]["value"],
+                    "metadata": self.records[record_id]["attributes"],
+                }
+                for record_id, score in best
+            ]
+        )
@@ -0,0 +1,62 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).parent.parent
+DATASETS_DIR = Path(__file__).parent / "datasets"
+
+_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'", "–": "-", "—": "-"})
+
+
+def load_dataset(name: str) -> Dict[str, Any]:
+    """
+    Load a labelled query set.
+
+    Args:
+        name: Dataset name in evaluation/datasets, or a path to a JSON file
+
+    Returns:
+        Dict with 'documents' (absolute paths) and 'queries' (question and
+        the 'expected' passages a good answer must be grounded in)
+    """
+    path = Path(name)
+    if not path.exists():
+        path = DATASETS_DIR / f"{name}.json"
+    with open(path, "r", encoding="utf-8") as f:
+        dataset = json.load(f)
+    dataset["documents"] = [str(BACKEND_DIR / document) for document in dataset["documents"]]
+    return dataset
+
+
+def normalize(text: str) -> str:
+    """Lowercase, unify quotes and dashes, and collapse whitespace."""
+    return re.sub(r"\s+", " ", text.translate(_QUOTES).lower()).strip()
+
+
+def found_at(details: List[Dict[str, Any]], expected: List[str]) -> List[Optional[int]]:
+    """Return, for each expected passage, the 1-based rank of the first chunk containing it."""
+    chunks = [normalize(detail["data"]) for detail in details]
+    ranks = []
+    for passage in expected:
+        passage = normalize(passage)
+        ranks.append(next((i + 1 for i, chunk in enumerate(chunks) if passage in chunk), None))
+    return ranks
+
+
+def chunks_needed(details: List[Dict[str, Any]], expected: List[str]) -> Optional[int]:
+    """Number of top chunks an answer needs to see every expected passage, or None."""
+    ranks = found_at(details, expected)
+    return None if None in ranks else max(ranks)
+
+
+def recall_at_k(details: List[Dict[str, Any]], expected: List[str], k: int) -> float:
+    """Fraction of expected passages found in the top k chunks."""
+    ranks = found_at(details, expected)
+    return sum(rank is not None and rank <= k for rank in ranks) / len(ranks)
+
+
+def reciprocal_rank(details: List[Dict[str, Any]], expected: List[str]) -> float:
+    """1 / rank of the first chunk containing any expected passage, or 0."""
+    ranks = [rank for rank in found_at(details, expected) if rank is not None]
+    return 1 / min(ranks) if ranks else 0.0
@@ -2,12 +2,15 @@ import os
 import time
 import logging
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from telegram.ext import Application
 from bot.handlers import setup_handlers
 from config.secrets import TELEGRAM_BOT_TOKEN
-from config.settings import SECURITY
+from config.settings import SECURITY, TELEGRAM, DEPLOYMENT
 from document.indexer import get_or_create_index
 from document.default_data import DefaultDataLoader
+from core.metrics import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -26,15 +29,15 @@ def check_environment():
     if not TELEGRAM_BOT_TOKEN or TELEGRAM_BOT_TOKEN == "YOUR_TELEGRAM_BOT_TOKEN":
         raise EnvironmentError("TELEGRAM_BOT_TOKEN is not set correctly")
 
-    # Check index exists
-    try:
-        index = get_or_create_index()
-        print(f"Index verified: {index.name} (ID: {index.id})")
-    except Exception as e:
-        logger.error(f"Failed to access index: {str(e)}", exc_info=True)
-        raise
 
-    # Load default content
+def verify_index():
+    """Check the knowledge index exists (creating it if needed)."""
+    index = get_or_create_index()
+    print(f"Index verified: {index.name} (ID: {index.id})")
+
+
+def load_default_content():
+    """Load default content into the index."""
     default_loader = DefaultDataLoader()
     if not default_loader.load_default_content():
         logger.warning("Failed to load default content")
@@ -42,21 +45,67 @@ def check_environment():
         logger.info("Default content loaded successfully")
 
 
+def start_background_tasks() -> threading.Thread:
+    """Verify the index and load default content concurrently in the background.
+
+    The bot starts accepting messages immediately; questions work as soon as
+    the index is reachable, and default content appears once loaded.
+    """
+
+    def run():
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+            futures = {
+                pool.submit(verify_index): "index verification",
+                pool.submit(load_default_content): "default content loading",
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Background {futures[future]} failed: {str(e)}", exc_info=True)
+        metrics.observe("startup.background_s", time.perf_counter() - started)
+
+    thread = threading.Thread(target=run, name="startup", daemon=True)
+    thread.start()
+    return thread
+
+
+def build_application() -> Application:
+    """Create the Telegram application with all handlers registered."""
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(TELEGRAM["MAX_CONCURRENT_PROCESSES"])
+        .build()
+    )
+    setup_handlers(application)
+    return application
+
+
 def main():
     """Main entry point for the system."""
     try:
         # Check environment settings
         check_environment()
 
-        # Create Telegram application
-        application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-
-        # Setup handlers
-        setup_handlers(application)
+        # Index verification & default content load while the bot starts
+        start_background_tasks()
 
         # Start the bot
-        print("Starting Telegram Knowledge Bot...")
-        application.run_polling()
+        if DEPLOYMENT["MODE"] == "webhook":
+            from bot.webhook import run_webhook
+
+            print("Starting Telegram Knowledge Bot (webhook mode)...")
+            run_webhook(build_application)
+        elif DEPLOYMENT["MODE"] == "sharded":
+            from bot.sharding import run_sharded
+
+            print("Starting Telegram Knowledge Bot (sharded workers)...")
+            run_sharded(build_application)
+        else:
+            print("Starting Telegram Knowledge Bot...")
+            build_application().run_polling()
 
     except Exception as e:
         logger.error(f"Failed to start bot: {str(e)}", exc_info=True)
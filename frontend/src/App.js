@@ -217,6 +217,8 @@ const exampleQuestions = [
  */
 export default function App() {
     const [indexedDocs, setIndexedDocs] = React.useState([]);
+    const [docsCursor, setDocsCursor] = React.useState(null);
+    const [docsTotal, setDocsTotal] = React.useState(0);
     const [question, setQuestion] = React.useState('');
     const [chatHistory, setChatHistory] = React.useState([]);
     const [isLoading, setIsLoading] = React.useState(false);
@@ -233,23 +235,22 @@ export default function App() {
     const questionInputRef = React.useRef(null);
 
     /**
-     * Filters documents based on search input
+     * Fetches one page of indexed documents from server, filtered by name.
+     * Without a cursor the list is replaced; with one the page is appended.
      */
-    const filteredDocs = indexedDocs.filter(doc => 
-        doc.toLowerCase().includes(docFilter.toLowerCase())
-    );
-
-    /**
-     * Fetches indexed documents from server
-     */
-    const fetchDocuments = React.useCallback(async () => {
+    const fetchDocuments = React.useCallback(async (filter = '', cursor = null) => {
         try {
-            const response = await fetch(`${API_BASE_URL}/api/documents`);
+            const params = new URLSearchParams();
+            if (filter) params.set('q', filter);
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`${API_BASE_URL}/api/documents?${params}`);
             if (!response.ok) {
                 throw new Error('Could not connect to the backend server. Please ensure it is running.');
             }
             const data = await response.json();
-            setIndexedDocs(data.documents || []);
+            setIndexedDocs(prev => cursor ? [...prev, ...(data.documents || [])] : (data.documents || []));
+            setDocsCursor(data.next_cursor || null);
+            setDocsTotal(data.total || 0);
         } catch (e) {
             setError(e.message);
             console.error("Failed to fetch documents:", e);
@@ -302,11 +303,12 @@ export default function App() {
     }, [exportChat, chatHistory.length]);
 
     /**
-     * Initial document fetch on mount
+     * Document fetch on mount and, debounced, whenever the filter changes
      */
     React.useEffect(() => {
-        fetchDocuments();
-    }, [fetchDocuments]);
+        const timer = setTimeout(() => fetchDocuments(docFilter), docFilter ? 250 : 0);
+        return () => clearTimeout(timer);
+    }, [fetchDocuments, docFilter]);
 
     /**
      * Auto-scroll to latest message
@@ -369,7 +371,7 @@ export default function App() {
                 xhr.send(formData);
             });
 
-            setIndexedDocs(result.documents || []);
+            await fetchDocuments(docFilter);
             setChatHistory(prev => [...prev, { role: 'assistant', text: `✅ Successfully uploaded and indexed: ${file.name}` }]);
 
         } catch (e) {
@@ -396,7 +398,7 @@ export default function App() {
                 throw new Error(result.error || 'Failed to rebuild index.');
             }
             
-            await fetchDocuments();
+            await fetchDocuments(docFilter);
 
             const successMsg = {
                 role: 'assistant',
@@ -537,7 +539,7 @@ export default function App() {
                 <div className="flex flex-col flex-grow mt-8 min-h-0">
                     <div className="flex items-center justify-between mb-4">
                         <h2 className="text-lg font-semibold text-gray-700 dark:text-gray-300">
-                            2. Knowledge Base ({indexedDocs.length})
+                            2. Knowledge Base ({docsTotal})
                         </h2>
                                                 <button
                             onClick={confirmRebuildIndex}
@@ -553,7 +555,7 @@ export default function App() {
                         </button>
                     </div>
 
-                    {indexedDocs.length > 0 && (
+                    {docsTotal > 0 && (
                         <div className="relative mb-2">
                             <Filter className="absolute left-3 top-1/2 -translate-y-1/2 w-4 h-4 text-gray-400 pointer-events-none" />
                             <input
@@ -575,16 +577,26 @@ export default function App() {
                     )}
 
                     <div className="flex-1 overflow-y-auto bg-gray-50 dark:bg-gray-800/50 p-3 rounded-lg custom-scrollbar">
-                        {filteredDocs.length > 0 ? (
+                        {indexedDocs.length > 0 ? (
                             <ul className="space-y-1">
-                                {filteredDocs.map((doc, index) => (
+                                {indexedDocs.map((doc, index) => (
                                     <li key={index} className="flex items-center text-sm text-gray-700 dark:text-gray-300 hover:bg-gray-100 dark:hover:bg-gray-700 p-2 rounded transition-colors border border-transparent hover:border-indigo-200 dark:hover:border-indigo-700/50">
                                         <span className="mr-2 text-lg">{getFileIcon(doc)}</span>
                                         <span className="truncate flex-1" title={doc}>{doc}</span>
                                     </li>
                                 ))}
+                                {docsCursor && (
+                                    <li>
+                                        <button
+                                            onClick={() => fetchDocuments(docFilter, docsCursor)}
+                                            className="w-full text-sm text-indigo-600 dark:text-indigo-400 hover:underline p-2"
+                                        >
+                                            Load more
+                                        </button>
+                                    </li>
+                                )}
                             </ul>
-                        ) : indexedDocs.length > 0 ? (
+                        ) : docsTotal > 0 ? (
                             <div className="text-center text-sm text-gray-500 dark:text-gray-400 py-4">
                                 No documents match "{docFilter}"
                             </div>
@@ -699,14 +711,14 @@ export default function App() {
                                     handleAskQuestion(e);
                                 }
                             }}
-                            placeholder={indexedDocs.length === 0 ? "Upload documents to start asking questions..." : "Ask a question about the indexed documents..."}
+                            placeholder={docsTotal === 0 ? "Upload documents to start asking questions..." : "Ask a question about the indexed documents..."}
                             className="w-full p-4 pr-14 bg-gray-100 dark:bg-gray-800 border border-transparent rounded-2xl focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500 hover:border-indigo-300 dark:hover:border-indigo-700 transition text-gray-800 dark:text-gray-200 placeholder-gray-500 dark:placeholder-gray-400 resize-none outline-none shadow-inner"
-                            disabled={isLoading || isRebuilding || indexedDocs.length === 0}
+                            disabled={isLoading || isRebuilding || docsTotal === 0}
                             rows={1}
                         />
                         <button
                             type="submit"
-                            disabled={isLoading || isRebuilding || !question.trim() || indexedDocs.length === 0}
+                            disabled={isLoading || isRebuilding || !question.trim() || docsTotal === 0}
                             className="absolute right-3 top-1/2 -translate-y-1/2 p-2 bg-gradient-to-r from-indigo-600 to-violet-600 text-white rounded-full hover:from-indigo-600 hover:to-indigo-700 disabled:from-indigo-300 disabled:to-indigo-300 dark:disabled:from-indigo-800 dark:disabled:to-indigo-800 disabled:cursor-not-allowed shadow-lg shadow-indigo-600/20 transition-all active:scale-95"
                             title="Send message"
                         >